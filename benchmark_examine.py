@@ -0,0 +1,476 @@
+import os
+import re
+import sys
+import json
+import codecs
+import time
+import types
+import shutil
+import platform
+import subprocess
+import argparse
+import tempfile
+import contextlib
+import multiprocessing
+import numpy as np
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+try:
+    import pyogrio
+    import pyogrio.raw
+    import shapely
+except ImportError:
+    pyogrio = None
+    shapely = None
+
+benchmark_checks = ["坐标系统", "几何", "数据范围", "规划范围", "数据结构", "数据表结构", "拓扑", "转换预检", "属性", \
+                    "重复要素"]
+pass_checks = ["坐标系统", "几何", "数据范围", "规划范围", "数据结构"]
+parallel_checks = ["几何", "规划范围", "拓扑", "属性", "重复要素"]
+startup_checks = ["import", "数据结构"]
+sink_formats = ["reopen", "csv", "jsonl", "sqlite"]
+region_name = "行政区划_县级"
+cell_size = 10.0
+
+def build_feature_wkbs(p_count, p_shape, p_invalid, p_outside, p_grid):
+    p_index = np.arange(p_count)
+    p_x = (p_index % p_grid) * cell_size + 1.0
+    p_y = (p_index // p_grid) * cell_size + 1.0
+    p_x[p_outside] += p_grid * cell_size + 50.0
+    if p_shape == "Polyline":
+        p_coords = np.stack([np.stack([p_x, p_y], 1), np.stack([p_x + 8.0, p_y + 8.0], 1)], 1)
+        return shapely.to_wkb(shapely.linestrings(p_coords))
+    p_coords = np.stack([np.stack([p_x, p_y], 1), np.stack([p_x + 8.0, p_y], 1), np.stack([p_x + 8.0, p_y + 8.0], 1), \
+                         np.stack([p_x, p_y + 8.0], 1), np.stack([p_x, p_y], 1)], 1)
+    p_coords[p_invalid, 1] = p_coords[p_invalid, 2]
+    p_coords[p_invalid, 2] = np.stack([p_x[p_invalid] + 8.0, p_y[p_invalid]], 1)
+    return shapely.to_wkb(shapely.polygons(p_coords))
+
+def generate_workspace(out_dir, layer_count = 4, feature_count = 10000, invalid_ratio = 0.01, outside_ratio = 0.01, \
+                       crs_list = ["EPSG:4523"], seed = 0):
+    if pyogrio is None or shapely is None:
+        sys.exit("生成测试数据需要 pyogrio 与 shapely！")
+    p_random = np.random.default_rng(seed)
+    gdb_path = os.path.join(os.path.abspath(out_dir), "bench.gdb")
+    if os.path.exists(gdb_path):
+        sys.exit(f"{gdb_path} 已存在！")
+    os.makedirs(out_dir, exist_ok=True)
+    p_grid = int(np.ceil(np.sqrt(feature_count)))
+    p_spec = {'gdb': gdb_path, 'region': gdb_path + "\\" + region_name, 'layers': dict(), \
+              'params': {'layer_count': layer_count, 'feature_count': feature_count, 'invalid_ratio': invalid_ratio, \
+                         'outside_ratio': outside_ratio, 'crs': crs_list, 'seed': seed}}
+    p_region = shapely.box(0.0, 0.0, p_grid * cell_size, p_grid * cell_size)
+    pyogrio.raw.write(gdb_path, np.array([shapely.to_wkb(p_region)], dtype=object), [np.array(["0"], dtype=object)], \
+                      ["XZQDM"], layer=region_name, driver="OpenFileGDB", geometry_type="Polygon", crs=crs_list[0])
+    p_spec['layers'][p_spec['region']] = {'name': region_name, 'dataset': "", 'shape': "Polygon", 'crs': crs_list[0], \
+                                          'count': 1, 'invalid': [], 'outside': [], \
+                                          'extent': [float(p) for p in p_region.bounds]}
+    for p_layer in range(layer_count):
+        p_shape = "Polyline" if p_layer % 3 == 2 else "Polygon"
+        p_crs = crs_list[p_layer % len(crs_list)]
+        p_dataset = "DS" + str(p_layer % len(crs_list)) if p_layer % 2 == 1 else ""
+        p_name = f"规划_用地_{p_layer:02d}"
+        p_invalid = p_random.random(feature_count) < (invalid_ratio if p_shape == "Polygon" else 0.0)
+        p_outside = p_random.random(feature_count) < outside_ratio
+        p_wkbs = build_feature_wkbs(feature_count, p_shape, p_invalid, p_outside, p_grid)
+        p_codes = np.array(["01", "02", "03", None], dtype=object)[p_random.integers(0, 4, feature_count)]
+        p_options = {'FEATURE_DATASET': p_dataset} if p_dataset else None
+        pyogrio.raw.write(gdb_path, p_wkbs, [p_codes, p_random.random(feature_count) * 100.0], ["DM", "MJ"], \
+                          layer=p_name, driver="OpenFileGDB", crs=p_crs, layer_options=p_options, \
+                          geometry_type="LineString" if p_shape == "Polyline" else "Polygon")
+        p_data = gdb_path + "\\" + (p_dataset + "\\" if p_dataset else "") + p_name
+        p_bounds = shapely.total_bounds(shapely.from_wkb(p_wkbs))
+        p_spec['layers'][p_data] = {'name': p_name, 'dataset': p_dataset, 'shape': p_shape, 'crs': p_crs, \
+                                    'count': feature_count, 'invalid': (np.flatnonzero(p_invalid) + 1).tolist(), \
+                                    'outside': (np.flatnonzero(p_outside) + 1).tolist(), \
+                                    'extent': [float(p) for p in p_bounds]}
+    with open(os.path.join(out_dir, "bench_spec.json"), "w", encoding="utf-8") as spec_file:
+        json.dump(p_spec, spec_file, ensure_ascii=False)
+    print(f"测试数据已生成：{gdb_path}，共 {layer_count} 个图层，每层 {feature_count} 个要素。")
+    return p_spec
+
+def make_stub_arcpy(spec, latency = 0.0, row_latency = 0.0):
+    p_memory = dict()
+    p_layers = spec['layers']
+
+    def wait(row_count = 0):
+        if latency or row_latency:
+            time.sleep(latency + row_latency * row_count / 1000.0)
+
+    def read_layer(data, columns):
+        p_meta, p_fids, p_wkbs, p_field_data = pyogrio.raw.read(spec['gdb'], layer=p_layers[data]['name'], \
+            columns=columns, read_geometry=columns == [], return_fids=True)
+        return p_fids, p_wkbs, dict(zip(p_meta['fields'], p_field_data))
+
+    def describe(data):
+        wait()
+        p_layer = p_layers[data]
+        p_extent = types.SimpleNamespace(XMin=p_layer['extent'][0], YMin=p_layer['extent'][1], \
+                                         XMax=p_layer['extent'][2], YMax=p_layer['extent'][3])
+        p_spatial_ref = types.SimpleNamespace(name=p_layer['crs'], factoryCode=int(p_layer['crs'].split(":")[1]), \
+                                              exportToString=lambda: "")
+        return types.SimpleNamespace(name=p_layer['name'], dataType="FeatureClass", spatialReference=p_spatial_ref, \
+                                     extent=p_extent, featureType="Simple", shapeType=p_layer['shape'])
+
+    def list_fields(data):
+        wait()
+        p_fields = [("OBJECTID", "OID", 4), ("SHAPE", "Geometry", 0)]
+        if p_layers[data]['name'] == region_name:
+            p_fields.append(("XZQDM", "String", 12))
+        else:
+            p_fields += [("DM", "String", 10), ("MJ", "Double", 8)]
+        return [types.SimpleNamespace(name=p[0], aliasName="", type=p[1], length=p[2]) for p in p_fields]
+
+    def get_count(data):
+        wait()
+        return [str(len(p_memory[data]) if data in p_memory else p_layers[data]['count'])]
+
+    def walk(gdb_path, datatype = "FeatureClass"):
+        p_datasets = sorted(set([p['dataset'] for p in p_layers.values() if p['dataset']]))
+        for p_dataset in [""] + p_datasets:
+            wait()
+            p_names = [p['name'] for p in p_layers.values() if p['dataset'] == p_dataset] \
+                if datatype == "FeatureClass" else []
+            yield (gdb_path + ("\\" + p_dataset if p_dataset else ""), p_datasets if p_dataset == "" else [], p_names)
+
+    def check_geometry(data, output_name):
+        wait(p_layers[data]['count'])
+        p_memory[output_name] = [(data, p_oid, "self intersections") for p_oid in p_layers[data]['invalid']]
+
+    def erase(data, base_data, output_name):
+        wait(p_layers[data]['count'] + p_layers[base_data]['count'])
+        p_memory[output_name] = [(p_oid,) for p_oid in p_layers[data]['outside']]
+
+    class SearchCursor:
+        def __init__(self, data, fields, *args, **kwargs):
+            if data in p_memory:
+                p_columns = ['CLASS', 'FEATURE_ID', 'PROBLEM']
+                self.rows = [tuple(row[p_columns.index(field)] for field in fields) for row in p_memory[data]]
+            else:
+                p_fids, p_wkbs, p_columns = read_layer(data, [])
+                wait(len(p_fids))
+                self.rows = list(zip(p_fids.tolist(), p_wkbs))
+
+        def __enter__(self):
+            return iter(self.rows)
+
+        def __exit__(self, *args):
+            return False
+
+    def table_to_numpy(data, fields, where_clause = None, null_value = None, **kwargs):
+        if data in p_memory:
+            return np.array([row[1] for row in p_memory[data]], dtype=[("FEATURE_ID", "i8")])
+        p_fids, p_wkbs, p_columns = read_layer(data, [p for p in fields if p != "OID@"])
+        if where_clause:
+            p_low, p_high = [int(p) for p in re.findall(r"[<>]= (\d+)", where_clause)]
+            p_keep = (p_fids >= p_low) & (p_fids <= p_high)
+            p_fids, p_columns = p_fids[p_keep], dict([(p, p_columns[p][p_keep]) for p in p_columns])
+        wait(len(p_fids))
+        p_arrays = []
+        for field in fields:
+            p_values = p_fids if field == "OID@" else p_columns[field]
+            if p_values.dtype == object:
+                p_null = (null_value or dict()).get(field, "")
+                p_values = np.array([p_null if p is None else p for p in p_values], dtype=str)
+            p_arrays.append(p_values)
+        return np.rec.fromarrays(p_arrays, names=fields)
+
+    def delete(data):
+        p_memory.pop(data, None)
+
+    p_module = types.ModuleType("arcpy")
+    p_module.env = types.SimpleNamespace(workspace=None, scratchGDB=tempfile.gettempdir())
+    p_module.Describe = describe
+    p_module.ListFields = list_fields
+    p_module.GetCount_management = get_count
+    p_module.CheckGeometry_management = check_geometry
+    p_module.Erase_analysis = erase
+    p_module.Delete_management = delete
+    p_module.Exists = lambda data: data in p_memory or data in p_layers or data == spec['gdb']
+    p_module.ListWorkspaces = lambda wild_card = "*", workspace_type = "All": [spec['gdb']]
+    p_module.AddFieldDelimiters = lambda data, field: field
+    p_module.da = types.SimpleNamespace(Walk=walk, SearchCursor=SearchCursor, TableToNumPyArray=table_to_numpy)
+    return p_module
+
+def load_examine_module(backend, spec, latency = 0.0, row_latency = 0.0):
+    if backend == "stub":
+        sys.modules["arcpy"] = make_stub_arcpy(spec, latency, row_latency)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import data_examine
+    data_examine.set_data_backend("arcpy" if backend == "stub" else backend)
+    data_examine.interactive_mode = False
+    return data_examine
+
+def make_settings(de, out_dir, worker_count = 1):
+    p_dir = os.path.dirname(os.path.abspath(de.__file__))
+    return {'dir': out_dir, 'check_list': benchmark_checks, 'admin_fc_name': "", 'admin_fc_name_list': [region_name], \
+            'structure_file_name': os.path.join(p_dir, "data_structure.csv"), \
+            'conversion_file_name': os.path.join(p_dir, "data_conversion.csv"), 'worker_count': worker_count, \
+            'check_worker_count': 1, 'repair_policy': "N", 'output_format': "csv", 'geometry_sample_size': 100, 'geometry_spill_dir': "", \
+            'extent_tolerance': 1.0, 'extent_min_overlap': 0.0, 'boundary_list_all': False, \
+            'topology_chunk_size': 50000, 'topology_tolerance': 0.0, 'result_cache': False, \
+            'cache_geometry_hash': False, 'attribute_batch_size': 500000, 'repair_accept_tolerance': 0.001, \
+            'repair_reject_limit': 0.05, 'timing': False, 'profile': "", \
+            'hierarchy_tolerance': 0.0001, 'duplicate_tolerance': 0.01, 'progress_interval': 0, 'progress_file': ""}
+
+def get_peak_rss():
+    if resource is None:
+        return None
+    p_scale = 1048576.0 if sys.platform == "darwin" else 1024.0
+    return max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, \
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) / p_scale
+
+def bench_check(de, spec, check, worker_count):
+    with tempfile.TemporaryDirectory() as out_dir:
+        settings = make_settings(de, out_dir, worker_count)
+        de.examine_gdb(spec['gdb'], settings, [])
+        p_start = time.perf_counter()
+        de.examine_gdb(spec['gdb'], settings, [check])
+        return time.perf_counter() - p_start
+
+def bench_pass(de, spec, check_worker_count):
+    with tempfile.TemporaryDirectory() as out_dir:
+        settings = dict(make_settings(de, out_dir), check_worker_count=check_worker_count)
+        de.examine_gdb(spec['gdb'], settings, [])
+        p_start = time.perf_counter()
+        de.examine_gdb(spec['gdb'], settings, pass_checks)
+        return time.perf_counter() - p_start
+
+def output_reopen(output_string, output_path):
+    print(output_string)
+    with codecs.open(output_path, 'a') as output_file:
+        output_file.write(output_string + '\n')
+    return 1
+
+def bench_sink(de, output_format, row_count):
+    with tempfile.TemporaryDirectory() as out_dir:
+        if output_format == "reopen":
+            p_output_path = os.path.join(out_dir, "sink.txt")
+            p_start = time.perf_counter()
+            for p_index in range(row_count):
+                output_reopen(f"layer, {p_index}, self intersections", p_output_path)
+            return time.perf_counter() - p_start
+        p_sink = de.open_result_sink(os.path.join(out_dir, "sink." + output_format), output_format)
+        p_sink['check'] = "基准"
+        p_start = time.perf_counter()
+        for p_index in range(row_count):
+            de.output_info(f"layer, {p_index}, self intersections", layer="layer", feature_id=p_index, \
+                           problem="self intersections", severity="error", sink=p_sink)
+        de.close_result_sink(p_sink)
+        return time.perf_counter() - p_start
+
+def bench_containment(de, spec, method):
+    p_start = time.perf_counter()
+    for data in spec['layers']:
+        if data == spec['region'] or spec['layers'][data]['shape'] != "Polygon":
+            continue
+        if method == "strtree":
+            de.check_containment(data, spec['region'])
+        else:
+            p_region = de.read_region_geometry(spec['region'])
+            p_geoms = de.read_shapely_geometries(data)[1]
+            p_outside = shapely.difference(shapely.make_valid(p_geoms), p_region)
+            int(np.count_nonzero(~shapely.is_empty(p_outside)))
+    return time.perf_counter() - p_start
+
+def make_heavy_arcpy(out_dir, import_latency):
+    os.makedirs(os.path.join(out_dir, "arcpy"), exist_ok=True)
+    with open(os.path.join(out_dir, "arcpy", "__init__.py"), "w", encoding="utf-8") as init_file:
+        init_file.write(f"import time\ntime.sleep({import_latency})\n")
+    return out_dir
+
+def bench_startup(spec, backend, check, import_latency):
+    p_script_dir = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as out_dir:
+        p_env = dict(os.environ)
+        if backend == "stub":
+            p_path = make_heavy_arcpy(os.path.join(out_dir, "lib"), import_latency)
+            p_env['PYTHONPATH'] = os.pathsep.join([p for p in [p_path, p_env.get('PYTHONPATH')] if p])
+        if check == "import":
+            p_command = [sys.executable, "-c", "import data_examine"]
+        else:
+            p_root = os.path.join(out_dir, "root")
+            p_source = os.path.splitext(spec['gdb'])[0] + "_snapshot" if backend == "snapshot" else spec['gdb']
+            shutil.copytree(p_source, os.path.join(p_root, os.path.basename(p_source)))
+            p_command = [sys.executable, os.path.join(p_script_dir, "data_examine.py"), "--batch", p_root, \
+                         "--checks", check, "--gdb-workers", "1"] + (["--backend", backend] if backend != "stub" else [])
+        p_start = time.perf_counter()
+        subprocess.run(p_command, env=p_env, cwd=p_script_dir, stdin=subprocess.DEVNULL, \
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        return time.perf_counter() - p_start
+
+def bench_snapshot(de, spec):
+    p_snapshot_dir = de.get_snapshot_dir(spec['gdb'])
+    if os.path.isdir(p_snapshot_dir):
+        shutil.rmtree(p_snapshot_dir)
+    p_start = time.perf_counter()
+    de.export_snapshot(spec['gdb'], de.conduct_data_list(spec['gdb']))
+    return time.perf_counter() - p_start
+
+def run_task(p_task, spec, backend, latency, row_latency, result_queue):
+    try:
+        with open(os.devnull, "w") as null_file, contextlib.redirect_stdout(null_file):
+            if p_task[0] == "startup":
+                result_queue.put([bench_startup(spec, backend, p_task[1], p_task[2]), get_peak_rss(), ""])
+                return
+            de = load_examine_module(backend, spec, latency, row_latency)
+            if p_task[0] == "check":
+                p_seconds = bench_check(de, spec, p_task[1], p_task[2])
+            elif p_task[0] == "pass":
+                p_seconds = bench_pass(de, spec, p_task[1])
+            elif p_task[0] == "sink":
+                p_seconds = bench_sink(de, p_task[1], p_task[2])
+            elif p_task[0] == "snapshot":
+                p_seconds = bench_snapshot(de, spec)
+            else:
+                p_seconds = bench_containment(de, spec, p_task[1])
+        result_queue.put([p_seconds, get_peak_rss(), ""])
+    except BaseException as p_error:
+        result_queue.put([None, None, repr(p_error)])
+
+def run_isolated(p_task, spec, backend, latency, row_latency):
+    result_queue = multiprocessing.Queue()
+    p_process = multiprocessing.Process(target=run_task, args=(p_task, spec, backend, latency, row_latency, \
+                                                               result_queue))
+    p_process.start()
+    p_result = result_queue.get()
+    p_process.join()
+    return p_result
+
+def plan_tasks(spec, backend, checks, worker_counts, sink_rows, import_latency = 10.0):
+    p_feature_count = sum([p['count'] for p in spec['layers'].values()])
+    p_tasks = []
+    if backend == "snapshot":
+        p_tasks.append(["snapshot:export", ["snapshot"], 1, p_feature_count])
+    for check in startup_checks:
+        p_tasks.append([f"startup:{check}", ["startup", check, import_latency], 1, 1])
+    for check in checks:
+        for worker_count in (worker_counts if check in parallel_checks else worker_counts[:1]):
+            p_tasks.append([f"check:{check}", ["check", check, worker_count], worker_count, p_feature_count])
+    for check_worker_count in [1, len(pass_checks)]:
+        p_tasks.append(["pass:" + "/".join(pass_checks), ["pass", check_worker_count], check_worker_count, \
+                        p_feature_count])
+    if sink_rows > 0:
+        for output_format in sink_formats:
+            p_tasks.append([f"sink:{output_format}", ["sink", output_format, sink_rows], 1, sink_rows])
+    if shapely is not None:
+        p_polygon_count = sum([p['count'] for data, p in spec['layers'].items() \
+                               if data != spec['region'] and p['shape'] == "Polygon"])
+        for method in ["strtree", "overlay"]:
+            p_tasks.append([f"containment:{method}", ["containment", method], 1, p_polygon_count])
+    return p_tasks
+
+def run_benchmark(workspace, backend = "open", checks = None, worker_counts = [1], repeat = 1, latency = 0.0, \
+                  row_latency = 0.0, sink_rows = 100000, import_latency = 10.0):
+    with open(os.path.join(workspace, "bench_spec.json"), encoding="utf-8") as spec_file:
+        spec = json.load(spec_file)
+    p_results = []
+    for p_name, p_task, worker_count, p_items in plan_tasks(spec, backend, checks or benchmark_checks, \
+                                                             worker_counts, sink_rows, import_latency):
+        p_task_backend = "open" if p_task[0] == "snapshot" else backend
+        p_runs = [run_isolated(p_task, spec, p_task_backend, latency, row_latency) for p_repeat in range(repeat)]
+        if p_runs[0][2]:
+            print(f"{p_name:<24} 进程数 {worker_count:<3} 运行失败：{p_runs[0][2]}")
+            p_results.append({'name': p_name, 'backend': backend, 'workers': worker_count, 'error': p_runs[0][2]})
+            continue
+        p_wall = float(np.median([p[0] for p in p_runs]))
+        p_rss = max([p[1] for p in p_runs]) if p_runs[0][1] is not None else None
+        p_results.append({'name': p_name, 'backend': backend, 'workers': worker_count, 'wall': p_wall, \
+                          'wall_runs': [p[0] for p in p_runs], 'peak_rss_mb': p_rss, 'items': p_items, \
+                          'throughput': p_items / p_wall if p_wall > 0 else None})
+        print(f"{p_name:<24} 进程数 {worker_count:<3} 用时 {p_wall:8.3f} 秒  峰值内存 " + \
+              (f"{p_rss:8.1f} MB" if p_rss is not None else "     N/A") + f"  吞吐 {p_items / p_wall:12.0f} /秒")
+    report_sink_speedup(p_results)
+    return {'meta': {'time': time.strftime("%Y-%m-%d %H:%M:%S"), 'python': platform.python_version(), \
+                     'platform': platform.platform(), 'backend': backend, 'latency': latency, \
+                     'row_latency': row_latency, 'import_latency': import_latency, 'repeat': repeat, 'params': spec['params']}, \
+            'results': p_results}
+
+def report_sink_speedup(p_results):
+    p_sink_dict = dict([(p['name'], p) for p in p_results if p['name'].startswith("sink:") and 'error' not in p])
+    p_baseline = p_sink_dict.pop("sink:reopen", None)
+    if p_baseline is None:
+        return 0
+    for p_name, p_result in p_sink_dict.items():
+        print(f"{p_name:<24} 相对逐行打开写入（{p_baseline['wall']:.3f} 秒）" \
+              f"提速 {p_baseline['wall'] / p_result['wall']:6.1f} 倍")
+    return len(p_sink_dict)
+
+def compare_results(base_path, new_path, threshold = 0.1):
+    with open(base_path, encoding="utf-8") as base_file, open(new_path, encoding="utf-8") as new_file:
+        p_base, p_new = json.load(base_file), json.load(new_file)
+    p_base_dict = dict([((p['name'], p['backend'], p['workers'], p['items']), p) for p in p_base['results'] \
+                        if 'error' not in p])
+    p_regressions = 0
+    for p_result in p_new['results']:
+        if 'error' in p_result:
+            continue
+        p_key = (p_result['name'], p_result['backend'], p_result['workers'], p_result['items'])
+        if p_key not in p_base_dict:
+            print(f"{p_key[0]:<24} 进程数 {p_key[2]:<3} 无基准数据")
+            continue
+        p_wall_ratio = p_result['wall'] / p_base_dict[p_key]['wall']
+        p_flag = ""
+        if p_wall_ratio > 1.0 + threshold:
+            p_flag = "变慢"
+        elif p_wall_ratio < 1.0 - threshold:
+            p_flag = "变快"
+        if p_result['peak_rss_mb'] and p_base_dict[p_key]['peak_rss_mb'] and \
+           p_result['peak_rss_mb'] > p_base_dict[p_key]['peak_rss_mb'] * (1.0 + threshold):
+            p_flag += " 内存增加"
+        if "变慢" in p_flag or "内存增加" in p_flag:
+            p_regressions += 1
+        print(f"{p_key[0]:<24} 进程数 {p_key[2]:<3} {p_base_dict[p_key]['wall']:8.3f} -> {p_result['wall']:8.3f} 秒 " \
+              f"({p_wall_ratio:6.2f}x) {p_flag}")
+    print(f"共 {p_regressions} 项性能退化（阈值 {threshold:.0%}）。")
+    return p_regressions
+
+def parse_arguments():
+    p_parser = argparse.ArgumentParser(description="data_examine 性能基准测试。")
+    p_subparsers = p_parser.add_subparsers(dest="command")
+    p_generate = p_subparsers.add_parser("generate", help="生成测试数据")
+    p_generate.add_argument("--out", required=True, help="输出目录")
+    p_generate.add_argument("--layers", type=int, default=4, help="图层数")
+    p_generate.add_argument("--features", type=int, default=10000, help="每层要素数")
+    p_generate.add_argument("--invalid-ratio", type=float, default=0.01, help="几何错误要素比例")
+    p_generate.add_argument("--outside-ratio", type=float, default=0.01, help="超出规划范围要素比例")
+    p_generate.add_argument("--crs", default="EPSG:4523", help="坐标系统，多个以逗号分隔")
+    p_generate.add_argument("--seed", type=int, default=0, help="随机数种子")
+    p_run = p_subparsers.add_parser("run", help="运行基准测试")
+    p_run.add_argument("--workspace", required=True, help="测试数据目录")
+    p_run.add_argument("--backend", choices=["open", "stub", "snapshot"], default="open", \
+                       help="数据后端，snapshot 会先生成数据快照")
+    p_run.add_argument("--checks", nargs="+", help="检测方法，默认全部")
+    p_run.add_argument("--workers", default="1", help="并行进程数，多个以逗号分隔")
+    p_run.add_argument("--repeat", type=int, default=1, help="重复次数")
+    p_run.add_argument("--latency", type=float, default=0.0, help="stub 后端每次调用的延迟（秒）")
+    p_run.add_argument("--row-latency", type=float, default=0.0, help="stub 后端每千行的延迟（秒）")
+    p_run.add_argument("--import-latency", type=float, default=10.0, help="stub 后端模拟 arcpy 导入耗时（秒）")
+    p_run.add_argument("--sink-rows", type=int, default=100000, help="结果输出基准的行数，0 为不测试")
+    p_run.add_argument("--output", help="结果 JSON 文件")
+    p_compare = p_subparsers.add_parser("compare", help="比较两次基准测试结果")
+    p_compare.add_argument("base", help="基准结果 JSON 文件")
+    p_compare.add_argument("new", help="新结果 JSON 文件")
+    p_compare.add_argument("--threshold", type=float, default=0.1, help="判定退化的相对变化阈值")
+    return p_parser.parse_args()
+
+if __name__ == '__main__':
+    p_args = parse_arguments()
+    if p_args.command == "generate":
+        generate_workspace(p_args.out, p_args.layers, p_args.features, p_args.invalid_ratio, p_args.outside_ratio, \
+                           p_args.crs.split(","), p_args.seed)
+    elif p_args.command == "run":
+        p_report = run_benchmark(p_args.workspace, p_args.backend, p_args.checks, \
+                                 [int(p) for p in p_args.workers.split(",")], p_args.repeat, p_args.latency, \
+                                 p_args.row_latency, p_args.sink_rows, p_args.import_latency)
+        if p_args.output:
+            with open(p_args.output, "w", encoding="utf-8") as output_file:
+                json.dump(p_report, output_file, ensure_ascii=False, indent=2)
+    elif p_args.command == "compare":
+        sys.exit(1 if compare_results(p_args.base, p_args.new, p_args.threshold) > 0 else 0)
+    else:
+        sys.exit("请指定 generate、run 或 compare。")
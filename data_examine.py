@@ -1,671 +1,3096 @@
-#!/usr/bin/python
-# -*- coding: utf-8 -*-
-
-# Shanghai Tongji Urban Planning & Design Institute Co., Ltd. - Academy of Spatial Planning
-# zongli@tjupdi.com
-# Composed in Python 3.6.10 for ArcGIS Pro
-
-# This program is free software: you can redistribute it and/or modify
-# it under the terms of the GNU General Public License as published by
-# the Free Software Foundation, either version 3 of the License, or
-# (at your option) any later version.
-
-# This program is distributed in the hope that it will be useful,
-# but WITHOUT ANY WARRANTY; without even the implied warranty of
-# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
-# GNU General Public License for more details.
-
-# You should have received a copy of the GNU General Public License
-# along with this program.  If not, see <https://www.gnu.org/licenses/>.
-
-import os
-import arcpy
-import csv
-import json
-import codecs
-import sys
-import time
-from math import isnan
-
-def get_data(work_space_path):
-    arcpy.env.workspace = work_space_path
-    return arcpy.ListFeatureClasses() + arcpy.ListRasters()
-
-def get_rasters(work_space_path):
-    arcpy.env.workspace = work_space_path
-    return arcpy.ListRasters()
-
-def get_featureclasses(work_space_path):
-    arcpy.env.workspace = work_space_path
-    return arcpy.ListFeatureClasses()
-
-def get_datasets(work_space_path):
-    arcpy.env.workspace = work_space_path
-    return arcpy.ListDatasets()
-
-def get_tables(work_space_path):
-    arcpy.env.workspace = work_space_path
-    return arcpy.ListTables()
-
-def get_workspaces(work_space_path, wild_card = "*", workspace_type = "All"):
-    arcpy.env.workspace = work_space_path
-    return arcpy.ListWorkspaces(wild_card, workspace_type)
-
-def get_target_gdb(dir_path):
-    o_workspaces = get_workspaces(dir_path, "*", "FileGDB")
-    p_workspaces = []
-    for workspace in o_workspaces:
-        if not (workspace.endswith("_flat.gdb") or workspace.endswith("_conv.gdb")):
-            p_workspaces.append(workspace)
-    p_workspace = ""
-    if len(p_workspaces) > 1:
-        print("当前路径下存在多个数据库：")
-        for workspace in p_workspaces:
-            print(workspace.split("\\")[-1])
-        print(">>>")
-        while p_workspace == '':
-            print("请输入目标数据库名称：")
-            input_db_name = input()
-            for workspace in p_workspaces:
-                if input_db_name in workspace:
-                    p_workspace = workspace
-        return p_workspace
-    elif len(p_workspaces) == 1:
-        p_workspace = p_workspaces[0]
-        return p_workspace
-    else:
-        sys.exit("当前路径下无数据库！程序退出。")
-
-def get_target_fc(work_space_path, fc_name = "", fc_name_list = []):
-    if fc_name == "" and fc_name_list != []:
-        fc_list = conduct_featureclass_list(work_space_path)
-        p_fc = ''
-        for fc in fc_name_list:
-            for r_fc in fc_list:
-                if r_fc.split("\\")[-1] == fc:
-                    p_fc = r_fc
-                    break
-            if p_fc != "":
-                break
-        if p_fc != '':
-            return p_fc
-        else:
-            p_fc = get_target_fc_by_name(work_space_path, fc_name)
-            return p_fc
-    else:
-        p_fc = get_target_fc_by_name(work_space_path, fc_name)
-        return p_fc
-
-def get_target_fc_by_name(work_space_path, fc_name):
-    fc_list = conduct_featureclass_list(work_space_path)
-    n_fc_list = []
-    for p_fc in fc_list:
-        if fc_name in p_fc:
-            n_fc_list.append(p_fc)
-    p_fc = ''
-    if len(n_fc_list) > 1:
-        print("当前路径下存在多个符合名称要求的要素集：")
-        for fc in n_fc_list:
-            print(fc.split("\\")[-1])
-        print(">>>")
-        while p_fc == '':
-            print("请输入目标数据集名称：")
-            input_fc_name = input()
-            for fc in n_fc_list:
-                if input_fc_name in fc:
-                    p_fc = fc
-        return p_fc
-    elif len(n_fc_list) == 1:
-        return n_fc_list[0]
-    else:
-        print(">>>")
-        while p_fc == '':
-            print("当前路径下不存在符合名称要求的要素集，请重新输入名称：")
-            input_fc_name = input()
-            n_fc_list = conduct_featureclass_list(work_space_path)
-            for fc in n_fc_list:
-                if input_fc_name in fc:
-                    p_fc = fc
-        return p_fc
-
-def get_target_data_from_list(work_space_path, data_list, fc_name = "", fc_name_list = []):
-    target_data = ""
-    if fc_name == "" and fc_name_list != []:
-        for p_fc_name in fc_name_list:
-            for data in data_list:
-                if data.split("\\")[-1] == p_fc_name:
-                    target_data = data
-    else:
-        for data in data_list:
-            if data.split("\\")[-1] == fc_name:
-                target_data = data
-    if target_data != "":
-        return target_data
-    else:
-        return get_target_fc_by_name(work_space_path, fc_name)
-
-def get_structure_info(dir_path, ds_file_name=''):
-    if ds_file_name == "":
-        ds_file_path = dir_path + "\\" + "data_structure.csv"
-    else:
-        ds_file_path = dir_path + "\\" + ds_file_name
-    
-    if not os.path.isfile(ds_file_path):
-        p_structure_file_path = ""
-        while p_structure_file_path == "":
-            print(">>>")
-            print("当前路径下不存在符合名称要求的数据结构描述文件，请重新输入名称（包括后缀）：")
-            input_sf_name = input()
-            ds_file_path = dir_path + "\\" + input_sf_name
-            if os.path.isfile(ds_file_path):
-                p_structure_file_path = ds_file_path
-
-    p_set = set()
-    with codecs.open(ds_file_path, encoding="utf-8") as csv_file:
-        csv_reader = csv.reader(csv_file)
-        line_count = 0
-        for row in csv_reader:
-            if line_count == 0:
-                line_count += 1
-            if line_count > 0:
-                p_set.add(row[0])
-    return p_set
-
-def get_conversion_info(dir_path, dc_file_name=""):
-    if dc_file_name == "":
-        dc_file_path = dir_path + "\\" + "data_conversion.csv"
-    else:
-        dc_file_path = dir_path + "\\" + dc_file_name
-
-    if not os.path.isfile(dc_file_path):
-        p_conversion_file_path = ""
-        while p_conversion_file_path == "":
-            print(">>>")
-            print("当前路径下不存在符合名称要求的数据格式转换文件，请重新输入名称（包括后缀）：")
-            input_cf_name = input()
-            dc_file_path = dir_path + "\\" + input_cf_name
-            if os.path.isfile(dc_file_path):
-                p_conversion_file_path = dc_file_path
-    
-    p_dict = dict()
-    with codecs.open(dc_file_path, encoding="utf-8") as csv_file:
-        csv_reader = csv.reader(csv_file)
-        line_count = 0
-        for row in csv_reader:
-            if line_count == 0:
-                line_count += 1
-            if line_count > 0:
-                p_dict[row[0]] = [row[2], row[3]]
-    return p_dict
-
-def output_info(output_string, output_path = ""):
-    print(output_string)
-    if output_path == "":
-        global output_file_path
-        with codecs.open(output_file_path, 'a') as output_file:
-            output_file.write(output_string + '\n')
-        return 1
-    else:
-        with codecs.open(output_path, 'a') as output_file:
-            output_file.write(output_string + '\n')
-        return 0
-
-def conduct_data_list(gdb_path):
-    work_spaces = [gdb_path]
-    datasets = []
-    for dataset in get_datasets(gdb_path):
-        datasets.append(gdb_path + "\\" + dataset)
-
-    work_spaces += datasets
-
-    data_list = []
-
-    for work_space in work_spaces:
-        for data in get_data(work_space):
-            data_list.append(work_space + "\\" + data)
-
-    return data_list
-
-def conduct_featureclass_list(gdb_path):
-    work_spaces = [gdb_path]
-    datasets = []
-    for dataset in get_datasets(gdb_path):
-        datasets.append(gdb_path + "\\" + dataset)
-
-    data_list = []
-    work_spaces += datasets
-    for work_space in work_spaces:
-        for data in get_featureclasses(work_space):
-            data_list.append(work_space + "\\" + data)
-
-    return data_list
-
-def conduct_table_list(gdb_path):
-    work_spaces = [gdb_path]
-    datasets = []
-    for dataset in get_datasets(gdb_path):
-        datasets.append(gdb_path + "\\" + dataset)
-
-    data_list = []
-    work_spaces += datasets
-    for work_space in work_spaces:
-        for data in get_tables(work_space):
-            data_list.append(work_space + "\\" + data)
-
-    return data_list
-
-def check_reference(data_list):
-    spatial_ref_name_list = []
-    spatial_data_ref_list = []
-
-    for data in data_list:
-        spatial_ref = arcpy.Describe(data).spatialReference
-        if not spatial_ref.name in spatial_ref_name_list:
-            spatial_ref_name_list.append(spatial_ref.name)
-        if arcpy.Describe(data).dataType == "RasterBand":
-            pass
-        else:
-            spatial_data_ref_list.append([data.split("\\")[-1], spatial_ref.name])
-
-    if len(spatial_ref_name_list) > 1:
-        output_info(f"数据库中使用了 {len(spatial_ref_name_list)} 个坐标系统，具体信息为：")
-        for spatial_data_ref in spatial_data_ref_list:
-            if spatial_data_ref[1] == "Unknown":
-                output_info("{}, Unknown".format(spatial_data_ref[0].split("\\")[-1]))
-            else:
-                output_info("{}, {}".format(spatial_data_ref[0].split("\\")[-1], spatial_data_ref[1]))
-        return 0
-    elif len(spatial_ref_name_list) == 1:
-        output_info(f"数据库中坐标系统已统一为：{spatial_ref_name_list[0]}")
-        return 1
-    else:
-        output_info(f"数据库为空或无可用坐标系统！")
-        return -1
-
-def check_geometry(featureclass_list):
-    total_count, p_count = 0, 0
-    fields = ['CLASS', 'FEATURE_ID', 'PROBLEM']
-    for featureclass in featureclass_list:
-        p_count = 0
-        p_output_name = "memory\\" + featureclass.split("\\")[-1]
-        arcpy.CheckGeometry_management(featureclass, p_output_name)
-        p_count = int(arcpy.GetCount_management(p_output_name)[0])
-        if p_count > 0:
-            output_info(f"{featureclass} 存在几何错误。错误信息如下：")
-            with arcpy.da.SearchCursor(p_output_name, fields) as cursor:
-                for row in cursor:
-                    output_info('{0}, {1}, {2}'.format(row[0], row[1], row[2]))
-        else:
-            print(f"{featureclass} 不存在几何错误。")
-        total_count += p_count
-        delete_temp(p_output_name)
-    if total_count > 0:
-        output_info(f"数据库中共存在有 {total_count} 个几何错误，请注意修正。")
-        return 0
-    else:
-        output_info("数据库中不存在几何错误。")
-        return 1
-
-def check_extent(base_data, data_list):
-    signal = 1
-    if base_data in data_list:
-        data_list.remove(base_data)
-    base_data_desc = arcpy.Describe(base_data)
-    if isnan(base_data_desc.extent.XMin) or isnan(base_data_desc.extent.YMin) or \
-       isnan(base_data_desc.extent.XMax) or isnan(base_data_desc.extent.YMax):
-        sys.exit("基准范围验证数据为空或存在范围错误！")
-    
-    center_point = ((base_data_desc.extent.XMax + base_data_desc.extent.XMin) / 2, \
-                    (base_data_desc.extent.YMax + base_data_desc.extent.YMin) / 2)
-    
-    xy_range = ((base_data_desc.extent.XMax - base_data_desc.extent.XMin), \
-                (base_data_desc.extent.YMax - base_data_desc.extent.YMin))
-
-    extended_extent = (center_point[0] - xy_range[0], center_point[1] - xy_range[1], \
-                       center_point[0] + xy_range[1], center_point[1] + xy_range[1])
-
-    for data in data_list:
-        if arcpy.Describe(data).dataType == "RasterBand":
-            pass
-        else:
-            p_desc = arcpy.Describe(data)
-            p_name, p_extent = p_desc.name, p_desc.extent
-            if isnan(p_extent.XMin) or isnan(p_extent.YMin) or isnan(p_extent.XMax) or isnan(p_extent.YMax):
-                output_info(f"{p_name} 数据为空或存在范围错误！")
-                if signal > -1:
-                    signal = -1
-            elif p_extent.XMin < extended_extent[0] or p_extent.YMin < extended_extent[1] or \
-               p_extent.XMax > extended_extent[2] or p_extent.YMax > extended_extent[3]:
-                output_info(f"{p_name} 范围可能异常！")
-                if signal > 0:
-                    signal = 0
-    if signal == 1:
-        output_info("数据范围正常。")
-    return signal
-
-def check_fc_boundary(base_data, fc_list):
-    signal = 1
-    if base_data in fc_list:
-        fc_list.remove(base_data)
-    for featureclass in fc_list:
-        if arcpy.Describe(featureclass).featureType != "Annotation":
-            p_output_name = "memory\\" + featureclass.split("\\")[-1] + "_erase"
-            arcpy.Erase_analysis(featureclass, base_data, p_output_name)
-            p_count = int(arcpy.GetCount_management(p_output_name)[0])
-            if p_count > 0:
-                output_info(f"{featureclass} 超出规划范围，需要核对。")
-                signal -= 1
-            else:
-                print(f"{featureclass} 未超出规划范围。")
-            delete_temp(p_output_name)
-    if signal == 1:
-        output_info("全部数据均落入规划范围内。")
-    return signal
-
-def check_data_structure(data_list, name_set):
-    signal = 1
-    ir_set = set()
-    for data in data_list:
-        if arcpy.Describe(data).dataType == "RasterBand":
-            pass
-        else:
-            if data.split("\\")[-1] in name_set:
-                print(f"{data} 命名规范。")
-            else:
-                output_info(f"{data} 命名不规范！")
-                ir_set.add(data.split("\\")[-1])
-    if ir_set:
-        p_output_set_info = ", ".join(ir_set)
-        output_info(f"命名不规范的图层为：{p_output_set_info}。")
-        signal = 0
-    else:
-        output_info("所有图层皆规范命名。")
-    return signal
-
-def converse_data_structure(dir_path, data_list, gdb, structure_dict):
-    gdb_name = gdb.split('\\')[-1].split(".")[0]
-    conv_gdb_path = dir_path + "\\" + gdb_name + "_conv.gdb"
-    if arcpy.Exists(conv_gdb_path):
-        sys.exit("该数据库已存在！")
-    else:
-        arcpy.CreateFileGDB_management(dir_path, gdb_name + "_conv")
-        output_info(f"转换输出数据库为：{conv_gdb_path}。")
-        for data in data_list:
-            if arcpy.Describe(data).dataType == "RasterBand":
-                pass
-            else:
-                if data.split("\\")[-1] in structure_dict.keys():
-                    if structure_dict[data.split("\\")[-1]][0] != "NA":
-                        to_name = structure_dict[data.split("\\")[-1]][0]
-                        to_alias = structure_dict[data.split("\\")[-1]][1]
-                        if arcpy.Describe(data).dataType == "RasterDataset":
-                            arcpy.Copy_management(data, conv_gdb_path + "\\" + to_name)
-                        else:
-                            arcpy.Copy_management(data, conv_gdb_path + "\\" + to_name)
-                            arcpy.AlterAliasName(conv_gdb_path + "\\" + to_name, to_alias)
-                        output_info(f"{data} 转换为 {conv_gdb_path}\\{to_name}")
-                    else:
-                        output_info(f"{data} 未进行转换！")
-                else:
-                    output_info(f"{data} 未进行转换！")
-    return 1
-
-def summarize_table_structure(data_list):
-    signal = 1
-    for data in data_list:
-        field_list = arcpy.ListFields(data)
-        if field_list and arcpy.Describe(data).dataType != "RasterBand":
-            p_field_info = data.split("\\")[-1] + ","
-            for field in field_list:
-                if field.name in ["Shape_Area", "Shape_Length"]:
-                    pass
-                else:
-                    if field.aliasName:
-                        p_field_info += f" {field.aliasName}, {field.type}, {field.length},"
-                    else:
-                        p_field_info += f" {field.name}, {field.type}, {field.length},"
-            p_field_info = p_field_info[:-1]
-            output_info(p_field_info)
-        else:
-            print(f"{data} 无数据表或非数据表检测对象。")
-    return signal
-
-def export_to_flat_gdb(dir_path, gdb, data_list):
-    gdb_name = gdb.split('\\')[-1].split(".")[0]
-    flat_gdb_path = dir_path + "\\" + gdb_name + "_flat.gdb"
-    if arcpy.Exists(flat_gdb_path):
-        sys.exit("该数据库已存在！")
-    else:
-        arcpy.CreateFileGDB_management(dir_path, gdb_name + "_flat")
-        for data in data_list:
-            if arcpy.Describe(data).dataType == "RasterBand":
-                pass
-            else:
-                arcpy.Copy_management(data, flat_gdb_path + "\\" + data.split("\\")[-1])
-                print(f"{data} 导出成功。")
-        return 1
-
-def check_geometry_single(featureclass):
-    p_count = 0
-    fields = ['CLASS', 'FEATURE_ID', 'PROBLEM']
-    p_output_name = "memory\\" + featureclass.split("\\")[-1] + "_cktb"
-    arcpy.CheckGeometry_management(featureclass, p_output_name)
-    p_count = int(arcpy.GetCount_management(p_output_name)[0])
-    if p_count > 0:
-        output_info(f"{featureclass} 存在几何错误。错误信息如下：")
-        with arcpy.da.SearchCursor(p_output_name, fields) as cursor:
-            for row in cursor:
-                output_info('{0}, {1}, {2}'.format(row[0], row[1], row[2]))
-    else:
-        print(f"{featureclass} 不存在几何错误。")
-    delete_temp(p_output_name)
-    if p_count > 0:
-        return 0
-    else:
-        return 1
-
-def repair_geometry_interactive(featureclass):
-    p_repair_signal = -1
-    while p_repair_signal == -1:
-        cm = input()
-        if cm == "Y" or cm == "y":
-            p_repair_signal = 1
-            output_info(f"{featureclass} 将被修正。")
-        else:
-            p_repair_signal = 0
-            output_info(f"{featureclass} 未修正。")
-    if p_repair_signal == 1:
-        arcpy.RepairGeometry_management(featureclass)
-        return 1
-    else:
-        return 0
-
-def repair_geometry(featureclass_list, dir_path):
-    repair_signal_list = []
-    p_temp_gdb = create_temp_gdb(dir_path)
-    for featureclass in featureclass_list:
-        p_signal = check_geometry_single(featureclass)
-        if p_signal == 1:
-            pass
-        else:
-            p_output_name = p_temp_gdb + "\\" + featureclass.split("\\")[-1]
-            arcpy.CopyFeatures_management(featureclass, p_output_name)
-            arcpy.RepairGeometry_management(p_output_name)
-            if arcpy.Describe(featureclass).shapeType == "Point":
-                o_count = int(arcpy.GetCount_management(featureclass)[0])
-                n_count = int(arcpy.GetCount_management(p_output_name)[0])
-                print(f"当前待修正要素集为 {featureclass}")
-                print(f"修正前点数量为 {o_count} 个，修正后点数量为 {n_count} 个。")
-                print('是否修正？是（Y），否（N or any other input）')
-                repair_signal_list.append(repair_geometry_interactive(featureclass))
-
-            elif arcpy.Describe(featureclass).shapeType == "Polyline":
-                fields = ["Shape_Length"]
-                # arcpy.AddField_management(p_output_name, fields[0], "DOUBLE")
-                # arcpy.CalculateGeometryAttributes_management(p_output_name, \
-                #     [[fields[0], "LENGTH"]], "METERS")
-                o_length_count, n_length_count = 0, 0
-                with arcpy.da.SearchCursor(featureclass, fields) as cursor:
-                    for row in cursor:
-                        o_length_count += row[0]
-                with arcpy.da.SearchCursor(p_output_name, fields) as cursor:
-                    for row in cursor:
-                        n_length_count += row[0]
-                o_count = int(arcpy.GetCount_management(featureclass)[0])
-                n_count = int(arcpy.GetCount_management(p_output_name)[0])
-                print(f"当前待修正要素集为 {featureclass}")
-                print(f"修正前线要素数量为 {o_count} 个，修正后线要素数量为 {n_count} 个。")
-                print(f"修正前线要素长度 {o_length_count}m，修正后线要素长度 {n_length_count}m。")
-                print('是否修正？是（Y），否（N or any other input）')
-                repair_signal_list.append(repair_geometry_interactive(featureclass))
-
-            elif arcpy.Describe(featureclass).shapeType == "Polygon":
-                fields = ["Shape_Area"]
-                # arcpy.AddField_management(p_output_name, fields[0], "DOUBLE")
-                # arcpy.CalculateGeometryAttributes_management(p_output_name, \
-                #     [[fields[0], "AREA"]], area_unit='SQUARE_METERS')
-                o_area_count, n_area_count = 0, 0
-                with arcpy.da.SearchCursor(featureclass, fields) as cursor:
-                    for row in cursor:
-                        o_area_count += row[0]
-                with arcpy.da.SearchCursor(p_output_name, fields) as cursor:
-                    for row in cursor:
-                        n_area_count += row[0]
-                o_count = int(arcpy.GetCount_management(featureclass)[0])
-                n_count = int(arcpy.GetCount_management(p_output_name)[0])
-                print(f"当前待修正要素集为 {featureclass}")
-                print(f"修正前面要素数量为 {o_count} 个，修正后面要素数量为 {n_count} 个。")
-                print(f"修正前面要素面积为 {o_area_count}㎡，修正后面要素面积为 {n_area_count}㎡。")
-                print('是否修正？是（Y），否（N or any other input）')
-                repair_signal_list.append(repair_geometry_interactive(featureclass))
-
-            elif arcpy.Describe(featureclass).shapeType == "Multipoint":
-                output_info(f"{featureclass} 图形类型错误，无法修正！")
-
-            elif arcpy.Describe(featureclass).shapeType == "MultiPatch":
-                output_info(f"{featureclass} 图形类型错误，无法修正！")
-
-            delete_temp(p_output_name)
-    delete_temp(p_temp_gdb)
-    return repair_signal_list
-
-def create_temp_gdb(dir_path):
-    gdb_name = "temp_" + str(int(time.time()))
-    gdb_path = dir_path + "\\" + gdb_name + ".gdb"
-    arcpy.CreateFileGDB_management(dir_path, gdb_name)
-    return gdb_path
-
-def delete_temp(temp_name):
-    arcpy.Delete_management(temp_name)
-    return 1
-
-def check_mode(check_list):
-    p_check_mode = ""
-    print("请输入运行模式，全部检测（Y）或自定义（X）:")
-    print(">>>\n")
-    while p_check_mode == "":
-        cm = input()
-        if cm == "Y" or cm == "y":
-            p_check_mode = "Y"
-        elif cm == "X" or cm == "x":
-            p_check_mode = "X"
-        else:
-            print("模式输入错误，请重新输入:")
-
-    if p_check_mode == "Y":
-        print("执行全部检测>>>")
-        return check_list[:6]
-    else:
-        print(", ".join(check_list))
-        print("现有检测/处理方法如上，请输入需使用的检测/处理方法名：")
-        p_input = ""
-        while p_input == "":
-            pin = input()
-            if pin in check_list:
-                print(f"选定的检测/处理方法为 {pin} >>>\n")
-                p_input = pin
-            else:
-                print("方法输入错误，请重新输入:")
-        n_check_dict = [p_input]
-    return n_check_dict
-
-def process_main(func_name, para_dict):
-    if func_name == "坐标系统":
-        output_info("\n坐标系统检测结果：")
-        p_signal = check_reference(para_dict['data_list'])
-        if p_signal == -1:
-                sys.exit("数据库错误，退出检测！")
-        return p_signal
-    elif func_name == "几何":
-        output_info("\n几何检测结果：")
-        p_signal = check_geometry(para_dict['featureclass_list'])
-        return p_signal
-    elif func_name == '数据范围':
-        output_info("\n数据范围检测结果：")
-        p_signal = check_extent(para_dict['region_fc'], para_dict['data_list'])
-        return p_signal
-    elif func_name == '规划范围':
-        output_info("\n规划范围检测结果：")
-        p_signal = check_fc_boundary(para_dict['region_fc'], para_dict['featureclass_list'])
-        return p_signal
-    elif func_name == '数据结构':
-        output_info("\n数据结构检测结果：")
-        p_structure_info = get_structure_info(para_dict['dir'], para_dict['strcuture_file_name'])
-        p_signal = check_data_structure(para_dict['data_list'], p_structure_info)
-        return p_signal
-    elif func_name == '数据表结构':
-        output_info("\n数据表结构：")
-        p_signal = summarize_table_structure(para_dict['data_list'])
-        return p_signal
-    elif func_name == '去除数据层级':
-        output_info("\n新建无 dataset 数据库：")
-        export_to_flat_gdb(para_dict['dir'], para_dict['gdb'], para_dict['data_list'])
-        sys.exit("新建无 dataset 数据完成，程序退出...")
-    elif func_name == '几何修正':
-        p_signal = repair_geometry(para_dict['featureclass_list'], para_dict['dir'])
-        return p_signal
-    elif func_name == '数据结构转换':
-        p_conversion_dict = get_conversion_info(para_dict['dir'], para_dict['conversion_file_name'])
-        p_signal = converse_data_structure(para_dict['dir'], para_dict['data_list'], \
-                                            para_dict['gdb'], p_conversion_dict)
-        sys.exit("数据结构转换完成，程序退出...")
-    else:
-        sys.exit("函数错误，退出检测！")
-
-if __name__ == "__main__":
-
-    check_list = ["坐标系统", "几何", "数据范围", "规划范围", "数据结构", \
-                "数据表结构", "去除数据层级", "几何修正", "数据结构转换"]
-    admin_fc_name_list = ["行政区划_市级", "行政区划_县级", "行政区划_乡级", "行政区划_村级"]
-    structure_file_name = ''
-    conversion_file_name = ''
-    admin_fc_name = ''
-    check_signal = []
-
-    dir_path = os.path.dirname(os.path.realpath(__file__))
-    p_gdb = get_target_gdb(dir_path)
-    output_file_path = dir_path + "\\" + p_gdb.split("\\")[-1].split(".")[-2] + ".csv"
-    p_data_list = conduct_data_list(p_gdb)
-    p_featureclass_list = conduct_featureclass_list(p_gdb)
-
-    print("初始化完成>>>\n")
-    output_info(f"被检测数据库为：{p_gdb}\n")
-    print("获取规划区划范围要素>>>\n")
-
-    p_region_fc = get_target_fc(p_gdb, "", admin_fc_name_list)
-    para_dict = {'dir': dir_path,'gdb': p_gdb, 'data_list': p_data_list, 'featureclass_list': p_featureclass_list, \
-        'region_fc': p_region_fc, 'admin_fc_name': admin_fc_name, 'admin_fc_name_list': admin_fc_name_list, \
-        'strcuture_file_name': structure_file_name, 'conversion_file_name': conversion_file_name}
-    p_check_mode = check_mode(check_list)
-
-    print("开始检测>>>\n")
-
-    for check in p_check_mode:
-        check_signal.append(process_main(check, para_dict))
-
-    output_info(f"\n检测/处理结束，状态：{check_signal}。")
-
-
-    #tbd: topology check: No overlapping, No intersection
-    #tbd: conversion to provincial standard database
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Shanghai Tongji Urban Planning & Design Institute Co., Ltd. - Academy of Spatial Planning
+# zongli@tjupdi.com
+# Composed in Python 3.6.10 for ArcGIS Pro
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import re
+import csv
+import json
+import codecs
+import cProfile
+import hashlib
+import importlib.util
+import shutil
+import signal
+import sqlite3
+import sys
+import time
+import argparse
+import contextlib
+import io
+import traceback
+import multiprocessing
+import queue
+import xml.etree.ElementTree as ElementTree
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from fnmatch import fnmatch
+from itertools import groupby, islice
+
+def lazy_import(name):
+    if name in sys.modules:
+        return sys.modules[name]
+    p_spec = importlib.util.find_spec(name)
+    if p_spec is None:
+        return None
+    p_spec.loader = importlib.util.LazyLoader(p_spec.loader)
+    p_module = importlib.util.module_from_spec(p_spec)
+    sys.modules[name] = p_module
+    p_spec.loader.exec_module(p_module)
+    return p_module
+
+arcpy = lazy_import("arcpy")
+pyogrio = lazy_import("pyogrio")
+shapely = lazy_import("shapely")
+pyinstrument = lazy_import("pyinstrument")
+
+data_backend = "arcpy" if arcpy is not None else "open"
+open_catalog_cache = dict()
+open_spatial_ref_cache = dict()
+snapshot_cache = dict()
+snapshot_skip_types = ["OID", "Geometry", "Blob", "Raster", "GlobalID"]
+gdb_catalog_cache = dict()
+region_geometry_cache = dict()
+layer_index_cache = dict()
+layer_tree_cache = dict()
+gdb_item_types = {"{74737149-DCB5-4257-8904-B9724E32A530}": "FeatureDataset", \
+                  "{70737809-852C-4A03-9E22-2CECEA5B9BFA}": "FeatureClass", \
+                  "{CD06BC3B-789D-4C51-AAFA-A467912B8965}": "Table", \
+                  "{5ED667A3-9CA9-44A2-8029-D95BF23704B9}": "RasterDataset"}
+open_shape_types = {"Point": "Point", "MultiPoint": "Multipoint", "LineString": "Polyline", \
+                    "MultiLineString": "Polyline", "Polygon": "Polygon", "MultiPolygon": "Polygon"}
+open_field_types = {"OFTString": "String", "OFTInteger": "Integer", "OFTInteger64": "BigInteger", \
+                    "OFTReal": "Double", "OFTDate": "Date", "OFTDateTime": "Date", "OFTBinary": "Blob"}
+conversion_type_map = {"面": ["Polygon"], "线": ["Polyline"], "点": ["Point", "Multipoint"], \
+                       "注记": ["Annotation"], "栅格": ["RasterDataset"]}
+attribute_type_groups = {"String": "String", "字符型": "String", "Integer": "Integer", "SmallInteger": "Integer", \
+                         "BigInteger": "Integer", "整型": "Integer", "Double": "Double", "Single": "Double", \
+                         "双精度": "Double", "Date": "Date", "日期型": "Date"}
+attribute_null_values = {"String": "", "SmallInteger": -32768, "Integer": -2147483648, \
+                         "BigInteger": -9223372036854775808, "Double": np.nan, "Single": np.nan}
+data_inventory = dict()
+interactive_mode = True
+result_sink = None
+result_cache = None
+instrument_stats = None
+progress_state = None
+cancel_state = {'requested': False, 'path': "", 'last_check': 0.0}
+cancel_message = "检测/处理已取消！"
+instrument_call_names = {"arcpy": ["Describe", "Exists", "GetCount_management", "CheckGeometry_management", \
+    "RepairGeometry_management", "Project_management", "ListTransformations", "Erase_analysis", "Select_analysis", "Copy_management", "AlterAliasName", \
+    "CreateFileGDB_management", "Delete_management", "ListFields", "ListWorkspaces"], \
+    "arcpy.da": ["SearchCursor", "FeatureClassToNumPyArray", "TableToNumPyArray", "Walk"], \
+    "pyogrio": ["read_info", "list_layers"], "pyogrio.raw": ["read"]}
+gdb_table_cache = dict()
+inventory_checks = ["坐标系统", "数据范围", "数据表结构"]
+result_fields = ["check", "layer", "feature_id", "problem", "severity", "message"]
+
+def request_input(error_message):
+    if interactive_mode:
+        return input()
+    else:
+        sys.exit(error_message)
+
+def set_data_backend(backend):
+    global data_backend
+    if backend == "arcpy" and arcpy is None:
+        sys.exit("未安装 arcpy，无法使用 arcpy 数据后端！")
+    elif backend == "open" and (pyogrio is None or shapely is None):
+        sys.exit("未安装 pyogrio 与 shapely，无法使用开源数据后端！")
+    elif backend == "snapshot" and shapely is None:
+        sys.exit("未安装 shapely，无法使用快照数据后端！")
+    elif backend not in ["arcpy", "open", "snapshot"]:
+        sys.exit(f"数据后端 {backend} 不存在！")
+    data_backend = backend
+    return backend
+
+def require_arcpy(process_name):
+    if data_backend != "arcpy":
+        sys.exit(f"{process_name} 需要使用 arcpy 数据后端！")
+    return 1
+
+def require_shapely(process_name):
+    if shapely is None:
+        sys.exit(f"{process_name} 需要安装 shapely！")
+    return 1
+
+def split_data_path(data):
+    p_parts = data.split("\\")
+    for p_index, p_part in enumerate(p_parts):
+        if os.path.splitext(p_part)[1].lower() in [".gdb", ".gpkg", ".sqlite"]:
+            return "\\".join(p_parts[:p_index + 1]), p_parts[p_index + 1:]
+    return data, []
+
+def open_list_catalog(work_space_path):
+    gdb_path = split_data_path(work_space_path)[0]
+    if gdb_path not in open_catalog_cache:
+        p_items = []
+        if gdb_path.lower().endswith(".gdb"):
+            p_meta, p_fids, p_wkbs, p_field_data = pyogrio.raw.read(gdb_path, layer="GDB_Items", \
+                columns=["Path", "Type"], read_geometry=False, LIST_ALL_TABLES="YES")
+            p_columns = dict(zip(p_meta['fields'], p_field_data))
+            for p_path, p_type in zip(p_columns['Path'], p_columns['Type']):
+                if p_type in gdb_item_types and p_path and p_path.strip("\\"):
+                    p_items.append([p_path.strip("\\").split("\\"), gdb_item_types[p_type]])
+        else:
+            for p_name, p_geometry_type in pyogrio.list_layers(gdb_path):
+                p_items.append([[p_name], "Table" if p_geometry_type is None else "FeatureClass"])
+        open_catalog_cache[gdb_path] = p_items
+    return open_catalog_cache[gdb_path]
+
+def open_read_spatial_refs(gdb_path):
+    if gdb_path not in open_spatial_ref_cache:
+        p_refs = dict()
+        p_meta, p_fids, p_wkbs, p_field_data = pyogrio.raw.read(gdb_path, layer="GDB_Items", \
+            columns=["Path", "Definition"], read_geometry=False, LIST_ALL_TABLES="YES")
+        for p_path, p_definition in zip(p_field_data[0], p_field_data[1]):
+            if not p_path or not p_definition or "<SpatialReference" not in p_definition:
+                continue
+            p_values = dict()
+            for p_element in ElementTree.fromstring(p_definition).iter():
+                if p_element.tag.split("}")[-1] == "SpatialReference":
+                    p_values = dict([(p.tag.split("}")[-1], p.text) for p in p_element])
+                    break
+            p_wkt = p_values.get('WKT') or ""
+            p_name = re.match(r'\w+\["([^"]*)"', p_wkt)
+            p_refs[p_path.strip("\\").split("\\")[-1].lower()] = {'name': p_name.group(1) if p_name else "Unknown", \
+                'wkid': int(p_values.get('LatestWKID') or p_values.get('WKID') or 0), 'wkt': p_wkt, \
+                'xyTolerance': float(p_values['XYTolerance']) if p_values.get('XYTolerance') else None, \
+                'xyResolution': 1.0 / float(p_values['XYScale']) if p_values.get('XYScale') else None}
+        open_spatial_ref_cache[gdb_path] = p_refs
+    return open_spatial_ref_cache[gdb_path]
+
+def open_describe_data(data):
+    gdb_path, p_parts = split_data_path(data)
+    p_meta = pyogrio.read_info(gdb_path, layer=p_parts[-1], force_feature_count=True, force_total_bounds=True)
+    p_crs = p_meta['crs']
+    p_geometry_type = p_meta['geometry_type']
+    p_info = {'name': p_parts[-1], 'dataType': "Table" if p_geometry_type is None else "FeatureClass", \
+              'spatialReference': None, 'extent': None, 'featureType': None, 'shapeType': None, \
+              'fields': [], 'count': p_meta['features']}
+    for p_field, p_type in zip(p_meta['fields'], p_meta['ogr_types']):
+        p_info['fields'].append({'name': p_field, 'aliasName': "", \
+                                 'type': open_field_types.get(p_type, p_type), 'length': None})
+    if p_geometry_type is not None:
+        p_info['featureType'] = "Simple"
+        p_info['shapeType'] = open_shape_types.get(p_geometry_type.replace("3D ", ""), p_geometry_type)
+        p_wkid = int(p_crs.split(":")[1]) if p_crs and p_crs.startswith("EPSG:") else 0
+        p_info['spatialReference'] = {'name': p_crs or "Unknown", 'wkid': p_wkid, 'wkt': "", \
+                                      'xyTolerance': None, 'xyResolution': None}
+        if gdb_path.lower().endswith(".gdb"):
+            p_info['spatialReference'] = open_read_spatial_refs(gdb_path).get(p_parts[-1].lower(), \
+                                                                              p_info['spatialReference'])
+        if p_meta['features'] > 0 and p_meta['total_bounds'] is not None:
+            p_info['extent'] = tuple(float(p) for p in p_meta['total_bounds'])
+        else:
+            p_info['extent'] = (np.nan, np.nan, np.nan, np.nan)
+    return p_info
+
+def open_read_geometries(data, batch_size = 0):
+    gdb_path, p_parts = split_data_path(data)
+    p_skip = 0
+    while True:
+        p_fids, p_wkbs = pyogrio.raw.read(gdb_path, layer=p_parts[-1], columns=[], skip_features=p_skip, \
+                                          max_features=batch_size or None, return_fids=True)[1:3]
+        yield p_fids, p_wkbs
+        if not batch_size or len(p_fids) < batch_size:
+            break
+        p_skip += batch_size
+
+def open_check_geometry_batches(featureclass, batch_size):
+    for p_fids, p_wkbs in read_layer_geometries(featureclass, batch_size):
+        p_geoms = shapely.from_wkb(p_wkbs, on_invalid="ignore")
+        p_reasons = shapely.is_valid_reason(p_geoms)
+        p_rows = []
+        for p_fid, p_wkb, p_geom, p_reason in zip(p_fids, p_wkbs, p_geoms, p_reasons):
+            if p_wkb is None:
+                p_rows.append((featureclass, int(p_fid), "null geometry"))
+            elif p_geom is None:
+                p_rows.append((featureclass, int(p_fid), "unsupported geometry"))
+            elif shapely.is_empty(p_geom):
+                p_rows.append((featureclass, int(p_fid), "empty geometry"))
+            elif p_reason != "Valid Geometry":
+                p_rows.append((featureclass, int(p_fid), p_reason.split("[")[0]))
+        yield p_rows
+
+def get_snapshot_dir(gdb_path):
+    return os.path.splitext(gdb_path)[0] + "_snapshot"
+
+def get_snapshot(gdb_path):
+    if gdb_path not in snapshot_cache:
+        p_manifest_path = os.path.join(get_snapshot_dir(gdb_path), "snapshot.json")
+        if not os.path.isfile(p_manifest_path):
+            sys.exit(f"{gdb_path} 不存在数据快照，请先使用数据快照处理生成！")
+        with codecs.open(p_manifest_path, encoding="utf-8") as manifest_file:
+            snapshot_cache[gdb_path] = json.load(manifest_file)
+    return snapshot_cache[gdb_path]
+
+def get_snapshot_layer(data):
+    gdb_path, p_parts = split_data_path(data)
+    p_layer = get_snapshot(gdb_path)['layers'][("\\".join(p_parts))]
+    return dict(p_layer, path=os.path.join(get_snapshot_dir(gdb_path), p_layer['dir']))
+
+def list_snapshot_layer_dirs(snapshot_dir):
+    if not os.path.isdir(snapshot_dir):
+        return []
+    return [p.name for p in os.scandir(snapshot_dir) if p.is_dir() and re.fullmatch(r"l\d{4,}", p.name)]
+
+def list_snapshot_gdbs(work_space_path):
+    return sorted([os.path.join(work_space_path, p[:-len("_snapshot")] + ".gdb") for p in os.listdir(work_space_path) \
+                   if p.endswith("_snapshot") and os.path.isfile(os.path.join(work_space_path, p, "snapshot.json"))])
+
+def snapshot_describe_data(data):
+    p_info = dict(get_snapshot_layer(data)['info'])
+    if p_info['extent'] is not None:
+        p_info['extent'] = tuple(p_info['extent'])
+    return p_info
+
+def snapshot_read_geometries(data, batch_size = 0):
+    p_path = get_snapshot_layer(data)['path']
+    p_fids = np.load(os.path.join(p_path, "shape_fids.npy"), mmap_mode="r")
+    p_offsets = np.load(os.path.join(p_path, "wkb_offsets.npy"), mmap_mode="r")
+    p_wkb_path = os.path.join(p_path, "wkb.bin")
+    p_wkb = np.memmap(p_wkb_path, dtype=np.uint8, mode="r") if os.path.getsize(p_wkb_path) > 0 else b""
+    p_step = batch_size or max(len(p_fids), 1)
+    for p_start in range(0, max(len(p_fids), 1), p_step):
+        p_end = min(p_start + p_step, len(p_fids))
+        p_base = int(p_offsets[p_start])
+        p_blob = bytes(p_wkb[p_base:int(p_offsets[p_end])])
+        p_bounds = (p_offsets[p_start:p_end + 1] - p_base).tolist()
+        p_wkbs = np.empty(p_end - p_start, dtype=object)
+        p_wkbs[:] = [p_blob[p_a:p_b] if p_b > p_a else None for p_a, p_b in zip(p_bounds[:-1], p_bounds[1:])]
+        yield np.asarray(p_fids[p_start:p_end]), p_wkbs
+
+def snapshot_read_attribute_batches(data, p_names, batch_size = 0):
+    p_layer = get_snapshot_layer(data)
+    p_fids = np.load(os.path.join(p_layer['path'], "fids.npy"), mmap_mode="r")
+    p_columns = dict([(p, np.load(os.path.join(p_layer['path'], p_layer['fields'][p]), mmap_mode="r")) \
+                      for p in p_names])
+    p_step = batch_size or max(len(p_fids), 1)
+    for p_start in range(0, max(len(p_fids), 1), p_step):
+        yield p_fids[p_start:p_start + p_step], \
+              dict([(p, p_column[p_start:p_start + p_step]) for p, p_column in p_columns.items()])
+
+def snapshot_layer(data, layer_path, batch_size = 500000):
+    os.makedirs(layer_path, exist_ok=True)
+    p_info = get_data_info(data)
+    if p_info['dataType'] == "FeatureClass":
+        p_fid_list, p_offset_list = [np.empty(0, dtype=np.int64)], [np.zeros(1, dtype=np.int64)]
+        with open(os.path.join(layer_path, "wkb.bin"), "wb") as wkb_file:
+            for p_fids, p_wkbs in read_layer_geometries(data, 100000):
+                p_lengths = np.array([0 if p is None else len(p) for p in p_wkbs], dtype=np.int64)
+                p_offset_list.append(p_offset_list[-1][-1] + np.cumsum(p_lengths))
+                wkb_file.write(b"".join([p for p in p_wkbs if p is not None]))
+                p_fid_list.append(np.asarray(p_fids, dtype=np.int64))
+        np.save(os.path.join(layer_path, "shape_fids.npy"), np.concatenate(p_fid_list))
+        np.save(os.path.join(layer_path, "wkb_offsets.npy"), np.concatenate(p_offset_list))
+    p_field_list = [field for field in p_info['fields'] if field['type'] not in snapshot_skip_types]
+    p_fid_list = [np.empty(0, dtype=np.int64)]
+    p_value_dict = dict([(field['name'], []) for field in p_field_list])
+    for p_fids, p_values in read_attribute_batches(data, p_field_list, batch_size):
+        p_fid_list.append(np.asarray(p_fids, dtype=np.int64))
+        for p_name, p_column in p_values.items():
+            if p_column.dtype == object:
+                # strings become fixed-width unicode so that they can be memory-mapped; nulls read as ""
+                p_column = np.array(["" if p is None else str(p) for p in p_column], dtype=str)
+            p_value_dict[p_name].append(p_column)
+    np.save(os.path.join(layer_path, "fids.npy"), np.concatenate(p_fid_list))
+    p_fields = dict()
+    for p_index, (p_name, p_columns) in enumerate(p_value_dict.items()):
+        p_fields[p_name] = "f%03d.npy" % p_index
+        p_column = np.concatenate(p_columns) if p_columns else np.empty(0, dtype=np.float64)
+        np.save(os.path.join(layer_path, p_fields[p_name]), p_column)
+    return p_fields
+
+def export_snapshot(gdb_path, data_list, worker_count = 1):
+    if data_backend == "snapshot":
+        sys.exit("快照数据后端下无法再生成快照！")
+    p_snapshot_dir = get_snapshot_dir(gdb_path)
+    p_manifest_path = os.path.join(p_snapshot_dir, "snapshot.json")
+    p_manifest = {'gdb': gdb_path, 'catalog': [], 'layers': dict()}
+    if os.path.isfile(p_manifest_path):
+        with codecs.open(p_manifest_path, encoding="utf-8") as manifest_file:
+            p_manifest = json.load(manifest_file)
+    p_old_layers = p_manifest['layers']
+    p_manifest['catalog'] = [p for p in walk_catalog(gdb_path) if p[1] != "RasterDataset"]
+    p_manifest['layers'] = dict()
+    p_tasks = []
+    p_next = max([-1] + [int(p[1:]) for p in list_snapshot_layer_dirs(p_snapshot_dir)]) + 1
+    for data in data_list:
+        p_info = get_data_info(data)
+        if p_info['dataType'] not in ["FeatureClass", "Table"]:
+            continue
+        p_key = "\\".join(split_data_path(data)[1])
+        p_fingerprint = fingerprint_layer(data, p_info)
+        p_layer = p_old_layers.get(p_key)
+        if p_layer is not None and p_layer['fingerprint'] == p_fingerprint:
+            p_manifest['layers'][p_key] = p_layer
+            continue
+        # changed layers are written to a new directory, so the old manifest stays readable until it is replaced
+        p_dir = "l%04d" % (p_next + len(p_tasks))
+        p_manifest['layers'][p_key] = {'dir': p_dir, 'fingerprint': p_fingerprint, 'info': p_info, 'fields': dict()}
+        p_tasks.append([data, os.path.join(p_snapshot_dir, p_dir)])
+    p_start = time.time()
+    for (data, layer_path), p_fields in zip(p_tasks, run_layer_tasks(snapshot_layer, p_tasks, worker_count)):
+        p_manifest['layers']["\\".join(split_data_path(data)[1])]['fields'] = p_fields
+        output_info(f"{data} 快照完成。", layer=data)
+    with codecs.open(p_manifest_path, 'w', encoding="utf-8") as manifest_file:
+        json.dump(p_manifest, manifest_file, ensure_ascii=False)
+    snapshot_cache.pop(gdb_path, None)
+    p_dirs = set([p['dir'] for p in p_manifest['layers'].values()])
+    for p_dir in list_snapshot_layer_dirs(p_snapshot_dir):
+        if p_dir not in p_dirs:
+            shutil.rmtree(os.path.join(p_snapshot_dir, p_dir))
+    output_info(f"共 {len(p_manifest['layers'])} 个图层，更新 {len(p_tasks)} 个，" \
+                f"用时 {time.time() - p_start:.1f} 秒。快照目录：{p_snapshot_dir}")
+    return 1
+
+def get_workspaces(work_space_path, wild_card = "*", workspace_type = "All"):
+    if data_backend == "snapshot":
+        return [p for p in list_snapshot_gdbs(work_space_path) if fnmatch(os.path.basename(p), wild_card)]
+    p_extensions = {"FileGDB": [".gdb"], "GeoPackage": [".gpkg"]}.get(workspace_type)
+    if p_extensions is None and data_backend == "arcpy":
+        arcpy.env.workspace = work_space_path
+        return arcpy.ListWorkspaces(wild_card, workspace_type)
+    elif p_extensions is None:
+        p_extensions = [".gdb", ".gpkg"]
+    # list the folder directly so that arcpy is not loaded before a database has been chosen
+    return sorted([p.path for p in os.scandir(work_space_path) if fnmatch(p.name, wild_card) and \
+                   os.path.splitext(p.name)[1].lower() in p_extensions and p.is_dir() == p.name.lower().endswith(".gdb")])
+
+def walk_catalog(gdb_path):
+    if data_backend == "snapshot":
+        return get_snapshot(gdb_path)['catalog']
+    elif data_backend == "open":
+        return [p_item for p_item in open_list_catalog(gdb_path) if p_item[1] != "RasterDataset"]
+    elif pyogrio is not None and gdb_path.lower().endswith(".gdb"):
+        return open_list_catalog(gdb_path)
+    p_items = []
+    p_datasets = set()
+    for p_type in ["FeatureClass", "RasterDataset", "Table"]:
+        for dir_path, dir_names, file_names in arcpy.da.Walk(gdb_path, datatype=p_type):
+            p_dataset = dir_path[len(gdb_path):].strip("\\/")
+            if p_dataset != "" and p_dataset not in p_datasets:
+                p_datasets.add(p_dataset)
+                p_items.append([[p_dataset], "FeatureDataset"])
+            for file_name in file_names:
+                p_items.append([[p_dataset, file_name] if p_dataset != "" else [file_name], p_type])
+    return p_items
+
+def build_catalog(gdb_path):
+    p_catalog = {'gdb': gdb_path, 'datasets': [], 'types': dict(), 'by_name': dict(), \
+                 'by_dataset': {"": dict()}, 'by_type': dict(), 'bigrams': dict(), 'order': dict()}
+    for p_parts, p_type in walk_catalog(gdb_path):
+        if p_type == "FeatureDataset":
+            p_catalog['datasets'].append(p_parts[-1])
+            p_catalog['by_dataset'].setdefault(p_parts[-1], dict())
+            continue
+        p_data = gdb_path + "\\" + "\\".join(p_parts)
+        p_relative_path = "\\".join(p_parts)
+        p_catalog['types'][p_data] = p_type
+        p_catalog['by_name'].setdefault(p_parts[-1], []).append(p_data)
+        p_catalog['by_dataset'].setdefault(p_parts[0] if len(p_parts) > 1 else "", dict()) \
+            .setdefault(p_type, []).append(p_data)
+        p_catalog['by_type'].setdefault(p_type, []).append(p_data)
+        for p_bigram in set([p_relative_path[p:p + 2] for p in range(len(p_relative_path) - 1)]):
+            p_catalog['bigrams'].setdefault(p_bigram, set()).add(p_data)
+    for p_index, p_data in enumerate(list_catalog_data(p_catalog, ["FeatureClass", "RasterDataset", "Table"])):
+        p_catalog['order'][p_data] = p_index
+    return p_catalog
+
+def get_catalog(work_space_path):
+    gdb_path = split_data_path(work_space_path)[0]
+    if gdb_path not in gdb_catalog_cache:
+        gdb_catalog_cache[gdb_path] = build_catalog(gdb_path)
+    return gdb_catalog_cache[gdb_path]
+
+def list_catalog_data(catalog, data_types):
+    data_list = []
+    for p_dataset in [""] + catalog['datasets']:
+        for p_type in data_types:
+            data_list += catalog['by_dataset'][p_dataset].get(p_type, [])
+    return data_list
+
+def find_catalog_data(catalog, name, data_types = ["FeatureClass"]):
+    return [data for data in catalog['by_name'].get(name, []) if catalog['types'][data] in data_types]
+
+def search_catalog(catalog, text, data_types = ["FeatureClass"]):
+    if len(text) < 2:
+        p_candidates = catalog['types'].keys()
+    else:
+        p_bigram_sets = [catalog['bigrams'].get(text[p:p + 2], set()) for p in range(len(text) - 1)]
+        p_candidates = set.intersection(*sorted(p_bigram_sets, key=len))
+    p_gdb_length = len(catalog['gdb']) + 1
+    return sorted([data for data in p_candidates if catalog['types'][data] in data_types and \
+                   text in data[p_gdb_length:]], key=lambda data: catalog['order'][data])
+
+def is_derived_gdb(gdb_path):
+    p_name = os.path.splitext(gdb_path.replace("\\", os.sep).split(os.sep)[-1])[0]
+    p_base, p_sep, p_pid = p_name.rpartition("_stage")
+    if p_sep and p_pid.isdigit():
+        p_name = p_base
+    return p_name.startswith("temp_") or p_name.endswith("_flat") or p_name.endswith("_conv") or \
+        p_name.endswith("_crs")
+
+def get_target_gdb(dir_path):
+    o_workspaces = get_workspaces(dir_path, "*", "FileGDB")
+    if data_backend == "open":
+        o_workspaces += get_workspaces(dir_path, "*", "GeoPackage")
+    p_workspaces = []
+    for workspace in o_workspaces:
+        if not is_derived_gdb(workspace):
+            p_workspaces.append(workspace)
+    p_workspace = ""
+    if len(p_workspaces) > 1:
+        print("当前路径下存在多个数据库：")
+        for workspace in p_workspaces:
+            print(workspace.split("\\")[-1])
+        print(">>>")
+        while p_workspace == '':
+            print("请输入目标数据库名称：")
+            input_db_name = request_input("当前路径下存在多个数据库，批处理模式下无法选择！")
+            for workspace in p_workspaces:
+                if input_db_name in workspace:
+                    p_workspace = workspace
+        return p_workspace
+    elif len(p_workspaces) == 1:
+        p_workspace = p_workspaces[0]
+        return p_workspace
+    else:
+        sys.exit("当前路径下无数据库！程序退出。")
+
+def get_target_fc(work_space_path, fc_name = "", fc_name_list = []):
+    if fc_name == "" and fc_name_list != []:
+        p_catalog = get_catalog(work_space_path)
+        p_fc = ''
+        for fc in fc_name_list:
+            r_fc_list = find_catalog_data(p_catalog, fc)
+            if r_fc_list != []:
+                p_fc = r_fc_list[0]
+                break
+        if p_fc != '':
+            return p_fc
+        else:
+            p_fc = get_target_fc_by_name(work_space_path, fc_name)
+            return p_fc
+    else:
+        p_fc = get_target_fc_by_name(work_space_path, fc_name)
+        return p_fc
+
+def get_target_fc_by_name(work_space_path, fc_name):
+    p_catalog = get_catalog(work_space_path)
+    n_fc_list = search_catalog(p_catalog, fc_name)
+    p_fc = ''
+    if len(n_fc_list) > 1:
+        print("当前路径下存在多个符合名称要求的要素集：")
+        for fc in n_fc_list:
+            print(fc.split("\\")[-1])
+        print(">>>")
+        while p_fc == '':
+            print("请输入目标数据集名称：")
+            input_fc_name = request_input(f"存在多个符合名称 {fc_name} 的要素集，批处理模式下无法选择！")
+            for fc in n_fc_list:
+                if input_fc_name in fc:
+                    p_fc = fc
+        return p_fc
+    elif len(n_fc_list) == 1:
+        return n_fc_list[0]
+    else:
+        print(">>>")
+        while p_fc == '':
+            print("当前路径下不存在符合名称要求的要素集，请重新输入名称：")
+            input_fc_name = request_input(f"不存在符合名称 {fc_name} 的要素集！")
+            n_fc_list = search_catalog(p_catalog, input_fc_name)
+            if n_fc_list != []:
+                p_fc = n_fc_list[-1]
+        return p_fc
+
+def get_target_data_from_list(work_space_path, data_list, fc_name = "", fc_name_list = []):
+    target_data = ""
+    p_catalog = get_catalog(work_space_path)
+    p_data_set = set(data_list)
+    if fc_name == "" and fc_name_list != []:
+        p_name_list = fc_name_list
+    else:
+        p_name_list = [fc_name]
+    for p_fc_name in p_name_list:
+        for data in find_catalog_data(p_catalog, p_fc_name, ["FeatureClass", "RasterDataset", "Table"]):
+            if data in p_data_set:
+                target_data = data
+    if target_data != "":
+        return target_data
+    else:
+        return get_target_fc_by_name(work_space_path, fc_name)
+
+def get_structure_file_path(dir_path, ds_file_name=''):
+    if ds_file_name == "":
+        ds_file_path = dir_path + "\\" + "data_structure.csv"
+    elif os.path.isabs(ds_file_name):
+        ds_file_path = ds_file_name
+    else:
+        ds_file_path = dir_path + "\\" + ds_file_name
+    
+    if not os.path.isfile(ds_file_path):
+        p_structure_file_path = ""
+        while p_structure_file_path == "":
+            print(">>>")
+            print("当前路径下不存在符合名称要求的数据结构描述文件，请重新输入名称（包括后缀）：")
+            input_sf_name = request_input(f"数据结构描述文件 {ds_file_path} 不存在！")
+            ds_file_path = dir_path + "\\" + input_sf_name
+            if os.path.isfile(ds_file_path):
+                p_structure_file_path = ds_file_path
+    return ds_file_path
+
+def get_structure_info(dir_path, ds_file_name=''):
+    ds_file_path = get_structure_file_path(dir_path, ds_file_name)
+    p_set = set()
+    with codecs.open(ds_file_path, encoding="utf-8") as csv_file:
+        csv_reader = csv.reader(csv_file)
+        line_count = 0
+        for row in csv_reader:
+            if line_count == 0:
+                line_count += 1
+            if line_count > 0:
+                p_set.add(row[0])
+    return p_set
+
+def get_field_rules(dir_path, ds_file_name=''):
+    ds_file_path = get_structure_file_path(dir_path, ds_file_name)
+    p_dict = dict()
+    with codecs.open(ds_file_path, encoding="utf-8") as csv_file:
+        csv_reader = csv.reader(csv_file)
+        p_header = [p.lstrip("\ufeff") for p in next(csv_reader)]
+        if "字段名称" not in p_header:
+            return p_dict
+        for row in csv_reader:
+            p_row = dict(zip(p_header, row))
+            if p_row.get("字段名称", "") == "":
+                continue
+            p_rule = {'field': p_row["字段名称"], 'type': attribute_type_groups.get(p_row.get("字段类型", ""), ""), \
+                      'length': int(p_row["字段长度"]) if p_row.get("字段长度", "") else None, \
+                      'required': p_row.get("必填", "") == "1", \
+                      'domain': [p for p in p_row.get("值域", "").split("|") if p != ""], \
+                      'min': float(p_row["最小值"]) if p_row.get("最小值", "") else None, \
+                      'max': float(p_row["最大值"]) if p_row.get("最大值", "") else None}
+            p_rule['int_domain'] = [int(p) for p in p_rule['domain'] if re.fullmatch(r"\s*[-+]?\d+\s*", p)]
+            if p_rule['type'] == "Integer" and len(p_rule['int_domain']) < len(p_rule['domain']):
+                p_codes = ", ".join([p for p in p_rule['domain'] if not re.fullmatch(r"\s*[-+]?\d+\s*", p)])
+                output_info(f"数据结构描述文件中 {p_row['名称']} 的整型字段 {p_rule['field']} 值域含非整数代码：" \
+                            f"{p_codes}，这些代码不参与检测。", problem="规则配置错误", severity="error")
+            p_dict.setdefault(p_row["名称"], []).append(p_rule)
+    return p_dict
+
+def get_conversion_info(dir_path, dc_file_name=""):
+    if dc_file_name == "":
+        dc_file_path = dir_path + "\\" + "data_conversion.csv"
+    elif os.path.isabs(dc_file_name):
+        dc_file_path = dc_file_name
+    else:
+        dc_file_path = dir_path + "\\" + dc_file_name
+
+    if not os.path.isfile(dc_file_path):
+        p_conversion_file_path = ""
+        while p_conversion_file_path == "":
+            print(">>>")
+            print("当前路径下不存在符合名称要求的数据格式转换文件，请重新输入名称（包括后缀）：")
+            input_cf_name = request_input(f"数据格式转换文件 {dc_file_path} 不存在！")
+            dc_file_path = dir_path + "\\" + input_cf_name
+            if os.path.isfile(dc_file_path):
+                p_conversion_file_path = dc_file_path
+    
+    p_dict = dict()
+    with codecs.open(dc_file_path, encoding="utf-8") as csv_file:
+        csv_reader = csv.reader(csv_file)
+        line_count = 0
+        for row in csv_reader:
+            if line_count == 0:
+                line_count += 1
+                continue
+            if line_count > 0:
+                p_dict[row[0]] = [row[2], row[3], row[1], row[4]]
+    return p_dict
+
+def open_csv_writer(output_path):
+    p_new_file = not os.path.isfile(output_path)
+    output_file = codecs.open(output_path, 'a', encoding="utf-8-sig", buffering=1 << 16)
+    if p_new_file:
+        csv.writer(output_file).writerow(result_fields)
+        output_file.flush()
+    return output_file
+
+def write_csv_records(output_file, records):
+    csv.writer(output_file).writerows([[record[p] for p in result_fields] for record in records])
+    output_file.flush()
+
+def open_jsonl_writer(output_path):
+    return codecs.open(output_path, 'a', encoding="utf-8", buffering=1 << 16)
+
+def write_jsonl_records(output_file, records):
+    output_file.write("".join([json.dumps(record, ensure_ascii=False) + "\n" for record in records]))
+    output_file.flush()
+
+def open_sqlite_writer(output_path):
+    p_connection = sqlite3.connect(output_path)
+    p_connection.execute("CREATE TABLE IF NOT EXISTS results (" + \
+                         ", ".join(['"' + p + '" TEXT' for p in result_fields]) + ")")
+    return p_connection
+
+def write_sqlite_records(p_connection, records):
+    p_connection.executemany("INSERT INTO results VALUES (" + ", ".join(["?"] * len(result_fields)) + ")", \
+                             [[record[p] for p in result_fields] for record in records])
+    p_connection.commit()
+
+result_writers = {"csv": [open_csv_writer, write_csv_records], \
+                  "jsonl": [open_jsonl_writer, write_jsonl_records], \
+                  "sqlite": [open_sqlite_writer, write_sqlite_records]}
+
+def open_result_sink(output_path, output_format = "csv", flush_count = 1000, flush_interval = 5):
+    if output_format not in result_writers:
+        sys.exit(f"输出格式 {output_format} 不存在！")
+    p_sink = {'path': output_path, 'format': output_format, 'check': "", 'buffer': [], \
+              'flush_count': flush_count, 'flush_interval': flush_interval, 'last_flush': time.time()}
+    p_sink['handle'] = result_writers[output_format][0](output_path)
+    return p_sink
+
+def flush_result_sink(sink):
+    if sink['buffer']:
+        result_writers[sink['format']][1](sink['handle'], sink['buffer'])
+        sink['buffer'] = []
+    sink['last_flush'] = time.time()
+    return 1
+
+def close_result_sink(sink):
+    flush_result_sink(sink)
+    sink['handle'].close()
+    return 1
+
+def output_info(output_string, layer = "", feature_id = "", problem = "", severity = "info", sink = None, echo = True):
+    if echo:
+        print(output_string)
+    if sink is None:
+        sink = result_sink
+    if sink is None:
+        return 0
+    sink['buffer'].append({'check': sink['check'], 'layer': layer, 'feature_id': feature_id, 'problem': problem, \
+                           'severity': severity, 'message': output_string.strip()})
+    if len(sink['buffer']) >= sink['flush_count'] or time.time() - sink['last_flush'] >= sink['flush_interval']:
+        flush_result_sink(sink)
+    return 1
+
+def conduct_data_list(gdb_path):
+    return list_catalog_data(get_catalog(gdb_path), ["FeatureClass", "RasterDataset"])
+
+def describe_data(data):
+    if data_backend == "snapshot":
+        return snapshot_describe_data(data)
+    elif data_backend == "open":
+        return open_describe_data(data)
+    p_desc = arcpy.Describe(data)
+    p_info = {'name': p_desc.name, 'dataType': p_desc.dataType, 'spatialReference': None, 'extent': None, \
+              'featureType': getattr(p_desc, "featureType", None), \
+              'shapeType': getattr(p_desc, "shapeType", None), 'fields': [], 'count': None}
+    p_spatial_ref = getattr(p_desc, "spatialReference", None)
+    if p_spatial_ref is not None:
+        p_info['spatialReference'] = {'name': p_spatial_ref.name, 'wkid': p_spatial_ref.factoryCode, \
+                                      'wkt': p_spatial_ref.exportToString().split(";")[0], \
+                                      'xyTolerance': getattr(p_spatial_ref, "XYTolerance", None), \
+                                      'xyResolution': getattr(p_spatial_ref, "XYResolution", None)}
+    p_extent = getattr(p_desc, "extent", None)
+    if p_extent is not None:
+        p_info['extent'] = (p_extent.XMin, p_extent.YMin, p_extent.XMax, p_extent.YMax)
+    if p_info['dataType'] != "RasterBand":
+        p_info['fields'] = [{'name': field.name, 'aliasName': field.aliasName, 'type': field.type, \
+                             'length': field.length} for field in arcpy.ListFields(data)]
+    if p_info['dataType'] in ["FeatureClass", "Table", "ShapeFile"]:
+        p_info['count'] = int(arcpy.GetCount_management(data)[0])
+    return p_info
+
+def conduct_data_inventory(data_list):
+    for data in data_list:
+        if data not in data_inventory:
+            if result_cache is not None:
+                data_inventory[data] = describe_data_cached(data)
+            else:
+                data_inventory[data] = describe_data(data)
+    return data_inventory
+
+def get_data_info(data):
+    if data not in data_inventory:
+        data_inventory[data] = describe_data(data)
+    return data_inventory[data]
+
+def get_data_type(data):
+    if data in data_inventory:
+        return data_inventory[data]['dataType']
+    return get_catalog(data)['types'].get(data)
+
+def invalidate_data_info(data):
+    data_inventory.pop(data, None)
+    if result_cache is not None:
+        result_cache['layers'].pop(data, None)
+    return 1
+
+def get_layer_files(data):
+    gdb_path, p_parts = split_data_path(data)
+    if os.path.isfile(data):
+        return [data]
+    elif pyogrio is None or not p_parts or not os.path.isdir(gdb_path) or not gdb_path.lower().endswith(".gdb"):
+        return []
+    if gdb_path not in gdb_table_cache:
+        p_meta, p_fids, p_wkbs, p_field_data = pyogrio.raw.read(gdb_path, layer="GDB_SystemCatalog", \
+            columns=["Name"], read_geometry=False, return_fids=True, LIST_ALL_TABLES="YES")
+        gdb_table_cache[gdb_path] = dict([(p_name.lower(), int(p_fid)) for p_name, p_fid in zip(p_field_data[0], p_fids)])
+    p_table_id = gdb_table_cache[gdb_path].get(p_parts[-1].lower())
+    if p_table_id is None:
+        return []
+    p_prefix = "a%08x." % p_table_id
+    return [os.path.join(gdb_path, p) for p in os.listdir(gdb_path) if p.lower().startswith(p_prefix)]
+
+def get_layer_mtime(data):
+    p_files = get_layer_files(data)
+    gdb_path = split_data_path(data)[0]
+    if not p_files and os.path.isdir(gdb_path):
+        # without the system catalog the layer's own tables are unknown, so any write to the GDB counts
+        p_files = [p.path for p in os.scandir(gdb_path) if p.is_file() and not p.name.lower().endswith(".lock")]
+    elif not p_files and os.path.isfile(gdb_path):
+        p_files = [gdb_path]
+    return max([os.stat(p).st_mtime for p in p_files] or [None])
+
+def get_layer_size(data):
+    return sum([os.path.getsize(p) for p in get_layer_files(data)])
+
+def fingerprint_layer(data, p_info, geometry_hash = False):
+    if data_backend == "snapshot":
+        return get_snapshot_layer(data)['fingerprint']
+    p_fingerprint = {'count': p_info['count'], 'extent': p_info['extent'], 'mtime': get_layer_mtime(data), \
+                     'fields': [[p['name'], p['type'], p['length']] for p in p_info['fields']]}
+    if geometry_hash and p_info['dataType'] == "FeatureClass":
+        p_hash = hashlib.sha1()
+        for p_fids, p_wkbs in read_layer_geometries(data, 100000):
+            for p_wkb in p_wkbs:
+                p_hash.update(p_wkb or b"")
+        p_fingerprint['geometry'] = p_hash.hexdigest()
+    return json.dumps(p_fingerprint, sort_keys=True)
+
+def open_result_cache(cache_path, geometry_hash = False):
+    p_cache = {'path': cache_path, 'geometry_hash': geometry_hash, 'layers': dict(), \
+               'info_hits': set(), 'task_hits': set(), 'uncached': set()}
+    if os.path.isfile(cache_path):
+        with codecs.open(cache_path, encoding="utf-8") as cache_file:
+            p_cache['layers'] = json.load(cache_file)
+    return p_cache
+
+def close_result_cache(cache):
+    with codecs.open(cache['path'], 'w', encoding="utf-8") as cache_file:
+        json.dump(cache['layers'], cache_file, ensure_ascii=False)
+    return 1
+
+def describe_data_cached(data):
+    p_entry = result_cache['layers'].get(data)
+    p_mtime = get_layer_mtime(data)
+    if p_entry is not None and p_mtime is not None and not result_cache['geometry_hash'] and \
+       json.loads(p_entry['fingerprint'])['mtime'] == p_mtime:
+        p_info = p_entry['info']
+        p_info['extent'] = tuple(p_info['extent']) if p_info['extent'] is not None else None
+        result_cache['info_hits'].add(data)
+        return p_info
+    p_info = describe_data(data)
+    p_fingerprint = fingerprint_layer(data, p_info, result_cache['geometry_hash'])
+    if p_entry is not None and p_entry['fingerprint'] == p_fingerprint:
+        result_cache['info_hits'].add(data)
+        p_entry['info'] = p_info
+    else:
+        result_cache['layers'][data] = {'fingerprint': p_fingerprint, 'info': p_info, 'results': dict()}
+    return p_info
+
+def get_cache_task_key(task_func, args):
+    p_key_args = []
+    for p_arg in args[1:]:
+        if isinstance(p_arg, str) and p_arg in result_cache['layers']:
+            p_key_args.append(result_cache['layers'][p_arg]['fingerprint'])
+        else:
+            p_key_args.append(p_arg)
+    return task_func.__name__ + json.dumps(p_key_args, ensure_ascii=False)
+
+def get_cacheable_entry(data):
+    p_entry = result_cache['layers'].get(data)
+    if p_entry is not None and json.loads(p_entry['fingerprint'])['mtime'] is None:
+        result_cache['uncached'].add(data)
+        return None
+    return p_entry
+
+def run_cached_layer_tasks(task_func, task_args, worker_count = 1):
+    if result_cache is None:
+        return run_layer_tasks(task_func, task_args, worker_count)
+    p_results = [None] * len(task_args)
+    p_keys = [get_cache_task_key(task_func, args) for args in task_args]
+    p_miss_index = []
+    for p_index, args in enumerate(task_args):
+        p_entry = get_cacheable_entry(args[0])
+        if p_entry is not None and p_keys[p_index] in p_entry['results']:
+            p_results[p_index] = p_entry['results'][p_keys[p_index]]
+            result_cache['task_hits'].add(args[0])
+        else:
+            p_miss_index.append(p_index)
+    p_miss_results = run_layer_tasks(task_func, [task_args[p] for p in p_miss_index], worker_count)
+    for p_index, p_result in zip(p_miss_index, p_miss_results):
+        p_results[p_index] = p_result
+        p_entry = get_cacheable_entry(task_args[p_index][0])
+        if p_entry is not None:
+            p_entry['results'][p_keys[p_index]] = p_result
+    return p_results
+
+def report_cache_hits(check, data_list):
+    if result_cache is None:
+        return 0
+    if check in inventory_checks:
+        p_hit_list = [data for data in data_list if data in result_cache['info_hits']]
+        p_message = "{count} 个图层未变化，{check}使用缓存的图层描述信息重新检测：{names}。"
+    else:
+        p_hit_list = [data for data in data_list if data in result_cache['task_hits']]
+        p_message = "其中 {count} 个图层未变化，{check}结果来自缓存：{names}。"
+    result_cache['task_hits'] = set()
+    if p_hit_list:
+        p_names = ", ".join([data.split("\\")[-1] for data in p_hit_list])
+        output_info(p_message.format(count=len(p_hit_list), check=check, names=p_names), problem="缓存")
+    p_uncached_list = [data for data in data_list if data in result_cache['uncached']]
+    result_cache['uncached'] = set()
+    if p_uncached_list:
+        p_names = ", ".join([data.split("\\")[-1] for data in p_uncached_list])
+        output_info(f"{len(p_uncached_list)} 个图层无法获取修改时间，{check}结果未使用缓存：{p_names}。", \
+                    problem="缓存", severity="warning")
+    return len(p_hit_list)
+
+def conduct_featureclass_list(gdb_path):
+    return list_catalog_data(get_catalog(gdb_path), ["FeatureClass"])
+
+def conduct_table_list(gdb_path):
+    return list_catalog_data(get_catalog(gdb_path), ["Table"])
+
+def parse_crs_wkt(wkt):
+    p_datum = re.search(r'DATUM\["([^"]*)"', wkt or "")
+    p_projection = re.search(r'PROJECTION\["([^"]*)"', wkt or "")
+    p_parameters = [[p_name.lower(), round(float(p_value), 9)] for p_name, p_value in \
+                    re.findall(r'PARAMETER\["([^"]*)",\s*([-+.\deE]+)\]', wkt or "")]
+    return [p_datum.group(1) if p_datum else "", p_projection.group(1) if p_projection else "", sorted(p_parameters)]
+
+def get_crs_signature(spatial_ref):
+    p_datum, p_projection, p_parameters = parse_crs_wkt(spatial_ref.get('wkt'))
+    p_tolerance, p_resolution = spatial_ref.get('xyTolerance'), spatial_ref.get('xyResolution')
+    return (spatial_ref['wkid'], p_datum, p_projection, tuple([tuple(p) for p in p_parameters]), \
+            round(p_tolerance, 9) if p_tolerance else None, round(p_resolution, 12) if p_resolution else None)
+
+def is_same_crs(spatial_ref, base_ref):
+    if spatial_ref is None or base_ref is None:
+        return True
+    return get_crs_signature(spatial_ref)[:4] == get_crs_signature(base_ref)[:4]
+
+def analyze_spatial_references(data_list):
+    p_groups = dict()
+    for data in data_list:
+        p_info = get_data_info(data)
+        spatial_ref = p_info['spatialReference']
+        if spatial_ref is None:
+            continue
+        p_key = spatial_ref['wkid'] or spatial_ref['name']
+        p_group = p_groups.setdefault(p_key, {'ref': spatial_ref, 'layers': [], 'count': 0, 'signatures': dict()})
+        p_group['layers'].append(data)
+        p_group['count'] += p_info['count'] or 0
+        p_group['signatures'].setdefault(get_crs_signature(spatial_ref), []).append(data)
+    p_known = [p_key for p_key in p_groups if p_key != "Unknown"]
+    p_dominant = max(p_known, key=lambda p: (len(p_groups[p]['layers']), p_groups[p]['count'])) if p_known else None
+    p_name_dict = dict()
+    for p_key, p_group in p_groups.items():
+        for p_signature, p_layers in p_group['signatures'].items():
+            p_name_dict.setdefault(p_group['ref']['name'], dict())[p_signature] = p_layers
+    p_conflicts = dict([(p_name, p_signatures) for p_name, p_signatures in p_name_dict.items() if len(p_signatures) > 1])
+    return {'groups': p_groups, 'dominant': p_dominant, 'conflicts': p_conflicts}
+
+def format_crs_name(spatial_ref):
+    return f"{spatial_ref['name']}（WKID {spatial_ref['wkid']}）" if spatial_ref['wkid'] else spatial_ref['name']
+
+def format_layer_names(data_list, sample_size = 0):
+    p_names = [data.split("\\")[-1] for data in data_list]
+    if sample_size and len(p_names) > sample_size:
+        return ", ".join(p_names[:sample_size]) + f" 等 {len(p_names)} 个图层"
+    return ", ".join(p_names)
+
+def check_reference(data_list, sample_size = 0):
+    p_analysis = analyze_spatial_references(data_list)
+    p_groups = p_analysis['groups']
+    if not p_groups:
+        output_info(f"数据库为空或无可用坐标系统！")
+        return -1
+    signal = 1
+    if len(p_groups) == 1:
+        output_info(f"数据库中坐标系统已统一为：{format_crs_name(list(p_groups.values())[0]['ref'])}")
+    else:
+        signal = 0
+        p_dominant = p_groups.get(p_analysis['dominant'])
+        if p_dominant is not None:
+            output_info(f"数据库中使用了 {len(p_groups)} 个坐标系统，主要坐标系统为 {format_crs_name(p_dominant['ref'])}，" \
+                        f"共 {len(p_dominant['layers'])} 个图层；其余图层如下：")
+        else:
+            output_info(f"数据库中使用了 {len(p_groups)} 个坐标系统，且均未定义：")
+        for p_key, p_group in p_groups.items():
+            if p_key == p_analysis['dominant']:
+                continue
+            output_info(f"{format_crs_name(p_group['ref'])}：{format_layer_names(p_group['layers'], sample_size)}")
+            for data in p_group['layers']:
+                p_layer_name = data.split("\\")[-1]
+                output_info(f"{p_layer_name}, {p_group['ref']['name']}", layer=data, \
+                            problem=p_group['ref']['name'], severity="warning", echo=False)
+    for p_name, p_signatures in p_analysis['conflicts'].items():
+        signal = 0
+        output_info(f"坐标系统 {p_name} 存在 {len(p_signatures)} 种不同参数：")
+        for (p_wkid, p_datum, p_projection, p_parameters, p_tolerance, p_resolution), p_layers \
+                in p_signatures.items():
+            p_parameter_text = ", ".join([f"{p_key}={p_value:.10g}" for p_key, p_value in p_parameters])
+            output_info(f"WKID {p_wkid}，基准面 {p_datum}，投影 {p_projection or '无'}，参数 {p_parameter_text or '无'}，" \
+                        f"XY 容差 {p_tolerance}，XY 分辨率 {p_resolution}：{format_layer_names(p_layers, sample_size)}")
+            for data in p_layers:
+                p_layer_name = data.split("\\")[-1]
+                output_info(f"{p_layer_name} 坐标系统 {p_name} 参数不一致", layer=data, \
+                            problem="同名不同参数", severity="error", echo=False)
+    return signal
+
+def unify_spatial_reference(dir_path, gdb, data_list, worker_count = 1):
+    require_arcpy("坐标系统统一")
+    p_analysis = analyze_spatial_references(data_list)
+    if p_analysis['dominant'] is None:
+        output_info("数据库中无已定义的坐标系统，无法统一！")
+        return -1
+    p_target_ref = p_analysis['groups'][p_analysis['dominant']]['ref']
+    p_layers = []
+    for p_key, p_group in p_analysis['groups'].items():
+        if p_key == p_analysis['dominant']:
+            continue
+        for data in p_group['layers']:
+            if p_key == "Unknown":
+                output_info(f"{data} 未定义坐标系统，无法转换！", layer=data, problem="Unknown", severity="warning")
+            elif get_data_info(data)['dataType'] != "FeatureClass":
+                output_info(f"{data} 不是要素类，未进行转换！", layer=data, problem="未转换", severity="warning")
+            else:
+                p_layers.append([data, data.split("\\")[-1], ""])
+    if not p_layers:
+        output_info(f"无需转换的图层，坐标系统已统一为：{format_crs_name(p_target_ref)}")
+        return 1
+    output_info(f"将 {len(p_layers)} 个图层转换为 {format_crs_name(p_target_ref)}：")
+    p_target_gdb, manifest_path, p_manifest = open_export_target(dir_path, gdb, "_crs")
+    return export_layers(p_target_gdb, manifest_path, p_manifest, p_layers, "{data} 已转换至 {target}。", \
+                         worker_count, [p_target_ref['wkid'], p_target_ref.get('wkt', "")])
+
+def get_instrument_modules(catalog_only = False):
+    p_modules = dict()
+    if pyogrio is not None:
+        p_modules.update({"pyogrio": pyogrio, "pyogrio.raw": pyogrio.raw})
+    if data_backend == "arcpy" and not catalog_only:
+        p_modules.update({"arcpy": arcpy, "arcpy.da": getattr(arcpy, "da", None)})
+    return dict([(p_key, p_module) for p_key, p_module in p_modules.items() if p_module is not None])
+
+def make_call_timer(call_name, p_func):
+    def timed_call(*args, **kwargs):
+        p_start = time.perf_counter()
+        try:
+            return p_func(*args, **kwargs)
+        finally:
+            record_call(call_name, args, time.perf_counter() - p_start)
+    timed_call.instrumented = p_func
+    return timed_call
+
+def record_call(call_name, args, p_seconds):
+    if instrument_stats is None:
+        return 0
+    p_layer = instrument_stats['layer']
+    if p_layer == "" and args and isinstance(args[0], str):
+        p_layer = args[0]
+    p_key = (instrument_stats['check'], p_layer, call_name)
+    p_value = instrument_stats['calls'].setdefault(p_key, [0, 0.0])
+    p_value[0] += 1
+    p_value[1] += p_seconds
+    return 1
+
+def open_instrument(output_prefix = "", profile_mode = ""):
+    global instrument_stats
+    if profile_mode == "pyinstrument" and pyinstrument is None:
+        sys.exit("未安装 pyinstrument，无法输出性能剖析！")
+    instrument_stats = {'check': "", 'layer': "", 'calls': dict(), 'layers': dict(), 'checks': dict(), \
+                        'originals': [], 'prefix': output_prefix, 'profile': profile_mode, 'start': time.perf_counter()}
+    return instrument_stats
+
+def install_call_timers(catalog_only = False):
+    for p_key, p_module in get_instrument_modules(catalog_only).items():
+        for call_name in instrument_call_names[p_key]:
+            p_func = getattr(p_module, call_name, None)
+            if p_func is None or hasattr(p_func, "instrumented"):
+                continue
+            instrument_stats['originals'].append([p_module, call_name, p_func])
+            setattr(p_module, call_name, make_call_timer(p_key + "." + call_name, p_func))
+    return len(instrument_stats['originals'])
+
+def close_instrument(stats):
+    global instrument_stats
+    for p_module, call_name, p_func in stats['originals']:
+        setattr(p_module, call_name, p_func)
+    instrument_stats = None
+    if stats['prefix']:
+        write_timing_report(stats['prefix'] + "_timing.json", stats)
+    return 1
+
+def run_timed_task(task_func, args):
+    instrument_stats['layer'] = args[0]
+    p_start = time.perf_counter()
+    try:
+        return task_func(*args)
+    finally:
+        p_key = (instrument_stats['check'], args[0])
+        instrument_stats['layers'][p_key] = instrument_stats['layers'].get(p_key, 0.0) + \
+                                            time.perf_counter() - p_start
+        instrument_stats['layer'] = ""
+
+def merge_task_stats(task_check, p_layer, p_calls, p_seconds):
+    p_key = (task_check, p_layer)
+    instrument_stats['layers'][p_key] = instrument_stats['layers'].get(p_key, 0.0) + p_seconds
+    for p_call_key, (p_count, p_call_seconds) in p_calls.items():
+        p_value = instrument_stats['calls'].setdefault(p_call_key, [0, 0.0])
+        p_value[0] += p_count
+        p_value[1] += p_call_seconds
+    return 1
+
+def start_check_profile():
+    if instrument_stats['profile'] == "cprofile":
+        p_profiler = cProfile.Profile()
+        p_profiler.enable()
+    elif instrument_stats['profile'] == "pyinstrument":
+        p_profiler = pyinstrument.Profiler()
+        p_profiler.start()
+    else:
+        p_profiler = None
+    return p_profiler
+
+def stop_check_profile(p_profiler, func_name):
+    if p_profiler is None:
+        return ""
+    p_path = instrument_stats['prefix'] + "_profile_" + func_name
+    if instrument_stats['profile'] == "cprofile":
+        p_profiler.disable()
+        p_path += ".prof"
+        p_profiler.dump_stats(p_path)
+    else:
+        p_profiler.stop()
+        p_path += ".html"
+        with codecs.open(p_path, 'w', encoding="utf-8") as profile_file:
+            profile_file.write(p_profiler.output_html())
+    return p_path
+
+def run_instrumented_check(func_name, context):
+    if instrument_stats is None:
+        return check_registry[func_name]['run'](context)
+    instrument_stats['check'] = func_name
+    install_call_timers("inventory" not in check_registry[func_name]['inputs'])
+    p_profiler = start_check_profile()
+    p_start = time.perf_counter()
+    try:
+        return check_registry[func_name]['run'](context)
+    finally:
+        instrument_stats['checks'][func_name] = instrument_stats['checks'].get(func_name, 0.0) + \
+                                                time.perf_counter() - p_start
+        stop_check_profile(p_profiler, func_name)
+        instrument_stats['check'] = ""
+
+def summarize_layer_timing(stats):
+    p_call_dict = dict()
+    for (p_check, p_layer, call_name), (p_count, p_seconds) in stats['calls'].items():
+        p_value = p_call_dict.setdefault((p_check, p_layer), [0, 0.0])
+        p_value[0] += p_count
+        p_value[1] += p_seconds
+    p_layers = []
+    for (p_check, p_layer), p_seconds in stats['layers'].items():
+        p_count, p_call_seconds = p_call_dict.get((p_check, p_layer), [0, 0.0])
+        p_layers.append([p_check, p_layer, p_seconds, p_count, p_call_seconds])
+    return sorted(p_layers, key=lambda p: p[2], reverse=True)
+
+def write_timing_report(report_path, stats):
+    p_report = {'backend': data_backend, 'total': round(time.perf_counter() - stats['start'], 3), \
+        'checks': [{'check': p_check, 'seconds': round(p_seconds, 3)} for p_check, p_seconds in stats['checks'].items()], \
+        'layers': [{'check': p[0], 'layer': p[1], 'seconds': round(p[2], 3), 'calls': p[3], \
+                    'call_seconds': round(p[4], 3)} for p in summarize_layer_timing(stats)], \
+        'calls': [{'check': p_key[0], 'layer': p_key[1], 'call': p_key[2], 'count': p_value[0], \
+                   'seconds': round(p_value[1], 4)} for p_key, p_value in \
+                  sorted(stats['calls'].items(), key=lambda p: p[1][1], reverse=True)]}
+    with codecs.open(report_path, 'w', encoding="utf-8") as report_file:
+        json.dump(p_report, report_file, ensure_ascii=False, indent=1)
+    return report_path
+
+def report_timing(top_count = 10):
+    if instrument_stats is None or not instrument_stats['checks']:
+        return 0
+    p_checks = ", ".join([f"{p_check} {p_seconds:.1f} 秒" for p_check, p_seconds in instrument_stats['checks'].items()])
+    output_info(f"\n各检测/处理耗时：{p_checks}。", problem="耗时")
+    p_layers = summarize_layer_timing(instrument_stats)[:top_count]
+    if p_layers:
+        output_info(f"耗时最长的 {len(p_layers)} 个图层：", problem="耗时")
+    for p_check, p_layer, p_seconds, p_count, p_call_seconds in p_layers:
+        p_name = p_layer.split("\\")[-1]
+        output_info(f"{p_check}  {p_name}  {p_seconds:.2f} 秒，" \
+                    f"数据调用 {p_count} 次（{p_call_seconds:.2f} 秒）", layer=p_layer, problem="耗时")
+    if instrument_stats['prefix']:
+        output_info(f"耗时明细：{instrument_stats['prefix']}_timing.json", problem="耗时")
+    return len(p_layers)
+
+def request_cancel(signum = None, frame = None):
+    if cancel_state['requested'] and signum == signal.SIGINT:
+        raise KeyboardInterrupt
+    cancel_state['requested'] = True
+    if cancel_state['path'] and not os.path.exists(cancel_state['path']):
+        open(cancel_state['path'], 'w').close()
+    return 1
+
+def is_cancel_requested():
+    if not cancel_state['requested'] and cancel_state['path'] and time.time() - cancel_state['last_check'] >= 1.0:
+        cancel_state['last_check'] = time.time()
+        cancel_state['requested'] = os.path.exists(cancel_state['path'])
+    return cancel_state['requested']
+
+def check_cancel():
+    if is_cancel_requested():
+        sys.exit(cancel_message)
+    return 0
+
+@contextlib.contextmanager
+def cancellable(cancel_path):
+    p_handlers = dict()
+    if os.path.exists(cancel_path):
+        os.remove(cancel_path)
+    cancel_state.update({'requested': False, 'path': cancel_path, 'last_check': 0.0})
+    for p_signal in [signal.SIGINT, signal.SIGTERM]:
+        p_handlers[p_signal] = signal.signal(p_signal, request_cancel)
+    try:
+        yield cancel_state
+    finally:
+        for p_signal, p_handler in p_handlers.items():
+            signal.signal(p_signal, p_handler)
+        if os.path.exists(cancel_path):
+            os.remove(cancel_path)
+        cancel_state.update({'requested': False, 'path': "", 'last_check': 0.0})
+
+def open_progress(gdb_path, interval = 5.0, event_path = ""):
+    global progress_state
+    progress_state = {'gdb': gdb_path, 'interval': interval, 'stage': None, 'last_render': 0.0, 'last_event': 0.0, \
+                      'event_path': event_path, \
+                      'event_file': codecs.open(event_path, 'a', encoding="utf-8") if event_path else None}
+    return progress_state
+
+def close_progress(state):
+    global progress_state
+    if state['event_file'] is not None:
+        state['event_file'].close()
+    progress_state = None
+    return 1
+
+def get_task_weights(task_args):
+    p_task_counts = dict()
+    for args in task_args:
+        p_task_counts[args[0]] = p_task_counts.get(args[0], 0) + 1
+    p_weights = []
+    for args in task_args:
+        p_info = data_inventory.get(args[0]) if isinstance(args[0], str) else None
+        p_count = (p_info or {}).get('count') or 1
+        p_weights.append(max(p_count // p_task_counts[args[0]], 1))
+    return p_weights
+
+def start_progress_stage(label, total, features_total):
+    if progress_state is None:
+        return None
+    progress_state['stage'] = {'label': label, 'total': total, 'done': 0, 'features_total': features_total, \
+                               'features_done': 0, 'partial': 0, 'start': time.time(), 'parent': progress_state['stage']}
+    progress_state['last_render'] = time.time()
+    emit_progress_event("start")
+    return progress_state['stage']
+
+def get_progress_rate(p_stage):
+    p_elapsed = max(time.time() - p_stage['start'], 0.001)
+    p_features = min(p_stage['features_done'] + p_stage['partial'], p_stage['features_total'])
+    p_rate = p_features / p_elapsed
+    p_eta = (p_stage['features_total'] - p_features) / p_rate if p_rate > 0 else None
+    return p_features, p_rate, p_eta
+
+def emit_progress_event(p_event, layer = ""):
+    p_stage = progress_state['stage']
+    if progress_state['event_file'] is None:
+        return 0
+    p_features, p_rate, p_eta = get_progress_rate(p_stage)
+    p_record = {'time': round(time.time(), 3), 'event': p_event, 'gdb': progress_state['gdb'], \
+                'check': p_stage['label'], 'layer': layer, 'done': p_stage['done'], 'total': p_stage['total'], \
+                'features_done': p_features, 'features_total': p_stage['features_total'], \
+                'rate': round(p_rate, 1), 'eta': None if p_eta is None else round(p_eta, 1)}
+    progress_state['event_file'].write(json.dumps(p_record, ensure_ascii=False) + "\n")
+    progress_state['event_file'].flush()
+    progress_state['last_event'] = time.time()
+    return 1
+
+def render_progress(force = False):
+    p_stage = progress_state['stage']
+    if progress_state['interval'] <= 0 or p_stage['total'] <= 1:
+        return 0
+    elif not force and time.time() - progress_state['last_render'] < progress_state['interval']:
+        return 0
+    progress_state['last_render'] = time.time()
+    p_features, p_rate, p_eta = get_progress_rate(p_stage)
+    p_eta_text = time.strftime("%H:%M:%S", time.gmtime(p_eta)) if p_eta is not None else "--:--:--"
+    print(f"[{p_stage['label']}] {p_stage['done']}/{p_stage['total']} 项，{p_features}/{p_stage['features_total']} 要素，" \
+          f"{p_rate:.0f} 要素/秒，预计剩余 {p_eta_text}")
+    return 1
+
+def advance_progress(layer, features):
+    if progress_state is None or progress_state['stage'] is None:
+        return 0
+    p_stage = progress_state['stage']
+    p_stage['done'] += 1
+    p_stage['features_done'] += features
+    p_stage['partial'] = 0
+    emit_progress_event("layer", layer)
+    render_progress()
+    return 1
+
+def report_feature_progress(features):
+    check_cancel()
+    if progress_state is None or progress_state['stage'] is None:
+        return 0
+    progress_state['stage']['partial'] += features
+    if time.time() - progress_state['last_event'] >= 1.0:
+        emit_progress_event("features")
+    render_progress()
+    return 1
+
+def finish_progress_stage(p_stage):
+    if p_stage is None or progress_state is None:
+        return 0
+    emit_progress_event("finish")
+    if time.time() - p_stage['start'] >= progress_state['interval']:
+        render_progress(True)
+    progress_state['stage'] = p_stage['parent']
+    return 1
+
+def get_scratch_name(name, suffix = ""):
+    return "memory\\w" + str(os.getpid()) + "_" + name + suffix
+
+@contextlib.contextmanager
+def scratch_output(output_name):
+    try:
+        yield output_name
+    finally:
+        if arcpy.Exists(output_name):
+            delete_temp(output_name)
+
+def run_layer_task(task_func, backend, args, task_check = None, cancel_path = "", inventory = None):
+    global progress_state
+    if backend != data_backend:
+        set_data_backend(backend)
+    progress_state = None
+    cancel_state['path'] = cancel_path
+    if inventory:
+        data_inventory.update(inventory)
+    if task_check is None:
+        return task_func(*args)
+    if instrument_stats is None:
+        open_instrument()
+        install_call_timers()
+    instrument_stats['check'] = task_check
+    instrument_stats['calls'] = dict()
+    instrument_stats['layers'] = dict()
+    p_result = run_timed_task(task_func, args)
+    return [p_result, instrument_stats['calls'], instrument_stats['layers'].get((task_check, args[0]), 0.0)]
+
+def get_task_inventory(args):
+    # spawned workers start with an empty inventory, so the layers a task names travel with it
+    return dict([(p, data_inventory[p]) for p in args if isinstance(p, str) and p in data_inventory])
+
+def run_pool_tasks(task_func, task_args, worker_count, task_check, p_weights):
+    p_results = [None] * len(task_args)
+    with ProcessPoolExecutor(max_workers=min(worker_count, len(task_args))) as executor:
+        p_futures = dict([(executor.submit(run_layer_task, task_func, data_backend, args, task_check, \
+                                           cancel_state['path'], get_task_inventory(args)), p_index) \
+                          for p_index, args in enumerate(task_args)])
+        try:
+            for p_future in as_completed(p_futures):
+                p_index = p_futures[p_future]
+                p_results[p_index] = p_future.result()
+                advance_progress(task_args[p_index][0], p_weights[p_index])
+                check_cancel()
+        except BaseException:
+            for p_future in p_futures:
+                p_future.cancel()
+            raise
+    return p_results
+
+def run_layer_tasks(task_func, task_args, worker_count = 1):
+    task_check = None if instrument_stats is None else instrument_stats['check']
+    p_weights = get_task_weights(task_args)
+    p_label = result_sink['check'] if result_sink is not None and result_sink['check'] else task_func.__name__
+    p_stage = start_progress_stage(p_label, len(task_args), sum(p_weights))
+    try:
+        if worker_count > 1 and len(task_args) > 1:
+            p_results = run_pool_tasks(task_func, task_args, worker_count, task_check, p_weights)
+            if task_check is None:
+                return p_results
+            for args, (p_result, p_calls, p_seconds) in zip(task_args, p_results):
+                merge_task_stats(task_check, args[0], p_calls, p_seconds)
+            return [p[0] for p in p_results]
+        p_results = []
+        for args, p_weight in zip(task_args, p_weights):
+            check_cancel()
+            p_results.append(task_func(*args) if task_check is None else run_timed_task(task_func, args))
+            advance_progress(args[0], p_weight)
+        return p_results
+    finally:
+        finish_progress_stage(p_stage)
+
+def collect_geometry_errors(row_batches, p_name, sample_size = 0, spill_dir = ""):
+    p_rows, p_problem_dict = [], dict()
+    p_spill_path, p_spill_file = "", None
+    for p_batch in row_batches:
+        p_spill_rows = []
+        for row in p_batch:
+            p_problem_count = p_problem_dict.get(row[2], 0)
+            p_problem_dict[row[2]] = p_problem_count + 1
+            if sample_size <= 0 or p_problem_count < sample_size:
+                p_rows.append((row[0], row[1], row[2]))
+            elif spill_dir:
+                p_spill_rows.append((row[0], row[1], row[2]))
+        if p_spill_rows:
+            if p_spill_file is None:
+                p_spill_path = os.path.join(spill_dir, p_name + "_geometry.csv")
+                p_spill_file = codecs.open(p_spill_path, 'w', encoding="utf-8-sig")
+                csv.writer(p_spill_file).writerow(['CLASS', 'FEATURE_ID', 'PROBLEM'])
+            csv.writer(p_spill_file).writerows(p_spill_rows)
+    if p_spill_file is not None:
+        p_spill_file.close()
+    return [sum(p_problem_dict.values()), p_rows, p_problem_dict, p_spill_path]
+
+def check_geometry_layer(featureclass, suffix = "", sample_size = 0, spill_dir = "", batch_size = 10000):
+    fields = ['CLASS', 'FEATURE_ID', 'PROBLEM']
+    p_name = featureclass.split("\\")[-1] + suffix
+    if data_backend != "arcpy":
+        return collect_geometry_errors(open_check_geometry_batches(featureclass, batch_size), \
+                                       p_name, sample_size, spill_dir)
+    if sample_size > 0:
+        p_output_name = arcpy.env.scratchGDB + "\\w" + str(os.getpid()) + "_" + p_name
+    else:
+        p_output_name = get_scratch_name(p_name)
+    with scratch_output(p_output_name):
+        arcpy.CheckGeometry_management(featureclass, p_output_name)
+        with arcpy.da.SearchCursor(p_output_name, fields) as cursor:
+            return collect_geometry_errors(iter(lambda: list(islice(cursor, batch_size)), []), \
+                                           p_name, sample_size, spill_dir)
+
+def report_geometry_layer(featureclass, p_count, p_rows, p_problem_dict = None, p_spill_path = ""):
+    if p_count > 0:
+        output_info(f"{featureclass} 存在几何错误。错误信息如下：", layer=featureclass, severity="error")
+        for row in p_rows:
+            output_info('{0}, {1}, {2}'.format(row[0], row[1], row[2]), layer=featureclass, \
+                        feature_id=row[1], problem=row[2], severity="error")
+        if p_problem_dict and len(p_rows) < p_count:
+            for p_problem, p_problem_count in sorted(p_problem_dict.items()):
+                output_info(f"{featureclass} 共有 {p_problem_count} 个 {p_problem} 错误。", layer=featureclass, \
+                            problem=p_problem, severity="error")
+            if p_spill_path:
+                output_info(f"未列出的错误信息已写入 {p_spill_path}。", layer=featureclass)
+    else:
+        print(f"{featureclass} 不存在几何错误。")
+    return p_count
+
+def check_geometry(featureclass_list, worker_count = 1, sample_size = 0, spill_dir = ""):
+    total_count = 0
+    p_results = run_cached_layer_tasks(check_geometry_layer, \
+                                       [[fc, "", sample_size, spill_dir] for fc in featureclass_list], worker_count)
+    for featureclass, p_result in zip(featureclass_list, p_results):
+        total_count += report_geometry_layer(featureclass, *p_result)
+    if total_count > 0:
+        output_info(f"数据库中共存在有 {total_count} 个几何错误，请注意修正。")
+        return 0
+    else:
+        output_info("数据库中不存在几何错误。")
+        return 1
+
+def compute_extent_flags(extent_array, base_extent, tolerance = 1.0):
+    p_extents = np.asarray(extent_array, dtype=float).reshape(-1, 4)
+    p_base = np.asarray(base_extent, dtype=float)
+    center_point = (p_base[:2] + p_base[2:]) / 2
+    xy_range = p_base[2:] - p_base[:2]
+    extended_extent = np.concatenate([center_point - xy_range * tolerance, center_point + xy_range * tolerance])
+
+    with np.errstate(invalid="ignore"):
+        empty_flags = np.isnan(p_extents).any(axis=1) | (p_extents[:, 2] < p_extents[:, 0]) | \
+                      (p_extents[:, 3] < p_extents[:, 1])
+        outside_flags = ~empty_flags & ((p_extents[:, :2] < extended_extent[:2]).any(axis=1) | \
+                                        (p_extents[:, 2:] > extended_extent[2:]).any(axis=1))
+
+        p_lower = np.maximum(p_extents[:, :2], p_base[:2])
+        p_upper = np.minimum(p_extents[:, 2:], p_base[2:])
+        p_overlap_size = np.clip(p_upper - p_lower, 0, None)
+        p_size = p_extents[:, 2:] - p_extents[:, :2]
+        # degenerate extents (single points, horizontal/vertical lines) fall back to containment in each axis
+        p_inside = (p_lower <= p_upper)
+        p_axis_ratio = np.where(p_size > 0, p_overlap_size / np.where(p_size > 0, p_size, 1), p_inside)
+        overlap_ratios = np.where(empty_flags, 0.0, p_axis_ratio.prod(axis=1))
+    return empty_flags, outside_flags, overlap_ratios
+
+def check_extent(base_data, data_list, tolerance = 1.0, min_overlap = 0.0):
+    signal = 1
+    data_list = [data for data in data_list if data != base_data]
+    p_base_extent = get_data_info(base_data)['extent']
+    if p_base_extent is None or np.isnan(p_base_extent).any():
+        sys.exit("基准范围验证数据为空或存在范围错误！")
+
+    p_data_list = [data for data in data_list if get_data_info(data)['dataType'] != "RasterBand"]
+    p_extent_array = [get_data_info(data)['extent'] or (np.nan,) * 4 for data in p_data_list]
+    empty_flags, outside_flags, overlap_ratios = compute_extent_flags(p_extent_array, p_base_extent, tolerance)
+
+    for data, p_empty, p_outside, p_ratio in zip(p_data_list, empty_flags, outside_flags, overlap_ratios):
+        p_name = get_data_info(data)['name']
+        if p_empty:
+            output_info(f"{p_name} 数据为空或存在范围错误！", layer=data, problem="范围错误", severity="error")
+            if signal > -1:
+                signal = -1
+        elif p_outside or p_ratio < min_overlap:
+            output_info(f"{p_name} 范围可能异常！与基准范围重叠比例为 {p_ratio:.2%}。", layer=data, \
+                        problem="范围异常", severity="warning")
+            if signal > 0:
+                signal = 0
+    if signal == 1:
+        output_info("数据范围正常。")
+    return signal
+
+def read_layer_geometries(data, batch_size = 0):
+    if data_backend == "open":
+        p_batches = open_read_geometries(data, batch_size)
+    elif data_backend == "snapshot":
+        p_batches = snapshot_read_geometries(data, batch_size)
+    else:
+        p_batches = read_cursor_geometries(data, batch_size)
+    for p_fids, p_wkbs in p_batches:
+        report_feature_progress(len(p_fids))
+        yield p_fids, p_wkbs
+
+def read_cursor_geometries(data, batch_size = 0):
+    with arcpy.da.SearchCursor(data, ["OID@", "SHAPE@WKB"]) as cursor:
+        for p_batch in iter(lambda: list(islice(cursor, batch_size or None)), []):
+            yield np.array([row[0] for row in p_batch], dtype=np.int64), \
+                  np.array([None if row[1] is None else bytes(row[1]) for row in p_batch], dtype=object)
+
+def read_shapely_geometries(data):
+    p_oid_list, p_geom_list = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=object)]
+    for p_fids, p_wkbs in read_layer_geometries(data, 100000):
+        p_oid_list.append(np.asarray(p_fids, dtype=np.int64))
+        p_geom_list.append(shapely.from_wkb(p_wkbs, on_invalid="ignore"))
+    return np.concatenate(p_oid_list), np.concatenate(p_geom_list)
+
+def read_region_geometry(base_data):
+    if base_data not in region_geometry_cache:
+        p_region = shapely.union_all(read_shapely_geometries(base_data)[1])
+        shapely.prepare(p_region)
+        region_geometry_cache[base_data] = p_region
+    return region_geometry_cache[base_data]
+
+def check_containment(featureclass, base_data, list_all = False, chunk_size = 1000):
+    p_region = read_region_geometry(base_data)
+    p_region_boundary = shapely.boundary(p_region)
+    p_oids, p_geoms = read_shapely_geometries(featureclass)
+    p_present = ~shapely.is_missing(p_geoms) & ~shapely.is_empty(p_geoms)
+    p_tree = shapely.STRtree(p_geoms)
+
+    p_bounds = shapely.bounds(p_geoms)
+    p_boxes = shapely.box(p_bounds[:, 0], p_bounds[:, 1], p_bounds[:, 2], p_bounds[:, 3])
+    p_accepted = ~p_present | shapely.contains(p_region, p_boxes)
+
+    p_straddle = np.zeros(len(p_geoms), dtype=bool)
+    p_straddle[p_tree.query(p_region_boundary, predicate="intersects")] = True
+    p_single = shapely.get_num_geometries(p_geoms) <= 1
+    # a single-part feature that misses the region boundary lies wholly inside or wholly outside
+    p_point_test = ~p_accepted & ~p_straddle & p_single
+    p_inside = np.zeros(len(p_geoms), dtype=bool)
+    if p_point_test.any():
+        p_inside[p_point_test] = shapely.intersects(p_region, shapely.point_on_surface(p_geoms[p_point_test]))
+
+    p_candidates = np.flatnonzero(~p_accepted & ~p_inside)
+    p_offenders = []
+    for p_start in range(0, len(p_candidates), chunk_size):
+        p_chunk = p_candidates[p_start:p_start + chunk_size]
+        p_outside = p_chunk[~shapely.covered_by(p_geoms[p_chunk], p_region)]
+        if len(p_outside):
+            p_outside_geoms = p_geoms[p_outside]
+            p_invalid = ~shapely.is_valid(p_outside_geoms)
+            if p_invalid.any():
+                p_outside_geoms[p_invalid] = shapely.make_valid(p_outside_geoms[p_invalid])
+            p_outside_geoms = shapely.difference(p_outside_geoms, p_region)
+            p_measures = np.where(shapely.area(p_outside_geoms) > 0, shapely.area(p_outside_geoms), \
+                                  shapely.length(p_outside_geoms))
+            p_offenders += [(int(p_oid), float(p_measure)) for p_oid, p_measure in zip(p_oids[p_outside], p_measures)]
+            if not list_all:
+                return [len(p_offenders), p_offenders[:1]]
+    return [len(p_offenders), p_offenders]
+
+def check_fc_boundary_layer(featureclass, base_data, list_all = False, same_crs = True):
+    # containment compares raw coordinates; Erase projects the layer onto the region on the fly
+    if shapely is not None and same_crs:
+        return check_containment(featureclass, base_data, list_all)
+    with scratch_output(get_scratch_name(featureclass.split("\\")[-1], "_erase")) as p_output_name:
+        arcpy.Erase_analysis(featureclass, base_data, p_output_name)
+        return [int(arcpy.GetCount_management(p_output_name)[0]), []]
+
+def check_fc_boundary(base_data, fc_list, worker_count = 1, list_all = False):
+    signal = 1
+    fc_list = [fc for fc in fc_list if fc != base_data]
+    p_base_ref = get_data_info(base_data)['spatialReference']
+    p_task_list, p_skip_list = [], []
+    for fc in fc_list:
+        if get_data_info(fc)['featureType'] == "Annotation":
+            continue
+        p_same_crs = is_same_crs(get_data_info(fc)['spatialReference'], p_base_ref)
+        if p_same_crs or data_backend == "arcpy":
+            p_task_list.append([fc, base_data, list_all, p_same_crs])
+        else:
+            p_skip_list.append(fc)
+    p_results = run_cached_layer_tasks(check_fc_boundary_layer, p_task_list, worker_count)
+    for featureclass, (p_count, p_offenders) in zip([p[0] for p in p_task_list], p_results):
+        if p_count > 0:
+            output_info(f"{featureclass} 超出规划范围，需要核对。", layer=featureclass, \
+                        problem="超出规划范围", severity="error")
+            for p_oid, p_measure in p_offenders:
+                output_info(f"{featureclass}, {p_oid}, 超出部分面积/长度 {p_measure:.2f}", layer=featureclass, \
+                            feature_id=p_oid, problem="超出规划范围", severity="error")
+            signal -= 1
+        else:
+            print(f"{featureclass} 未超出规划范围。")
+    for featureclass in p_skip_list:
+        output_info(f"{featureclass} 坐标系统与规划范围不一致，{data_backend} 数据后端无法投影，未检测。", \
+                    layer=featureclass, problem="坐标系统不一致", severity="warning")
+        signal = min(signal, 0)
+    if signal == 1:
+        output_info("全部数据均落入规划范围内。")
+    return signal
+
+def read_layer_index(featureclass):
+    if featureclass not in layer_index_cache:
+        layer_index_cache.clear()
+        p_oids, p_geoms = read_shapely_geometries(featureclass)
+        p_present = ~shapely.is_missing(p_geoms) & ~shapely.is_empty(p_geoms)
+        p_invalid = p_present & ~shapely.is_valid(p_geoms)
+        if p_invalid.any():
+            p_geoms[p_invalid] = shapely.make_valid(p_geoms[p_invalid])
+        p_bounds = shapely.bounds(p_geoms)
+        p_present_index = np.flatnonzero(p_present)
+        p_order = p_present_index[np.argsort(p_bounds[p_present_index, 0], kind="stable")]
+        layer_index_cache[featureclass] = [p_oids, p_geoms, p_bounds, p_order]
+    return layer_index_cache[featureclass]
+
+def sweep_line_pairs(p_bounds, p_order, p_start, p_end):
+    p_end = min(p_end, len(p_order))
+    if p_start >= p_end:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    p_xmin = p_bounds[p_order, 0]
+    p_rank = np.arange(p_start, p_end)
+    p_stop = np.searchsorted(p_xmin, p_bounds[p_order[p_start:p_end], 2], side="right")
+    p_counts = np.maximum(p_stop - p_rank - 1, 0)
+    p_first = np.repeat(p_rank, p_counts)
+    p_second = p_first + 1 + np.arange(p_counts.sum()) - np.repeat(np.cumsum(p_counts) - p_counts, p_counts)
+    p_a, p_b = p_order[p_first], p_order[p_second]
+    p_keep = (p_bounds[p_b, 1] <= p_bounds[p_a, 3]) & (p_bounds[p_a, 1] <= p_bounds[p_b, 3])
+    return p_a[p_keep], p_b[p_keep]
+
+def check_topology_chunk(featureclass, shape_type, p_start, p_end, tolerance = 0.0):
+    p_oids, p_geoms, p_bounds, p_order = read_layer_index(featureclass)
+    p_a, p_b = sweep_line_pairs(p_bounds, p_order, p_start, p_end)
+    p_rows = []
+    if len(p_a) == 0:
+        return p_rows
+    if shape_type == "Polygon":
+        p_hit = shapely.relate_pattern(p_geoms[p_a], p_geoms[p_b], "T********")
+        p_a, p_b = p_a[p_hit], p_b[p_hit]
+        p_measures = shapely.area(shapely.intersection(p_geoms[p_a], p_geoms[p_b]))
+        p_problems = np.full(len(p_a), "重叠", dtype=object)
+    else:
+        p_matrix = shapely.relate(p_geoms[p_a], p_geoms[p_b])
+        p_dimension = np.array([p[0] for p in p_matrix], dtype=object)
+        p_hit = p_dimension != "F"
+        p_a, p_b, p_dimension = p_a[p_hit], p_b[p_hit], p_dimension[p_hit]
+        p_measures = shapely.length(shapely.intersection(p_geoms[p_a], p_geoms[p_b]))
+        p_problems = np.where(p_dimension == "1", "线重叠", "交叉")
+    for p_i, p_j, p_problem, p_measure in zip(p_a, p_b, p_problems, p_measures):
+        if p_problem == "交叉" or p_measure > tolerance:
+            p_rows.append((int(min(p_oids[p_i], p_oids[p_j])), int(max(p_oids[p_i], p_oids[p_j])), \
+                           str(p_problem), float(p_measure)))
+    return p_rows
+
+def check_topology(featureclass_list, worker_count = 1, chunk_size = 50000, tolerance = 0.0, sample_size = 0):
+    require_shapely("拓扑检测")
+    signal = 1
+    p_fc_list = [fc for fc in featureclass_list if get_data_info(fc)['featureType'] != "Annotation" \
+                 and get_data_info(fc)['shapeType'] in ["Polygon", "Polyline"]]
+    p_task_list = []
+    for featureclass in p_fc_list:
+        p_info = get_data_info(featureclass)
+        for p_start in range(0, max(p_info['count'] or 0, 1), chunk_size):
+            p_task_list.append([featureclass, p_info['shapeType'], p_start, p_start + chunk_size, tolerance])
+    p_results = run_cached_layer_tasks(check_topology_chunk, p_task_list, worker_count)
+    layer_index_cache.clear()
+
+    p_layer_rows = dict([(fc, []) for fc in p_fc_list])
+    for p_task, p_rows in zip(p_task_list, p_results):
+        p_layer_rows[p_task[0]] += p_rows
+    for featureclass in p_fc_list:
+        p_rows = sorted(p_layer_rows[featureclass])
+        if p_rows:
+            output_info(f"{featureclass} 存在 {len(p_rows)} 处拓扑错误。错误信息如下：", layer=featureclass, \
+                        severity="error")
+            for p_oid_a, p_oid_b, p_problem, p_measure in p_rows[:sample_size or None]:
+                output_info(f"{p_oid_a}, {p_oid_b}, {p_problem}, {p_measure:.2f}", layer=featureclass, \
+                            feature_id=f"{p_oid_a}/{p_oid_b}", problem=p_problem, severity="error")
+            signal = 0
+        else:
+            print(f"{featureclass} 不存在拓扑错误。")
+    if signal == 1:
+        output_info("数据库中不存在要素重叠或相交错误。")
+    return signal
+
+def hash_geometries(geoms):
+    p_wkbs = shapely.to_wkb(shapely.normalize(geoms))
+    return np.frombuffer(b"".join([hashlib.blake2b(p, digest_size=8).digest() for p in p_wkbs]), dtype=np.uint64)
+
+def read_duplicate_keys(featureclass, batch_size = 100000):
+    p_oid_list, p_hash_list, p_center_list = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.uint64)], \
+                                             [np.empty((0, 2))]
+    for p_fids, p_wkbs in read_layer_geometries(featureclass, batch_size):
+        p_geoms = shapely.from_wkb(p_wkbs, on_invalid="ignore")
+        p_present = ~shapely.is_missing(p_geoms) & ~shapely.is_empty(p_geoms)
+        p_geoms = p_geoms[p_present]
+        p_bounds = shapely.bounds(p_geoms)
+        p_oid_list.append(np.asarray(p_fids, dtype=np.int64)[p_present])
+        p_hash_list.append(hash_geometries(p_geoms))
+        p_center_list.append((p_bounds[:, :2] + p_bounds[:, 2:]) / 2)
+    return [np.concatenate(p_oid_list), np.concatenate(p_hash_list), np.concatenate(p_center_list)]
+
+def read_selected_geometries(featureclass, oids, batch_size = 100000):
+    p_oids = np.unique(oids)
+    p_wkbs = np.empty(len(p_oids), dtype=object)
+    for p_fids, p_batch in read_layer_geometries(featureclass, batch_size):
+        p_fids = np.asarray(p_fids, dtype=np.int64)
+        p_hit = np.isin(p_fids, p_oids)
+        p_wkbs[np.searchsorted(p_oids, p_fids[p_hit])] = p_batch[p_hit]
+    return [p_oids, p_wkbs]
+
+def group_by_key(keys):
+    p_order = np.argsort(keys, kind="stable")
+    p_sorted = keys[p_order]
+    p_starts = np.flatnonzero(np.r_[True, p_sorted[1:] != p_sorted[:-1]])
+    p_sizes = np.diff(np.r_[p_starts, len(keys)])
+    p_keep = p_sizes > 1
+    return [p_order[p_start:p_start + p_size] for p_start, p_size in zip(p_starts[p_keep], p_sizes[p_keep])]
+
+def find_near_pairs(centers, tolerance, bucket_limit = 256):
+    # with four half-offset grids of 4x tolerance, any two centres within tolerance share a cell at least once
+    p_cell = tolerance * 4
+    p_pairs = [np.empty(0, dtype=np.int64)]
+    p_skipped = np.zeros(len(centers), dtype=bool)
+    for p_offset in [[0.0, 0.0], [0.5, 0.0], [0.0, 0.5], [0.5, 0.5]]:
+        p_cells = np.floor(centers / p_cell + p_offset).astype(np.int64)
+        p_keys = np.unique(p_cells, axis=0, return_inverse=True)[1].reshape(-1)
+        p_order = np.argsort(p_keys, kind="stable")
+        p_sorted = p_keys[p_order]
+        p_dense = np.bincount(p_keys)[p_sorted] > bucket_limit
+        p_skipped[p_order[p_dense]] = True
+        p_order, p_sorted = p_order[~p_dense], p_sorted[~p_dense]
+        for p_step in range(1, bucket_limit):
+            p_hit = np.flatnonzero(p_sorted[p_step:] == p_sorted[:-p_step])
+            if not len(p_hit):
+                break
+            p_a, p_b = p_order[p_hit], p_order[p_hit + p_step]
+            p_pairs.append(np.minimum(p_a, p_b) * len(centers) + np.maximum(p_a, p_b))
+    p_pairs = np.unique(np.concatenate(p_pairs))
+    return p_pairs // len(centers), p_pairs % len(centers), int(np.count_nonzero(p_skipped))
+
+def join_pairs(count, p_a, p_b):
+    p_parent = np.arange(count)
+    def find(p_node):
+        while p_parent[p_node] != p_node:
+            p_parent[p_node] = p_parent[p_parent[p_node]]
+            p_node = p_parent[p_node]
+        return p_node
+    for a, b in zip(p_a, p_b):
+        p_root_a, p_root_b = find(a), find(b)
+        if p_root_a != p_root_b:
+            p_parent[max(p_root_a, p_root_b)] = min(p_root_a, p_root_b)
+    while True:
+        p_next = p_parent[p_parent]
+        if np.array_equal(p_next, p_parent):
+            return p_parent
+        p_parent = p_next
+
+def format_duplicate_group(fc_list, p_members):
+    p_parts = []
+    for p_layer, p_items in groupby(p_members, key=lambda p: p[0]):
+        p_parts.append(f"{fc_list[p_layer]} OID {', '.join([str(p[1]) for p in p_items])}")
+    return "；".join(p_parts)
+
+def report_duplicate_groups(fc_list, p_layers, p_oids, p_groups, problem, severity, sample_size = 0):
+    for p_group in sorted(p_groups, key=lambda p: p[0])[:sample_size or None]:
+        p_members = sorted(zip(p_layers[p_group].tolist(), p_oids[p_group].tolist()))
+        output_info(format_duplicate_group(fc_list, p_members), layer=fc_list[p_members[0][0]], \
+                    feature_id="/".join([str(p[1]) for p in p_members]), problem=problem, severity=severity)
+    return len(p_groups)
+
+def check_duplicates(featureclass_list, worker_count = 1, tolerance = 0.01, sample_size = 0, batch_size = 100000):
+    require_shapely("重复要素检测")
+    signal = 1
+    p_fc_list = [fc for fc in featureclass_list if get_data_info(fc)['featureType'] != "Annotation"]
+    p_results = run_layer_tasks(read_duplicate_keys, [[fc, batch_size] for fc in p_fc_list], worker_count)
+    p_layers = np.concatenate([np.empty(0, dtype=np.int64)] + \
+                              [np.full(len(p[0]), p_index) for p_index, p in enumerate(p_results)])
+    p_oids = np.concatenate([np.empty(0, dtype=np.int64)] + [p[0] for p in p_results])
+    p_hashes = np.concatenate([np.empty(0, dtype=np.uint64)] + [p[1] for p in p_results])
+    p_centers = np.concatenate([np.empty((0, 2))] + [p[2] for p in p_results])
+
+    _, p_first, p_classes = np.unique(p_hashes, return_index=True, return_inverse=True)
+    p_classes = p_classes.reshape(-1)
+    p_exact_groups = group_by_key(p_classes)
+    p_class_layers = np.unique(p_classes * (len(p_fc_list) + 1) + p_layers) // (len(p_fc_list) + 1)
+    n_cross = int(np.count_nonzero(np.bincount(p_class_layers, minlength=len(p_first)) > 1))
+    if p_exact_groups:
+        output_info(f"数据库中共存在 {len(p_exact_groups)} 组完全重复要素，其中 {n_cross} 组跨图层：", severity="error")
+        report_duplicate_groups(p_fc_list, p_layers, p_oids, p_exact_groups, "完全重复", "error", sample_size)
+        signal = 0
+
+    if tolerance > 0 and len(p_first) > 1:
+        p_a, p_b, n_skipped = find_near_pairs(p_centers[p_first], tolerance)
+        p_candidates = np.unique(np.concatenate([p_a, p_b]))
+        p_geoms = np.empty(len(p_first), dtype=object)
+        p_task_list = []
+        for p_index, featureclass in enumerate(p_fc_list):
+            p_members = p_candidates[p_layers[p_first[p_candidates]] == p_index]
+            if len(p_members):
+                p_task_list.append([featureclass, p_oids[p_first[p_members]], batch_size])
+        for p_task, (p_read_oids, p_wkbs) in zip(p_task_list, \
+                run_layer_tasks(read_selected_geometries, p_task_list, worker_count)):
+            p_index = p_fc_list.index(p_task[0])
+            p_members = p_candidates[p_layers[p_first[p_candidates]] == p_index]
+            p_geoms[p_members] = shapely.from_wkb(p_wkbs[np.searchsorted(p_read_oids, p_oids[p_first[p_members]])])
+        p_near = (shapely.get_type_id(p_geoms[p_a]) == shapely.get_type_id(p_geoms[p_b])) & \
+                 (shapely.hausdorff_distance(p_geoms[p_a], p_geoms[p_b]) <= tolerance)
+        p_roots = join_pairs(len(p_first), p_a[p_near], p_b[p_near])[p_classes]
+        p_members = np.flatnonzero(np.bincount(p_roots, minlength=len(p_first))[p_roots] > \
+                                   np.bincount(p_classes, minlength=len(p_first))[p_classes])
+        p_near_groups = [p_members[p] for p in group_by_key(p_roots[p_members])]
+        if p_near_groups:
+            output_info(f"数据库中共存在 {len(p_near_groups)} 组近似重复要素（容差 {tolerance}）：", severity="warning")
+            report_duplicate_groups(p_fc_list, p_layers, p_oids, p_near_groups, "近似重复", "warning", sample_size)
+            signal = 0
+        if n_skipped:
+            output_info(f"{n_skipped} 个要素所在区域过于密集，未进行近似重复检测。", severity="warning")
+    if signal == 1:
+        output_info(f"共检查 {len(p_oids)} 个要素，数据库中不存在重复要素。")
+    return signal
+
+def read_layer_tree(featureclass):
+    if featureclass not in layer_tree_cache:
+        p_oids, p_geoms = read_shapely_geometries(featureclass)
+        p_present = ~shapely.is_missing(p_geoms) & ~shapely.is_empty(p_geoms)
+        p_oids, p_geoms = p_oids[p_present], p_geoms[p_present]
+        p_invalid = ~shapely.is_valid(p_geoms)
+        if p_invalid.any():
+            p_geoms[p_invalid] = shapely.make_valid(p_geoms[p_invalid])
+        shapely.prepare(p_geoms)
+        layer_tree_cache[featureclass] = [p_oids, p_geoms, shapely.STRtree(p_geoms)]
+    return layer_tree_cache[featureclass]
+
+def check_hierarchy_children(child_fc, parent_fc, p_start, p_end, tolerance = 0.0001):
+    c_oids, c_geoms, _ = read_layer_tree(child_fc)
+    p_oids, p_geoms, p_tree = read_layer_tree(parent_fc)
+    p_chunk = c_geoms[p_start:p_end]
+    p_rows = []
+    if len(p_chunk) == 0:
+        return p_rows
+    p_child, p_parent = p_tree.query(p_chunk, predicate="intersects")
+    # prepared parents answer covers() cheaply; only the remaining pairs need an overlay
+    p_covered = shapely.covers(p_geoms[p_parent], p_chunk[p_child])
+    p_areas = shapely.area(p_chunk)[p_child]
+    p_rest = ~p_covered
+    p_areas[p_rest] = shapely.area(shapely.intersection(p_chunk[p_child[p_rest]], p_geoms[p_parent[p_rest]]))
+    p_child_areas = shapely.area(p_chunk)
+    p_significant = p_areas > tolerance * p_child_areas[p_child]
+    p_counts = np.bincount(p_child[p_significant], minlength=len(p_chunk))
+    p_best = np.zeros(len(p_chunk))
+    np.maximum.at(p_best, p_child, p_areas)
+    p_outside = p_child_areas - p_best
+    for p_index in np.flatnonzero((p_counts == 0) | (p_outside > tolerance * p_child_areas)):
+        p_parent_oids = p_oids[p_parent[(p_child == p_index) & p_significant]]
+        if p_counts[p_index] == 0:
+            p_problem = "无上级"
+        elif p_counts[p_index] > 1:
+            p_problem = "跨越上级"
+        else:
+            p_problem = "超出上级"
+        p_rows.append((int(c_oids[p_start + p_index]), p_problem, "/".join([str(p) for p in sorted(p_parent_oids)]), \
+                       float(p_outside[p_index])))
+    return p_rows
+
+def check_hierarchy_parents(child_fc, parent_fc, p_start, p_end, tolerance = 0.0001):
+    _, c_geoms, c_tree = read_layer_tree(child_fc)
+    p_oids, p_geoms, _ = read_layer_tree(parent_fc)
+    p_rows = []
+    n_gap_area = 0.0
+    n_overlap_area = 0.0
+    for p_index in range(p_start, min(p_end, len(p_geoms))):
+        p_parent = p_geoms[p_index]
+        p_parts = shapely.intersection(c_geoms[c_tree.query(p_parent, predicate="intersects")], p_parent)
+        p_union = shapely.union_all(p_parts)
+        p_gap = shapely.get_parts(shapely.difference(p_parent, p_union))
+        p_gap = p_gap[shapely.area(p_gap) > 0]
+        p_gap_area = float(shapely.area(p_gap).sum())
+        p_overlap_area = max(float(shapely.area(p_parts).sum() - shapely.area(p_union)), 0.0)
+        n_gap_area += p_gap_area
+        n_overlap_area += p_overlap_area
+        p_parent_area = shapely.area(p_parent)
+        if p_gap_area > tolerance * p_parent_area or p_overlap_area > tolerance * p_parent_area:
+            # compactness 4πA/P² below 0.1 marks a thin sliver rather than a missing child
+            p_slivers = int((4 * np.pi * shapely.area(p_gap) / np.maximum(shapely.length(p_gap), 1e-12) ** 2 < 0.1).sum())
+            p_rows.append((int(p_oids[p_index]), p_gap_area, p_overlap_area, len(p_gap), p_slivers))
+    return [p_rows, n_gap_area, n_overlap_area]
+
+def check_hierarchy_chunk(child_fc, parent_fc, p_part, p_start, p_end, tolerance = 0.0001):
+    if p_part == "children":
+        return check_hierarchy_children(child_fc, parent_fc, p_start, p_end, tolerance)
+    return check_hierarchy_parents(child_fc, parent_fc, p_start, p_end, tolerance)
+
+def get_admin_levels(work_space_path, fc_name_list):
+    p_catalog = get_catalog(work_space_path)
+    p_levels = []
+    for fc_name in fc_name_list:
+        p_fc_list = [fc for fc in find_catalog_data(p_catalog, fc_name) if get_data_info(fc)['shapeType'] == "Polygon"]
+        if p_fc_list:
+            p_levels.append(p_fc_list[0])
+    return p_levels
+
+def check_admin_hierarchy(work_space_path, fc_name_list, worker_count = 1, chunk_size = 50000, tolerance = 0.0001, \
+                          sample_size = 0):
+    require_shapely("行政区划层级检测")
+    p_levels = get_admin_levels(work_space_path, fc_name_list)
+    if len(p_levels) < 2:
+        output_info(f"数据库中行政区划图层不足两级，无法检测层级一致性！")
+        return -1
+    p_task_list = []
+    for parent_fc, child_fc in zip(p_levels[:-1], p_levels[1:]):
+        p_child_count = get_data_info(child_fc)['count'] or 0
+        p_parent_count = get_data_info(parent_fc)['count'] or 0
+        for p_start in range(0, max(p_child_count, 1), chunk_size):
+            p_task_list.append([child_fc, parent_fc, "children", p_start, p_start + chunk_size, tolerance])
+        p_parent_chunk = max(p_parent_count // (worker_count * 4), 1)
+        for p_start in range(0, max(p_parent_count, 1), p_parent_chunk):
+            p_task_list.append([child_fc, parent_fc, "parents", p_start, p_start + p_parent_chunk, tolerance])
+    p_results = run_cached_layer_tasks(check_hierarchy_chunk, p_task_list, worker_count)
+    layer_tree_cache.clear()
+
+    signal = 1
+    for parent_fc, child_fc in zip(p_levels[:-1], p_levels[1:]):
+        p_child_rows, p_parent_rows = [], []
+        n_gap_area, n_overlap_area = 0.0, 0.0
+        for p_task, p_result in zip(p_task_list, p_results):
+            if p_task[0] != child_fc:
+                continue
+            elif p_task[2] == "children":
+                p_child_rows += p_result
+            else:
+                p_parent_rows += p_result[0]
+                n_gap_area += p_result[1]
+                n_overlap_area += p_result[2]
+        p_child_name, p_parent_name = child_fc.split("\\")[-1], parent_fc.split("\\")[-1]
+        p_orphan_rows = [p for p in p_child_rows if p[1] == "无上级"]
+        output_info(f"{p_child_name} → {p_parent_name}：无上级要素 {len(p_orphan_rows)} 个，" \
+                    f"超出或跨越上级要素 {len(p_child_rows) - len(p_orphan_rows)} 个，" \
+                    f"缝隙面积 {n_gap_area:.2f}，重叠面积 {n_overlap_area:.2f}。", layer=child_fc)
+        if p_orphan_rows:
+            p_orphan_oids = ", ".join([str(p[0]) for p in sorted(p_orphan_rows)[:sample_size or None]])
+            output_info(f"{p_child_name} 无上级要素 ID：{p_orphan_oids}", layer=child_fc, problem="无上级", \
+                        severity="error")
+        for p_oid, p_problem, p_parent_oids, p_measure in sorted(p_child_rows)[:sample_size or None]:
+            output_info(f"{p_child_name}, {p_oid}, {p_problem} {p_parent_oids}, 超出面积 {p_measure:.2f}", \
+                        layer=child_fc, feature_id=p_oid, problem=p_problem, severity="error", \
+                        echo=p_problem != "无上级")
+        for p_oid, p_gap_area, p_overlap_area, p_gap_count, p_sliver_count in sorted(p_parent_rows)[:sample_size or None]:
+            output_info(f"{p_parent_name}, {p_oid}, 下级 {p_child_name} 缝隙 {p_gap_count} 处" \
+                        f"（其中碎片 {p_sliver_count} 处）面积 {p_gap_area:.2f}，重叠面积 {p_overlap_area:.2f}", \
+                        layer=parent_fc, feature_id=p_oid, problem="缝隙重叠", severity="error")
+        if p_child_rows or p_parent_rows:
+            signal = 0
+    if signal == 1:
+        output_info("行政区划各级图层层级一致。")
+    return signal
+
+def check_data_structure(data_list, name_set):
+    signal = 1
+    ir_set = set()
+    for data in data_list:
+        if get_data_type(data) == "RasterBand":
+            pass
+        else:
+            if data.split("\\")[-1] in name_set:
+                print(f"{data} 命名规范。")
+            else:
+                output_info(f"{data} 命名不规范！", layer=data, problem="命名不规范", severity="error")
+                ir_set.add(data.split("\\")[-1])
+    if ir_set:
+        p_output_set_info = ", ".join(ir_set)
+        output_info(f"命名不规范的图层为：{p_output_set_info}。")
+        signal = 0
+    else:
+        output_info("所有图层皆规范命名。")
+    return signal
+
+def read_attribute_batches(data, field_list, batch_size = 500000):
+    p_names = [field['name'] for field in field_list]
+    if data_backend == "snapshot":
+        for p_batch in snapshot_read_attribute_batches(data, p_names, batch_size):
+            report_feature_progress(len(p_batch[0]))
+            yield p_batch
+        return
+    elif data_backend == "open":
+        gdb_path, p_parts = split_data_path(data)
+        p_skip = 0
+        while True:
+            p_meta, p_fids, p_wkbs, p_field_data = pyogrio.raw.read(gdb_path, layer=p_parts[-1], columns=p_names, \
+                read_geometry=False, return_fids=True, skip_features=p_skip, max_features=batch_size or None)
+            report_feature_progress(len(p_fids))
+            yield p_fids, dict(zip(p_meta['fields'], p_field_data))
+            if not batch_size or len(p_fids) < batch_size:
+                break
+            p_skip += batch_size
+        return
+    p_null_values = dict([(field['name'], attribute_null_values[field['type']]) for field in field_list \
+                          if field['type'] in attribute_null_values])
+    p_oid_field = [field['name'] for field in get_data_info(data)['fields'] if field['type'] == "OID"]
+    if not batch_size or not p_oid_field or (get_data_info(data)['count'] or 0) <= batch_size:
+        p_array = arcpy.da.TableToNumPyArray(data, ["OID@"] + p_names, null_value=p_null_values)
+        report_feature_progress(len(p_array))
+        yield p_array["OID@"], dict([(p, p_array[p]) for p in p_names])
+        return
+    p_oids = np.sort(arcpy.da.TableToNumPyArray(data, ["OID@"])["OID@"])
+    p_oid_field = arcpy.AddFieldDelimiters(data, p_oid_field[0])
+    for p_start in range(0, len(p_oids), batch_size):
+        p_where = f"{p_oid_field} >= {p_oids[p_start]} AND " \
+                  f"{p_oid_field} <= {p_oids[min(p_start + batch_size, len(p_oids)) - 1]}"
+        p_array = arcpy.da.TableToNumPyArray(data, ["OID@"] + p_names, p_where, null_value=p_null_values)
+        report_feature_progress(len(p_array))
+        yield p_array["OID@"], dict([(p, p_array[p]) for p in p_names])
+
+def get_null_mask(p_values, p_field_type):
+    if p_values.dtype == object:
+        return np.equal(p_values, None)
+    elif p_values.dtype.kind == "f":
+        return np.isnan(p_values)
+    elif p_values.dtype.kind in "iu" and p_field_type in attribute_null_values:
+        return p_values == attribute_null_values[p_field_type]
+    return np.zeros(len(p_values), dtype=bool)
+
+def evaluate_field_rule(p_rule, p_values, p_field_type):
+    p_null = get_null_mask(p_values, p_field_type)
+    p_masks = dict()
+    if attribute_type_groups.get(p_field_type) == "String":
+        p_text = np.where(p_null, "", p_values).astype(str)
+        if p_rule['required']:
+            p_masks["必填为空"] = p_null | (np.char.strip(p_text) == "")
+        if p_rule['length'] is not None:
+            p_masks["长度超限"] = np.char.str_len(p_text) > p_rule['length']
+        if p_rule['domain']:
+            p_masks["值域不符"] = ~p_null & (p_text != "") & ~np.isin(p_text, p_rule['domain'])
+    else:
+        if p_rule['required']:
+            p_masks["必填为空"] = p_null
+        if p_rule['domain'] and attribute_type_groups.get(p_field_type) == "Integer":
+            p_masks["值域不符"] = ~p_null & ~np.isin(p_values, p_rule['int_domain'])
+        if p_values.dtype.kind in "iuf" and (p_rule['min'] is not None or p_rule['max'] is not None):
+            p_range = np.zeros(len(p_values), dtype=bool)
+            if p_rule['min'] is not None:
+                p_range |= p_values < p_rule['min']
+            if p_rule['max'] is not None:
+                p_range |= p_values > p_rule['max']
+            p_masks["超出取值范围"] = ~p_null & p_range
+    return p_masks
+
+def check_attribute_layer(data, rule_list, sample_size = 10, batch_size = 500000):
+    p_field_dict = dict([(field['name'].lower(), field) for field in get_data_info(data)['fields']])
+    p_errors = []
+    p_value_rules = []
+    for p_rule in rule_list:
+        field = p_field_dict.get(p_rule['field'].lower())
+        if field is None:
+            p_errors.append([p_rule['field'], "字段缺失", 1, []])
+            continue
+        if p_rule['type'] and attribute_type_groups.get(field['type']) != p_rule['type']:
+            p_errors.append([p_rule['field'], "字段类型不符", 1, []])
+        if p_rule['length'] is not None and field['length'] and field['length'] > p_rule['length'] and \
+           attribute_type_groups.get(field['type']) == "String":
+            p_errors.append([p_rule['field'], "字段长度不符", 1, []])
+        if p_rule['required'] or p_rule['length'] is not None or p_rule['domain'] or \
+           p_rule['min'] is not None or p_rule['max'] is not None:
+            if attribute_type_groups.get(field['type']) in ["String", "Integer", "Double"]:
+                p_value_rules.append([p_rule, field])
+    if not p_value_rules:
+        return p_errors
+    p_counts = dict()
+    p_samples = dict()
+    p_field_list = [field for p_rule, field in p_value_rules]
+    for p_oids, p_columns in read_attribute_batches(data, p_field_list, batch_size):
+        for p_rule, field in p_value_rules:
+            for p_problem, p_mask in evaluate_field_rule(p_rule, p_columns[field['name']], field['type']).items():
+                p_key = (p_rule['field'], p_problem)
+                p_counts[p_key] = p_counts.get(p_key, 0) + int(np.count_nonzero(p_mask))
+                if len(p_samples.setdefault(p_key, [])) < sample_size:
+                    p_samples[p_key] += [int(p) for p in p_oids[p_mask][:sample_size - len(p_samples[p_key])]]
+    for p_key, p_count in p_counts.items():
+        if p_count > 0:
+            p_errors.append([p_key[0], p_key[1], p_count, p_samples[p_key]])
+    return p_errors
+
+def check_attributes(data_list, rule_dict, worker_count = 1, batch_size = 500000):
+    signal = 1
+    p_data_list = [data for data in data_list if data.split("\\")[-1] in rule_dict and \
+                   get_data_info(data)['dataType'] in ["FeatureClass", "Table"]]
+    p_results = run_cached_layer_tasks(check_attribute_layer, \
+        [[data, rule_dict[data.split("\\")[-1]], 10, batch_size] for data in p_data_list], worker_count)
+    for data, p_errors in zip(p_data_list, p_results):
+        if not p_errors:
+            print(f"{data} 属性检查通过。")
+            continue
+        signal = 0
+        for p_field, p_problem, p_count, p_sample in p_errors:
+            if p_sample:
+                p_sample_info = ", ".join([str(p) for p in p_sample])
+                output_info(f"{data} 字段 {p_field} {p_problem}：{p_count} 处，示例 OID：{p_sample_info}。", \
+                            layer=data, feature_id=p_sample[0], problem=p_problem, severity="error")
+            else:
+                output_info(f"{data} 字段 {p_field} {p_problem}！", layer=data, problem=p_problem, severity="error")
+    if signal == 1:
+        output_info(f"共检查 {len(p_data_list)} 个图层，属性皆符合要求。")
+    return signal
+
+def get_conversion_type(p_info):
+    if p_info['dataType'] == "RasterDataset":
+        return "RasterDataset"
+    elif p_info['featureType'] == "Annotation":
+        return "Annotation"
+    return p_info['shapeType']
+
+def plan_conversion(data_list, conversion_dict):
+    p_layers = []
+    p_issues = []
+    p_target_dict = dict()
+    p_name_set = set()
+    for data in data_list:
+        p_info = get_data_info(data)
+        if p_info['dataType'] == "RasterBand":
+            continue
+        p_name = data.split("\\")[-1]
+        p_name_set.add(p_name)
+        if p_name not in conversion_dict:
+            p_issues.append([data, "未映射", "warning", f"{data} 不在转换表中，未进行转换！"])
+            continue
+        to_name, to_alias, p_type, p_required = conversion_dict[p_name]
+        if to_name == "NA":
+            p_issues.append([data, "未转换", "warning", f"{data} 未进行转换！"])
+            continue
+        p_actual_type = get_conversion_type(p_info)
+        if p_type in conversion_type_map and p_actual_type not in conversion_type_map[p_type]:
+            p_issues.append([data, "类型不符", "error", f"{data} 类型为 {p_actual_type}，转换表要求为{p_type}。"])
+        p_target_dict.setdefault(to_name.lower(), [to_name, []])[1].append(data)
+        p_layers.append([data, to_name, to_alias if p_info['dataType'] != "RasterDataset" else ""])
+    for to_name, p_sources in p_target_dict.values():
+        if len(p_sources) > 1:
+            p_names = ", ".join([data.split("\\")[-1] for data in p_sources])
+            for data in p_sources:
+                p_issues.append([data, "目标重复", "error", f"{data} 转换目标名称重复：{p_names} 均转换为 {to_name}。"])
+    p_absent_count = 0
+    for p_name, p_row in conversion_dict.items():
+        if p_name not in p_name_set:
+            if p_row[3] == "1":
+                p_issues.append(["", "缺少图层", "error", f"缺少地级数据库要求的图层 {p_name}（{p_row[2]}）！"])
+            else:
+                p_absent_count += 1
+    if p_absent_count > 0:
+        p_issues.append(["", "", "info", f"转换表中另有 {p_absent_count} 个非必需图层不在数据库中。"])
+    return p_layers, p_issues
+
+def report_conversion_plan(p_layers, p_issues):
+    for p_layer, p_problem, p_severity, p_message in p_issues:
+        output_info(p_message, layer=p_layer, problem=p_problem, severity=p_severity)
+    p_error_count = len([p for p in p_issues if p[2] == "error"])
+    if p_error_count > 0:
+        output_info(f"转换预检发现 {p_error_count} 个错误，共 {len(p_layers)} 个图层待转换。", severity="error")
+        return 0
+    output_info(f"转换预检通过，共 {len(p_layers)} 个图层待转换。")
+    return 1
+
+def check_conversion_plan(data_list, conversion_dict):
+    p_layers, p_issues = plan_conversion(data_list, conversion_dict)
+    for data, to_name, to_alias in p_layers:
+        output_info(f"{data} 计划转换为 {to_name}（{to_alias}）", layer=data)
+    return report_conversion_plan(p_layers, p_issues)
+
+def open_export_target(dir_path, gdb, suffix):
+    gdb_name = os.path.splitext(os.path.basename(gdb.replace("\\", os.sep)))[0]
+    target_gdb = dir_path + "\\" + gdb_name + suffix + ".gdb"
+    manifest_path = dir_path + "\\" + gdb_name + suffix + "_manifest.json"
+    if arcpy.Exists(target_gdb) and not os.path.isfile(manifest_path):
+        sys.exit("该数据库已存在！")
+    elif arcpy.Exists(target_gdb):
+        with codecs.open(manifest_path, encoding="utf-8") as manifest_file:
+            p_manifest = json.load(manifest_file)
+        output_info(f"{target_gdb} 上次导出未完成，已导出 {len(p_manifest['layers'])} 个图层，继续导出。", \
+                    problem="续传", severity="warning")
+    else:
+        arcpy.CreateFileGDB_management(dir_path, gdb_name + suffix)
+        p_manifest = {'source': gdb, 'layers': dict()}
+        write_export_manifest(manifest_path, p_manifest)
+    return target_gdb, manifest_path, p_manifest
+
+def write_export_manifest(manifest_path, manifest):
+    with codecs.open(manifest_path, 'w', encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, ensure_ascii=False)
+    return 1
+
+def plan_export(p_layers):
+    p_plan = []
+    for data, to_name, to_alias in p_layers:
+        p_plan.append([data, to_name, to_alias, get_data_info(data)['count'] or 0, get_layer_size(data)])
+    return sorted(p_plan, key=lambda p: (p[4], p[3]), reverse=True)
+
+def get_staging_gdb(target_gdb):
+    p_dir, p_name = target_gdb.rsplit("\\", 1)
+    p_stage_name = p_name[:-4] + "_stage" + str(os.getpid())
+    if not arcpy.Exists(p_dir + "\\" + p_stage_name + ".gdb"):
+        arcpy.CreateFileGDB_management(p_dir, p_stage_name)
+    return p_dir + "\\" + p_stage_name + ".gdb"
+
+def delete_staging_gdbs(target_gdb):
+    p_dir, p_name = target_gdb.rsplit("\\", 1)
+    for p_stage_gdb in get_workspaces(p_dir, p_name[:-4] + "_stage*", "FileGDB"):
+        delete_temp(p_stage_gdb)
+    return 1
+
+def make_spatial_reference(spatial_ref):
+    return arcpy.SpatialReference(spatial_ref[0]) if spatial_ref[0] else arcpy.SpatialReference(text=spatial_ref[1])
+
+def export_layer(data, target_gdb, to_name, to_alias = "", staging = False, spatial_ref = None, source_ref = None):
+    p_start = time.time()
+    p_output = (get_staging_gdb(target_gdb) if staging else target_gdb) + "\\" + to_name
+    if spatial_ref is None:
+        arcpy.Copy_management(data, p_output)
+    else:
+        p_spatial_ref = make_spatial_reference(spatial_ref)
+        p_transforms = arcpy.ListTransformations(make_spatial_reference(source_ref), p_spatial_ref) \
+            if source_ref and (source_ref[0] or source_ref[1]) else []
+        arcpy.Project_management(data, p_output, p_spatial_ref, p_transforms[0] if p_transforms else "")
+    if to_alias:
+        arcpy.AlterAliasName(p_output, to_alias)
+    return [p_output, time.time() - p_start]
+
+def get_source_ref(data, spatial_ref):
+    p_spatial_ref = get_data_info(data)['spatialReference'] if spatial_ref is not None else None
+    return None if p_spatial_ref is None else [p_spatial_ref['wkid'], p_spatial_ref['wkt']]
+
+def export_layers(target_gdb, manifest_path, p_manifest, p_layers, p_message, worker_count = 1, spatial_ref = None):
+    p_plan = plan_export([p for p in p_layers if p[1] not in p_manifest['layers']])
+    # a File GDB takes one writer at a time: a single worker copies straight into the target, parallel workers
+    # copy into per-process staging GDBs that are merged serially, so every layer is written twice
+    p_staging = worker_count > 1 and len(p_plan) > 1
+    delete_staging_gdbs(target_gdb)
+    for p_layer in p_plan:
+        if arcpy.Exists(target_gdb + "\\" + p_layer[1]):
+            delete_temp(target_gdb + "\\" + p_layer[1])
+    n_features = 0
+    n_bytes = 0
+    p_start = time.time()
+    p_iter = iter(p_plan)
+    p_wave_size = worker_count * 4 if p_staging else 1
+    p_wave = list(islice(p_iter, p_wave_size))
+    try:
+        while p_wave:
+            p_results = run_layer_tasks(export_layer, \
+                [[p[0], target_gdb, p[1], p[2], p_staging, spatial_ref, get_source_ref(p[0], spatial_ref)] \
+                 for p in p_wave], worker_count)
+            for (data, to_name, to_alias, n_count, n_size), (p_output, p_seconds) in zip(p_wave, p_results):
+                p_target = target_gdb + "\\" + to_name
+                if p_output != p_target:
+                    arcpy.Copy_management(p_output, p_target)
+                    delete_temp(p_output)
+                invalidate_data_info(p_target)
+                p_manifest['layers'][to_name] = [data, n_count, n_size, round(p_seconds, 3)]
+                write_export_manifest(manifest_path, p_manifest)
+                n_features += n_count
+                n_bytes += n_size
+                output_info(p_message.format(data=data, target=p_target), layer=data)
+            check_cancel()
+            p_wave = list(islice(p_iter, p_wave_size))
+    finally:
+        if p_staging:
+            delete_staging_gdbs(target_gdb)
+    os.remove(manifest_path)
+    p_seconds = max(time.time() - p_start, 0.001)
+    output_info(f"共导出 {len(p_plan)} 个图层，{n_features} 个要素，{n_bytes / 1048576:.1f} MB，" \
+                f"用时 {p_seconds:.1f} 秒，{n_features / p_seconds:.0f} 要素/秒，" \
+                f"{n_bytes / 1048576 / p_seconds:.2f} MB/秒" + \
+                (f"（经暂存数据库合并，实际写入约 {n_bytes * 2 / 1048576:.1f} MB）。" if p_staging else "。"))
+    return 1
+
+def converse_data_structure(dir_path, data_list, gdb, structure_dict, worker_count = 1):
+    require_arcpy("数据结构转换")
+    p_layers, p_issues = plan_conversion(data_list, structure_dict)
+    if report_conversion_plan(p_layers, p_issues) == 0:
+        sys.exit("转换预检未通过，未进行转换！程序退出。")
+    conv_gdb_path, manifest_path, p_manifest = open_export_target(dir_path, gdb, "_conv")
+    output_info(f"转换输出数据库为：{conv_gdb_path}。")
+    return export_layers(conv_gdb_path, manifest_path, p_manifest, p_layers, "{data} 转换为 {target}", worker_count)
+
+def summarize_table_structure(data_list):
+    signal = 1
+    for data in data_list:
+        p_info = get_data_info(data)
+        field_list = p_info['fields']
+        if field_list and p_info['dataType'] != "RasterBand":
+            p_field_info = data.split("\\")[-1] + ","
+            for field in field_list:
+                if field['name'] in ["Shape_Area", "Shape_Length"]:
+                    pass
+                else:
+                    if field['aliasName']:
+                        p_field_info += f" {field['aliasName']}, {field['type']}, {field['length']},"
+                    else:
+                        p_field_info += f" {field['name']}, {field['type']}, {field['length']},"
+            p_field_info = p_field_info[:-1]
+            output_info(p_field_info, layer=data)
+        else:
+            print(f"{data} 无数据表或非数据表检测对象。")
+    return signal
+
+def export_to_flat_gdb(dir_path, gdb, data_list, worker_count = 1):
+    require_arcpy("去除数据层级")
+    flat_gdb_path, manifest_path, p_manifest = open_export_target(dir_path, gdb, "_flat")
+    p_layers = []
+    for data in data_list:
+        if get_data_info(data)['dataType'] == "RasterBand":
+            pass
+        else:
+            p_layers.append([data, data.split("\\")[-1], ""])
+    return export_layers(flat_gdb_path, manifest_path, p_manifest, p_layers, "{data} 导出成功。", worker_count)
+
+def repair_geometry_interactive(featureclass, repair_policy = ""):
+    p_repair_signal = -1
+    while p_repair_signal == -1:
+        if repair_policy:
+            cm = repair_policy
+        else:
+            cm = request_input("批处理模式下未指定几何修正策略！")
+        if cm == "Y" or cm == "y":
+            p_repair_signal = 1
+            output_info(f"{featureclass} 将被修正。", layer=featureclass, problem="修正")
+        else:
+            p_repair_signal = 0
+            output_info(f"{featureclass} 未修正。", layer=featureclass, problem="未修正")
+    return p_repair_signal
+
+def apply_geometry_repair(featureclass):
+    arcpy.RepairGeometry_management(featureclass)
+    return 1
+
+def decide_repair(o_count, n_count, o_measure_count, n_measure_count, accept_tolerance = 0.001, reject_limit = 0.05):
+    p_count_loss = (o_count - n_count) / o_count if o_count else 0.0
+    if o_measure_count:
+        p_change = abs(n_measure_count - o_measure_count) / abs(o_measure_count)
+    else:
+        p_change = 0.0 if n_measure_count == o_measure_count else float("inf")
+    if p_count_loss > reject_limit or p_change > reject_limit:
+        return "reject", p_change
+    elif p_count_loss == 0 and p_change <= accept_tolerance:
+        return "accept", p_change
+    return "review", p_change
+
+def write_repair_audit(audit_path, records):
+    if not audit_path or not records:
+        return 0
+    p_new_file = not os.path.isfile(audit_path)
+    with codecs.open(audit_path, 'a', encoding="utf-8-sig" if p_new_file else "utf-8") as audit_file:
+        p_writer = csv.writer(audit_file)
+        if p_new_file:
+            p_writer.writerow(['TIME', 'CLASS', 'COUNT_BEFORE', 'COUNT_AFTER', 'MEASURE_BEFORE', 'MEASURE_AFTER', \
+                               'CHANGE', 'POLICY', 'DECISION'])
+        p_writer.writerows(records)
+    return len(records)
+
+def read_flagged_oids(featureclass):
+    with scratch_output(get_scratch_name(featureclass.split("\\")[-1], "_flag")) as p_output_name:
+        arcpy.CheckGeometry_management(featureclass, p_output_name)
+        return np.unique(arcpy.da.TableToNumPyArray(p_output_name, ["FEATURE_ID"])["FEATURE_ID"])
+
+def get_oid_where(featureclass, oids, chunk_size = 1000):
+    p_oid_field = [field['name'] for field in get_data_info(featureclass)['fields'] if field['type'] == "OID"][0]
+    p_oid_field = arcpy.AddFieldDelimiters(featureclass, p_oid_field)
+    return " OR ".join([f"{p_oid_field} IN ({', '.join([str(p) for p in oids[p_start:p_start + chunk_size]])})" \
+                        for p_start in range(0, len(oids), chunk_size)])
+
+def read_feature_measures(featureclass, measure_field, where_clause = None):
+    p_fields = ["OID@"] + ([measure_field] if measure_field else [])
+    p_array = arcpy.da.FeatureClassToNumPyArray(featureclass, p_fields, where_clause, null_value=0)
+    p_oids = p_array["OID@"]
+    p_measures = p_array[measure_field].astype(float) if measure_field else np.zeros(len(p_oids))
+    p_points = arcpy.da.FeatureClassToNumPyArray(featureclass, ["OID@"], where_clause, \
+                                                 explode_to_points=True, null_value=0)["OID@"]
+    p_point_oids, p_point_counts = np.unique(p_points, return_counts=True)
+    p_index = np.clip(np.searchsorted(p_point_oids, p_oids), 0, max(len(p_point_oids) - 1, 0))
+    if len(p_point_oids) > 0:
+        p_vertices = np.where(p_point_oids[p_index] == p_oids, p_point_counts[p_index], 0)
+    else:
+        p_vertices = np.zeros(len(p_oids), dtype=int)
+    return p_oids, p_measures, p_vertices
+
+def preview_repair_layer(featureclass, shape_type, flagged_oids = None):
+    p_measure_field = {"Polygon": "SHAPE@AREA", "Polyline": "SHAPE@LENGTH"}.get(shape_type)
+    o_count = get_data_info(featureclass)['count']
+    o_measure_count = 0.0
+    if p_measure_field:
+        o_measure_count = float(arcpy.da.FeatureClassToNumPyArray(featureclass, [p_measure_field], \
+                                                                  null_value=0)[p_measure_field].sum())
+    if flagged_oids is None:
+        flagged_oids = read_flagged_oids(featureclass)
+    flagged_oids = np.unique(np.asarray(flagged_oids, dtype=np.int64))
+    if len(flagged_oids) == 0:
+        return [o_count, o_measure_count, o_measure_count, []]
+    p_where = get_oid_where(featureclass, flagged_oids)
+    o_oids, o_measures, o_vertices = read_feature_measures(featureclass, p_measure_field, p_where)
+    p_order = np.argsort(o_oids)
+    o_oids, o_measures, o_vertices = o_oids[p_order], o_measures[p_order], o_vertices[p_order]
+    with scratch_output(get_scratch_name(featureclass.split("\\")[-1], "_fix")) as p_output_name:
+        arcpy.Select_analysis(featureclass, p_output_name, p_where)
+        p_output_oids = np.sort(arcpy.da.TableToNumPyArray(p_output_name, ["OID@"])["OID@"])
+        arcpy.RepairGeometry_management(p_output_name)
+        n_oids, n_measures, n_vertices = read_feature_measures(p_output_name, p_measure_field)
+    p_position = np.searchsorted(p_output_oids, n_oids)
+    p_kept = np.zeros(len(o_oids), dtype=bool)
+    p_kept[p_position] = True
+    p_new_measures = np.zeros(len(o_oids))
+    p_new_measures[p_position] = n_measures
+    p_new_vertices = np.zeros(len(o_oids), dtype=int)
+    p_new_vertices[p_position] = n_vertices
+    n_count = o_count - int(np.count_nonzero(~p_kept))
+    n_measure_count = o_measure_count - float(o_measures.sum()) + float(n_measures.sum())
+    p_diff = [[int(o_oids[p]), int(o_vertices[p]), int(p_new_vertices[p]), \
+               float(p_new_measures[p] - o_measures[p]), not p_kept[p]] for p in range(len(o_oids))]
+    return [n_count, o_measure_count, n_measure_count, p_diff]
+
+def report_repair_diff(featureclass, shape_type, p_diff, sample_size = 0):
+    p_measure_name = {"Polygon": "面积", "Polyline": "长度"}.get(shape_type, "")
+    for p_oid, o_vertices, n_vertices, p_delta, p_deleted in p_diff[:sample_size or len(p_diff)]:
+        if p_deleted:
+            p_info = f"{featureclass}, {p_oid}, 修正后删除"
+        else:
+            p_info = f"{featureclass}, {p_oid}, 节点 {o_vertices} -> {n_vertices}"
+            if p_measure_name:
+                p_info += f", {p_measure_name}变化 {p_delta:.2f}"
+        output_info(p_info, layer=featureclass, feature_id=p_oid, problem="修正预览")
+    if sample_size and len(p_diff) > sample_size:
+        output_info(f"{featureclass} 共有 {len(p_diff)} 个要素将被修正，仅列出前 {sample_size} 个。", layer=featureclass)
+    return len(p_diff)
+
+def repair_geometry(featureclass_list, worker_count = 1, repair_policy = "", sample_size = 0, spill_dir = "", \
+                    audit_path = "", accept_tolerance = 0.001, reject_limit = 0.05):
+    require_arcpy("几何修正")
+    repair_signal_list = []
+    p_decision_dict = dict()
+    p_review_list = []
+    p_check_results = run_layer_tasks(check_geometry_layer, \
+        [[fc, "_cktb", sample_size, spill_dir] for fc in featureclass_list], worker_count)
+    p_repair_list = []
+    p_flag_dict = dict()
+    for featureclass, p_result in zip(featureclass_list, p_check_results):
+        if report_geometry_layer(featureclass, *p_result) > 0:
+            p_repair_list.append(featureclass)
+            p_flag_dict[featureclass] = [row[1] for row in p_result[1]] if len(p_result[1]) == p_result[0] else None
+
+    p_task_list = [fc for fc in p_repair_list \
+                   if get_data_info(fc)['shapeType'] in ["Point", "Polyline", "Polygon"]]
+    p_repair_results = run_layer_tasks(preview_repair_layer, \
+        [[fc, get_data_info(fc)['shapeType'], p_flag_dict[fc]] for fc in p_task_list], worker_count)
+    p_repair_dict = dict(zip(p_task_list, p_repair_results))
+
+    for featureclass in p_repair_list:
+        p_info = get_data_info(featureclass)
+        p_shape_type = p_info['shapeType']
+        if featureclass in p_repair_dict:
+            o_count = p_info['count']
+            n_count, o_measure_count, n_measure_count, p_diff = p_repair_dict[featureclass]
+            print(f"当前待修正要素集为 {featureclass}")
+            if p_shape_type == "Point":
+                print(f"修正前点数量为 {o_count} 个，修正后点数量为 {n_count} 个。")
+            elif p_shape_type == "Polyline":
+                print(f"修正前线要素数量为 {o_count} 个，修正后线要素数量为 {n_count} 个。")
+                print(f"修正前线要素长度 {o_measure_count}m，修正后线要素长度 {n_measure_count}m。")
+            else:
+                print(f"修正前面要素数量为 {o_count} 个，修正后面要素数量为 {n_count} 个。")
+                print(f"修正前面要素面积为 {o_measure_count}㎡，修正后面要素面积为 {n_measure_count}㎡。")
+            report_repair_diff(featureclass, p_shape_type, p_diff, sample_size)
+            p_decision, p_change = decide_repair(o_count, n_count, o_measure_count, n_measure_count, \
+                                                 accept_tolerance, reject_limit)
+            if repair_policy != "auto":
+                print('是否修正？是（Y），否（N or any other input）')
+                p_decision = "accept" if repair_geometry_interactive(featureclass, repair_policy) == 1 else "reject"
+            elif p_decision == "accept":
+                output_info(f"{featureclass} 修正后要素 {o_count} -> {n_count} 个，变化 {p_change:.4%}，在容差内，将被修正。", \
+                            layer=featureclass, problem="修正")
+            elif p_decision == "reject":
+                output_info(f"{featureclass} 修正后要素 {o_count} -> {n_count} 个，变化 {p_change:.4%}，超出限值，未修正。", \
+                            layer=featureclass, problem="未修正", severity="warning")
+            else:
+                p_review_list.append(featureclass)
+            p_decision_dict[featureclass] = [p_decision, repair_policy or "manual", o_count, n_count, \
+                                             o_measure_count, n_measure_count, p_change]
+
+        elif p_shape_type in ["Multipoint", "MultiPatch"]:
+            output_info(f"{featureclass} 图形类型错误，无法修正！", layer=featureclass, \
+                        problem="图形类型错误", severity="error")
+
+    for featureclass in p_review_list:
+        if interactive_mode:
+            print(f"{featureclass} 修正变化介于容差与限值之间，是否修正？是（Y），否（N or any other input）")
+            p_signal = repair_geometry_interactive(featureclass)
+            p_decision_dict[featureclass][0] = "accept" if p_signal == 1 else "reject"
+            p_decision_dict[featureclass][1] = "auto/manual"
+        else:
+            output_info(f"{featureclass} 修正变化介于容差与限值之间，需人工确认，暂不修正。", \
+                        layer=featureclass, problem="待确认", severity="warning")
+            p_decision_dict[featureclass][0] = "queued"
+
+    p_accept_list = [fc for fc in p_decision_dict if p_decision_dict[fc][0] == "accept"]
+    # repairs edit the GDB in place and a File GDB takes one writer at a time, so only the preview runs in parallel
+    run_layer_tasks(apply_geometry_repair, [[fc] for fc in p_accept_list])
+    for featureclass in p_accept_list:
+        invalidate_data_info(featureclass)
+    p_time = time.strftime("%Y-%m-%d %H:%M:%S")
+    write_repair_audit(audit_path, [[p_time, fc] + p[2:] + p[1:2] + p[:1] for fc, p in p_decision_dict.items()])
+    for featureclass in p_decision_dict:
+        repair_signal_list.append(1 if p_decision_dict[featureclass][0] == "accept" else 0)
+    return repair_signal_list
+
+def delete_temp(temp_name):
+    arcpy.Delete_management(temp_name)
+    return 1
+
+def check_mode(check_list):
+    p_check_mode = ""
+    print("请输入运行模式，全部检测（Y）或自定义（X）:")
+    print(">>>\n")
+    while p_check_mode == "":
+        cm = request_input("批处理模式下未指定检测/处理方法！")
+        if cm == "Y" or cm == "y":
+            p_check_mode = "Y"
+        elif cm == "X" or cm == "x":
+            p_check_mode = "X"
+        else:
+            print("模式输入错误，请重新输入:")
+
+    if p_check_mode == "Y":
+        print("执行全部检测>>>")
+        return check_list[:6]
+    else:
+        print(", ".join(check_list))
+        print("现有检测/处理方法如上，请输入需使用的检测/处理方法名：")
+        p_input = ""
+        while p_input == "":
+            pin = request_input("批处理模式下未指定检测/处理方法！")
+            if pin in check_list:
+                print(f"选定的检测/处理方法为 {pin} >>>\n")
+                p_input = pin
+            else:
+                print("方法输入错误，请重新输入:")
+        n_check_dict = [p_input]
+    return n_check_dict
+
+def resolve_region_fc(context):
+    print("获取规划区划范围要素>>>\n")
+    return get_target_fc(context['gdb'], context['admin_fc_name'], context['admin_fc_name_list'])
+
+def resolve_region_geometry(context):
+    resolve_artefacts(context, ["region_fc"])
+    if shapely is None or not context['region_fc']:
+        return None
+    return read_region_geometry(context['region_fc'])
+
+artefact_providers = {
+    'catalog': lambda c: get_catalog(c['gdb']),
+    'data_list': lambda c: conduct_data_list(resolve_artefacts(c, ["catalog"])['gdb']),
+    'featureclass_list': lambda c: conduct_featureclass_list(resolve_artefacts(c, ["catalog"])['gdb']),
+    'table_list': lambda c: conduct_table_list(resolve_artefacts(c, ["catalog"])['gdb']),
+    'inventory': lambda c: conduct_data_inventory(resolve_artefacts(c, ["data_list"])['data_list']),
+    'region_fc': resolve_region_fc,
+    'region_geometry': resolve_region_geometry,
+    'structure_info': lambda c: get_structure_info(c['dir'], c['structure_file_name']),
+    'field_rules': lambda c: get_field_rules(c['dir'], c['structure_file_name']),
+    'conversion_rules': lambda c: get_conversion_info(c['dir'], c['conversion_file_name'])}
+
+# inputs are resolved into the shared context before a check runs; checks that write a resource
+# are ordered against every check reading or writing it, checks after a fatal one wait for it,
+# all other checks may run side by side
+check_registry = {
+    "坐标系统": {'title': "\n坐标系统检测结果：", 'inputs': ["data_list", "inventory"], 'writes': [], \
+        'fatal': "数据库错误，停止后续检测！", 'detach': True, \
+        'run': lambda c: check_reference(c['data_list'], c['geometry_sample_size'])},
+    "几何": {'title': "\n几何检测结果：", 'inputs': ["featureclass_list", "inventory"], 'writes': [], \
+        'fatal': "", 'detach': True, \
+        'run': lambda c: check_geometry(c['featureclass_list'], c['worker_count'], \
+                                        c['geometry_sample_size'], c['geometry_spill_dir'])},
+    "数据范围": {'title': "\n数据范围检测结果：", 'inputs': ["data_list", "inventory", "region_fc"], 'writes': [], \
+        'fatal': "", 'detach': True, \
+        'run': lambda c: check_extent(c['region_fc'], c['data_list'], c['extent_tolerance'], c['extent_min_overlap'])},
+    "规划范围": {'title': "\n规划范围检测结果：", \
+        'inputs': ["featureclass_list", "inventory", "region_fc", "region_geometry"], 'writes': [], \
+        'fatal': "", 'detach': True, \
+        'run': lambda c: check_fc_boundary(c['region_fc'], c['featureclass_list'], c['worker_count'], \
+                                           c['boundary_list_all'])},
+    "数据结构": {'title': "\n数据结构检测结果：", 'inputs': ["data_list", "structure_info"], 'writes': [], \
+        'fatal': "", 'detach': True, \
+        'run': lambda c: check_data_structure(c['data_list'], c['structure_info'])},
+    "数据表结构": {'title': "\n数据表结构：", 'inputs': ["data_list", "inventory"], 'writes': [], \
+        'fatal': "", 'detach': True, \
+        'run': lambda c: summarize_table_structure(c['data_list'])},
+    "去除数据层级": {'title': "\n新建无 dataset 数据库：", 'inputs': ["data_list", "inventory"], 'writes': ["flat_gdb"], \
+        'fatal': "", 'detach': True, \
+        'run': lambda c: export_to_flat_gdb(c['dir'], c['gdb'], c['data_list'], c['worker_count'])},
+    "几何修正": {'title': "", 'inputs': ["featureclass_list", "inventory"], 'writes': ["data"], \
+        'fatal': "", 'detach': False, \
+        'run': lambda c: repair_geometry(c['featureclass_list'], c['worker_count'], c['repair_policy'], \
+            c['geometry_sample_size'], c['geometry_spill_dir'], get_output_prefix(c) + "_repair_audit.csv", \
+            c['repair_accept_tolerance'], c['repair_reject_limit'])},
+    "数据结构转换": {'title': "", 'inputs': ["data_list", "inventory", "conversion_rules"], 'writes': ["conversion_gdb"], \
+        'fatal': "", 'detach': True, \
+        'run': lambda c: converse_data_structure(c['dir'], c['data_list'], c['gdb'], c['conversion_rules'], \
+                                                 c['worker_count'])},
+    "拓扑": {'title': "\n拓扑检测结果：", 'inputs': ["featureclass_list", "inventory"], 'writes': [], \
+        'fatal': "", 'detach': True, \
+        'run': lambda c: check_topology(c['featureclass_list'], c['worker_count'], c['topology_chunk_size'], \
+                                        c['topology_tolerance'], c['geometry_sample_size'])},
+    "转换预检": {'title': "\n数据结构转换预检：", 'inputs': ["data_list", "inventory", "conversion_rules"], 'writes': [], \
+        'fatal': "", 'detach': True, \
+        'run': lambda c: check_conversion_plan(c['data_list'], c['conversion_rules'])},
+    "属性": {'title': "\n属性检测结果：", 'inputs': ["data_list", "table_list", "inventory", "field_rules"], 'writes': [], \
+        'fatal': "", 'detach': True, \
+        'run': lambda c: check_attributes(c['data_list'] + c['table_list'], c['field_rules'], c['worker_count'], \
+                                          c['attribute_batch_size'])},
+    "坐标系统统一": {'title': "\n坐标系统统一：", 'inputs': ["data_list", "inventory"], 'writes': ["crs_gdb"], \
+        'fatal': "", 'detach': True, \
+        'run': lambda c: unify_spatial_reference(c['dir'], c['gdb'], c['data_list'], c['worker_count'])},
+    "行政区划层级": {'title': "\n行政区划层级检测结果：", 'inputs': ["catalog", "inventory"], 'writes': [], \
+        'fatal': "", 'detach': True, \
+        'run': lambda c: check_admin_hierarchy(c['gdb'], c['admin_fc_name_list'], c['worker_count'], \
+            c['topology_chunk_size'], c['hierarchy_tolerance'], c['geometry_sample_size'])},
+    "重复要素": {'title': "\n重复要素检测结果：", 'inputs': ["featureclass_list", "inventory"], 'writes': [], \
+        'fatal': "", 'detach': True, \
+        'run': lambda c: check_duplicates(c['featureclass_list'], c['worker_count'], c['duplicate_tolerance'], \
+                                          c['geometry_sample_size'])},
+    "数据快照": {'title': "\n数据快照：", 'inputs': ["data_list", "inventory"], 'writes': ["snapshot"], \
+        'fatal': "", 'detach': True, \
+        'run': lambda c: export_snapshot(c['gdb'], c['data_list'], c['worker_count'])}}
+
+def get_output_prefix(context):
+    return os.path.join(context['dir'], os.path.splitext(os.path.basename(context['gdb'].replace("\\", os.sep)))[0])
+
+def resolve_artefacts(context, names):
+    for p_name in names:
+        if p_name not in context:
+            context[p_name] = artefact_providers[p_name](context)
+    return context
+
+def install_artefacts(context):
+    if 'catalog' in context:
+        gdb_catalog_cache[context['gdb']] = context['catalog']
+    if 'inventory' in context:
+        data_inventory.update(context['inventory'])
+    if context.get('region_geometry') is not None:
+        shapely.prepare(context['region_geometry'])
+        region_geometry_cache[context['region_fc']] = context['region_geometry']
+    return 1
+
+def checks_conflict(check_a, check_b):
+    p_rule_a, p_rule_b = check_registry[check_a], check_registry[check_b]
+    if p_rule_a['fatal']:
+        return True
+    p_access_a, p_access_b = set(["data"] + p_rule_a['writes']), set(["data"] + p_rule_b['writes'])
+    return bool(set(p_rule_a['writes']) & p_access_b or set(p_rule_b['writes']) & p_access_a)
+
+def plan_check_steps(check_names, check_worker_count = 1):
+    if check_worker_count <= 1 or not check_names:
+        return [[p_index] for p_index in range(len(check_names))]
+    p_levels = []
+    for p_index, check in enumerate(check_names):
+        p_levels.append(1 + max([p_levels[p] for p in range(p_index) if checks_conflict(check_names[p], check)] + [-1]))
+    return [[p for p in range(len(check_names)) if p_levels[p] == p_level] for p_level in range(max(p_levels) + 1)]
+
+def guard_check(func, *args):
+    try:
+        return [func(*args), ""]
+    except SystemExit as e:
+        if str(e) == cancel_message:
+            raise
+        return [None, str(e)]
+    except Exception as e:
+        # the console gets the short message from record_check_result; the traceback goes to the result file only
+        output_info(traceback.format_exc(), problem="异常堆栈", severity="error", echo=False)
+        return [None, repr(e)]
+
+def record_check_result(check, p_signal, p_message, p_start):
+    p_result = {'check': check, 'status': "完成", 'signal': p_signal, 'message': p_message, \
+                'seconds': round(time.time() - p_start, 3)}
+    if p_message:
+        p_result['status'] = "错误"
+        output_info(f"{check}未完成：{p_message}", problem="错误", severity="error")
+    elif check_registry[check]['fatal'] and p_signal == -1:
+        p_result.update(status="错误", message=check_registry[check]['fatal'])
+        output_info(check_registry[check]['fatal'], problem="错误", severity="error")
+    return p_result
+
+def run_check(check, context):
+    p_start = time.time()
+    if result_sink is not None:
+        result_sink['check'] = check
+    if check_registry[check]['title']:
+        output_info(check_registry[check]['title'])
+    p_signal, p_message = guard_check(resolve_artefacts, context, check_registry[check]['inputs'])
+    if not p_message:
+        p_signal, p_message = guard_check(run_instrumented_check, check, context)
+    p_result = record_check_result(check, p_signal, p_message, p_start)
+    report_cache_hits(check, context['data_list'])
+    return p_result
+
+def run_check_process(check, context, backend, timing, cancel_path, event_path, cache):
+    global result_sink, result_cache, progress_state
+    if backend != data_backend:
+        set_data_backend(backend)
+    cancel_state['path'] = cancel_path
+    install_artefacts(context)
+    result_sink = {'path': "", 'format': "", 'check': check, 'buffer': [], 'flush_count': float("inf"), \
+                   'flush_interval': float("inf"), 'last_flush': time.time()}
+    result_cache = cache
+    progress_state = None
+    p_progress = open_progress(context['gdb'], 0, event_path) if event_path else None
+    p_instrument = open_instrument() if timing else None
+    p_output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(p_output):
+            p_result = run_check(check, context)
+        p_stats = None if p_instrument is None else [p_instrument['checks'], p_instrument['layers'], p_instrument['calls']]
+        return [p_result, p_output.getvalue(), result_sink['buffer'], None if cache is None else cache['layers'], p_stats]
+    finally:
+        if p_instrument is not None:
+            close_instrument(p_instrument)
+        if p_progress is not None:
+            close_progress(p_progress)
+
+def merge_check_process(p_output, p_records, p_layers, p_stats):
+    sys.stdout.write(p_output)
+    if result_sink is not None:
+        result_sink['buffer'].extend(p_records)
+        flush_result_sink(result_sink)
+    if p_layers is not None and result_cache is not None:
+        for data, p_entry in p_layers.items():
+            o_entry = result_cache['layers'].get(data)
+            if o_entry is not None and o_entry['fingerprint'] == p_entry['fingerprint']:
+                o_entry['results'].update(p_entry['results'])
+            else:
+                result_cache['layers'][data] = p_entry
+    if p_stats is not None and instrument_stats is not None:
+        for check, p_seconds in p_stats[0].items():
+            instrument_stats['checks'][check] = instrument_stats['checks'].get(check, 0.0) + p_seconds
+        for p_key, p_seconds in p_stats[1].items():
+            instrument_stats['layers'][p_key] = instrument_stats['layers'].get(p_key, 0.0) + p_seconds
+        for p_key, (p_count, p_seconds) in p_stats[2].items():
+            p_value = instrument_stats['calls'].setdefault(p_key, [0, 0.0])
+            p_value[0] += p_count
+            p_value[1] += p_seconds
+    return 1
+
+def run_check_step(check_names, context, check_worker_count = 1):
+    p_detached = [check for check in check_names if check_registry[check]['detach']] if len(check_names) > 1 else []
+    if not p_detached:
+        return [run_check(check, context) for check in check_names]
+    p_results = [None] * len(check_names)
+    p_futures = dict()
+    p_cache = None if result_cache is None else dict(result_cache, task_hits=set())
+    p_event_path = "" if progress_state is None else progress_state['event_path']
+    with ProcessPoolExecutor(max_workers=min(check_worker_count, len(p_detached))) as executor:
+        try:
+            for p_index, check in enumerate(check_names):
+                if not check_registry[check]['detach']:
+                    continue
+                p_start = time.time()
+                p_message = guard_check(resolve_artefacts, context, check_registry[check]['inputs'])[1]
+                if p_message:
+                    if result_sink is not None:
+                        result_sink['check'] = check
+                    if check_registry[check]['title']:
+                        output_info(check_registry[check]['title'])
+                    p_results[p_index] = record_check_result(check, None, p_message, p_start)
+                    continue
+                p_futures[p_index] = executor.submit(run_check_process, check, context, data_backend, \
+                    instrument_stats is not None, cancel_state['path'], p_event_path, p_cache)
+            for p_index, check in enumerate(check_names):
+                if not check_registry[check]['detach']:
+                    p_results[p_index] = run_check(check, context)
+            for p_index in sorted(p_futures):
+                p_result, p_output, p_records, p_layers, p_stats = p_futures[p_index].result()
+                merge_check_process(p_output, p_records, p_layers, p_stats)
+                p_results[p_index] = p_result
+                check_cancel()
+        except BaseException:
+            for p_future in p_futures.values():
+                p_future.cancel()
+            raise
+    return p_results
+
+def run_check_plan(check_names, context, check_worker_count = 1):
+    for check in check_names:
+        if check not in check_registry:
+            sys.exit(f"检测/处理方法 {check} 不存在！")
+    p_results = [None] * len(check_names)
+    p_fatal = ""
+    for p_step in plan_check_steps(check_names, check_worker_count):
+        if p_fatal:
+            for p_index in p_step:
+                p_results[p_index] = {'check': check_names[p_index], 'status': "跳过", 'signal': None, \
+                                      'message': p_fatal, 'seconds': 0.0}
+            continue
+        p_step_results = run_check_step([check_names[p] for p in p_step], context, check_worker_count)
+        for p_index, p_result in zip(p_step, p_step_results):
+            p_results[p_index] = p_result
+            if check_registry[p_result['check']]['fatal'] and p_result['status'] == "错误":
+                p_fatal = p_result['message']
+    return p_results
+
+def examine_gdb(p_gdb, settings, p_check_mode = None):
+    global result_sink, result_cache
+    dir_path = settings['dir']
+    p_gdb_name = os.path.splitext(os.path.basename(p_gdb.replace("\\", os.sep)))[0]
+    p_output_path = os.path.join(dir_path, p_gdb_name + "." + settings['output_format'])
+    result_sink = open_result_sink(p_output_path, settings['output_format'])
+    if settings['result_cache']:
+        result_cache = open_result_cache(os.path.join(dir_path, p_gdb_name + "_cache.json"), \
+                                         settings['cache_geometry_hash'])
+    p_instrument = None
+    if settings['timing']:
+        p_instrument = open_instrument(os.path.join(dir_path, p_gdb_name), settings['profile'])
+    p_progress = open_progress(p_gdb, settings['progress_interval'], settings['progress_file'])
+    try:
+        with cancellable(os.path.join(dir_path, p_gdb_name + ".cancel")):
+            return examine_gdb_checks(p_gdb, settings, p_check_mode)
+    finally:
+        close_progress(p_progress)
+        if p_instrument is not None:
+            close_instrument(p_instrument)
+        if result_cache is not None:
+            close_result_cache(result_cache)
+            result_cache = None
+        close_result_sink(result_sink)
+        result_sink = None
+
+def examine_gdb_checks(p_gdb, settings, p_check_mode = None):
+    context = dict(settings, gdb=p_gdb)
+    resolve_artefacts(context, ["data_list", "featureclass_list"])
+
+    print("初始化完成>>>\n")
+    output_info(f"被检测数据库为：{p_gdb}\n")
+
+    if p_check_mode is None:
+        p_check_mode = check_mode(settings['check_list'])
+
+    print("开始检测>>>\n")
+
+    p_results = run_check_plan(p_check_mode, context, settings['check_worker_count'])
+    if result_sink is not None:
+        result_sink['check'] = ""
+
+    report_timing()
+    output_info(f"\n检测/处理结束，状态：{[p['signal'] for p in p_results]}。")
+    return p_results
+
+def find_target_gdbs(root_path):
+    p_gdb_list = []
+    for p_dir, p_sub_dirs, p_files in os.walk(root_path):
+        for p_sub_dir in list(p_sub_dirs):
+            if p_sub_dir.lower().endswith(".gdb"):
+                p_sub_dirs.remove(p_sub_dir)
+                if not is_derived_gdb(p_sub_dir) and data_backend != "snapshot":
+                    p_gdb_list.append(os.path.join(p_dir, p_sub_dir))
+            elif p_sub_dir.endswith("_snapshot") and data_backend == "snapshot":
+                p_sub_dirs.remove(p_sub_dir)
+                if os.path.isfile(os.path.join(p_dir, p_sub_dir, "snapshot.json")):
+                    p_gdb_list.append(os.path.join(p_dir, p_sub_dir[:-len("_snapshot")] + ".gdb"))
+        if data_backend == "open":
+            p_gdb_list += [os.path.join(p_dir, p) for p in p_files \
+                           if p.lower().endswith(".gpkg") and not is_derived_gdb(p)]
+    return sorted(p_gdb_list)
+
+def examine_gdb_batch(p_gdb, settings, result_queue):
+    global interactive_mode
+    interactive_mode = False
+    if settings['backend']:
+        set_data_backend(settings['backend'])
+    p_start = time.time()
+    p_settings = dict(settings, dir=os.path.dirname(p_gdb))
+    try:
+        p_check_results = examine_gdb(p_gdb, p_settings, settings['checks'])
+        p_result = {'status': "完成", 'signal': [p['signal'] for p in p_check_results], \
+                    'message': "；".join([f"{p['check']}{p['status']}：{p['message']}" for p in p_check_results \
+                                          if p['status'] != "完成"])}
+    except SystemExit as e:
+        p_result = {'status': "取消" if str(e) == cancel_message else "退出", 'signal': [], 'message': str(e)}
+    except Exception as e:
+        p_result = {'status': "错误", 'signal': [], 'message': repr(e)}
+    p_result['elapsed'] = round(time.time() - p_start, 1)
+    result_queue.put([p_gdb, p_result])
+    return 1
+
+def run_batch(root_path, settings):
+    if settings['backend']:
+        set_data_backend(settings['backend'])
+    p_gdb_list = find_target_gdbs(root_path)
+    if not p_gdb_list:
+        sys.exit("当前路径下无数据库！程序退出。")
+    print(f"共发现 {len(p_gdb_list)} 个数据库，开始批量检测>>>\n")
+    with cancellable(os.path.join(root_path, "batch.cancel")):
+        p_result_dict = run_batch_processes(p_gdb_list, settings)
+    return output_batch_summary(root_path, p_gdb_list, p_result_dict, settings['checks'])
+
+def run_batch_processes(p_gdb_list, settings):
+    p_result_dict = dict()
+    p_pending_list = list(p_gdb_list)
+    p_running_dict = dict()
+    result_queue = multiprocessing.Queue()
+    p_cancelled = False
+    while p_pending_list or p_running_dict:
+        if not p_cancelled and is_cancel_requested():
+            p_cancelled = True
+            for p_gdb in p_pending_list:
+                p_result_dict[p_gdb] = {'status': "取消", 'signal': [], 'elapsed': 0.0, 'message': cancel_message}
+            p_pending_list = []
+            for p_process, p_start in p_running_dict.values():
+                p_process.terminate()
+            print("批量检测已取消，等待正在检测的数据库退出。")
+        while p_pending_list and len(p_running_dict) < settings['gdb_worker_count']:
+            p_gdb = p_pending_list.pop(0)
+            p_process = multiprocessing.Process(target=examine_gdb_batch, args=(p_gdb, settings, result_queue))
+            p_process.start()
+            p_running_dict[p_gdb] = [p_process, time.time()]
+        try:
+            p_gdb, p_result = result_queue.get(timeout=1)
+            if p_gdb not in p_running_dict:
+                continue
+            p_result_dict[p_gdb] = p_result
+            p_running_dict.pop(p_gdb)[0].join()
+            print(f"{p_gdb} 检测{p_result['status']}，状态：{p_result['signal']}。")
+        except queue.Empty:
+            pass
+        for p_gdb, (p_process, p_start) in list(p_running_dict.items()):
+            if settings['gdb_timeout'] > 0 and time.time() - p_start > settings['gdb_timeout']:
+                p_process.terminate()
+                p_process.join(60)
+                if p_process.is_alive():
+                    p_process.kill()
+                    p_process.join()
+                p_result_dict[p_gdb] = {'status': "超时", 'signal': [], 'elapsed': round(time.time() - p_start, 1), \
+                                        'message': f"超过 {settings['gdb_timeout']} 秒未完成"}
+                p_running_dict.pop(p_gdb)
+                print(f"{p_gdb} 检测超时，已终止。")
+            elif not p_process.is_alive() and result_queue.empty():
+                p_result_dict[p_gdb] = {'status': "错误", 'signal': [], 'elapsed': round(time.time() - p_start, 1), \
+                                        'message': f"进程异常退出，代码 {p_process.exitcode}"}
+                p_running_dict.pop(p_gdb)
+                print(f"{p_gdb} 检测进程异常退出。")
+    return p_result_dict
+
+def output_batch_summary(root_path, gdb_list, result_dict, checks):
+    p_summary_path = os.path.join(root_path, "batch_summary.csv")
+    with codecs.open(p_summary_path, 'w', encoding="utf-8-sig") as summary_file:
+        csv_writer = csv.writer(summary_file)
+        csv_writer.writerow(["数据库", "状态", "耗时（秒）"] + checks + ["备注"])
+        for p_gdb in gdb_list:
+            p_result = result_dict[p_gdb]
+            p_signal = p_result['signal'] + [""] * (len(checks) - len(p_result['signal']))
+            csv_writer.writerow([p_gdb, p_result['status'], p_result['elapsed']] + p_signal + [p_result['message']])
+    p_done_count = len([p for p in result_dict.values() if p['status'] == "完成"])
+    print(f"\n批量检测结束，{p_done_count}/{len(gdb_list)} 个数据库完成检测，汇总结果：{p_summary_path}")
+    return result_dict
+
+def load_batch_settings(p_args, settings):
+    p_settings = dict(settings)
+    if p_args.config:
+        with codecs.open(p_args.config, encoding="utf-8") as config_file:
+            p_settings.update(json.load(config_file))
+        p_config_dir = os.path.dirname(os.path.abspath(p_args.config))
+    else:
+        p_config_dir = settings['dir']
+    p_settings = apply_argument_settings(p_args, p_settings)
+    for p_key in ["structure_file_name", "conversion_file_name"]:
+        if p_settings[p_key] == "":
+            p_settings[p_key] = os.path.join(p_config_dir, "data_structure.csv" \
+                if p_key == "structure_file_name" else "data_conversion.csv")
+        elif not os.path.isabs(p_settings[p_key]):
+            p_settings[p_key] = os.path.join(p_config_dir, p_settings[p_key])
+    if 'checks' not in p_settings:
+        p_settings['checks'] = settings['check_list'][:6]
+    validate_checks(p_settings['checks'], settings['check_list'])
+    if p_settings['repair_policy'] == "" and "几何修正" in p_settings['checks']:
+        sys.exit("批处理模式下使用几何修正需指定修正策略（Y、N 或 auto）！")
+    return p_settings
+
+def apply_argument_settings(p_args, settings):
+    p_settings = dict(settings)
+    for p_key, p_value in vars(p_args).items():
+        if p_key not in ["batch", "config"] and p_value is not None:
+            p_settings[p_key] = p_value
+    return p_settings
+
+def validate_checks(p_checks, check_list):
+    for p_check in p_checks:
+        if p_check not in check_list:
+            sys.exit(f"检测/处理方法 {p_check} 不存在！")
+    return 1
+
+def run_interactive(p_args, settings):
+    for p_key, p_option in batch_only_arguments.items():
+        if getattr(p_args, p_key) is not None:
+            sys.exit(f"参数 {p_option} 仅用于批处理模式，请同时指定 --batch！")
+    p_settings = apply_argument_settings(p_args, settings)
+    if p_settings.get('checks') is not None:
+        validate_checks(p_settings['checks'], settings['check_list'])
+    p_gdb = get_target_gdb(p_settings['dir'])
+    return examine_gdb(p_gdb, p_settings, p_settings.get('checks'))
+
+batch_only_arguments = {'config': "--config", 'gdb_worker_count': "--gdb-workers", 'gdb_timeout': "--timeout"}
+
+def parse_arguments():
+    p_parser = argparse.ArgumentParser(description="国土空间规划数据库检测与处理。无参数时以交互模式运行；" \
+                                       "运行中按 Ctrl+C 或在结果目录创建“数据库名.cancel”文件可取消。")
+    p_parser.add_argument("--batch", metavar="ROOT", help="批处理模式：检测该目录下的全部数据库")
+    p_parser.add_argument("--config", help="批处理配置文件（JSON）")
+    p_parser.add_argument("--checks", nargs="+", help="检测/处理方法名")
+    p_parser.add_argument("--region", dest="admin_fc_name", help="规划范围要素名称")
+    p_parser.add_argument("--structure-file", dest="structure_file_name", help="数据结构描述文件")
+    p_parser.add_argument("--conversion-file", dest="conversion_file_name", help="数据格式转换文件")
+    p_parser.add_argument("--repair-policy", dest="repair_policy", choices=["Y", "N", "auto"], \
+                          help="几何修正策略，auto 为按容差自动判定")
+    p_parser.add_argument("--repair-tolerance", dest="repair_accept_tolerance", type=float, \
+                          help="自动修正的面积/长度相对变化容差")
+    p_parser.add_argument("--repair-limit", dest="repair_reject_limit", type=float, \
+                          help="自动拒绝修正的面积/长度相对变化或要素减少限值")
+    p_parser.add_argument("--hierarchy-tolerance", dest="hierarchy_tolerance", type=float, \
+                          help="行政区划层级检测中可忽略的超出、缝隙与重叠面积比例")
+    p_parser.add_argument("--duplicate-tolerance", dest="duplicate_tolerance", type=float, \
+                          help="近似重复要素的距离容差（坐标单位），0 为只检测完全重复")
+    p_parser.add_argument("--workers", dest="worker_count", type=int, help="单个数据库内的并行进程数")
+    p_parser.add_argument("--check-workers", dest="check_worker_count", type=int, \
+                          help="同时运行的互不依赖检测数（每项检测另有 --workers 个进程）")
+    p_parser.add_argument("--gdb-workers", dest="gdb_worker_count", type=int, help="同时检测的数据库数")
+    p_parser.add_argument("--timeout", dest="gdb_timeout", type=int, help="单个数据库的超时时间（秒）")
+    p_parser.add_argument("--sample-size", dest="geometry_sample_size", type=int, \
+                          help="每类几何错误最多列出的要素数，0 为全部列出")
+    p_parser.add_argument("--spill-dir", dest="geometry_spill_dir", help="未列出的几何错误写入的目录")
+    p_parser.add_argument("--list-all", dest="boundary_list_all", action="store_const", const=True, \
+                          help="规划范围检测列出全部超出范围的要素")
+    p_parser.add_argument("--no-cache", dest="result_cache", action="store_const", const=False, \
+                          help="不使用检测结果缓存，全部图层重新检测")
+    p_parser.add_argument("--geometry-hash", dest="cache_geometry_hash", action="store_const", const=True, \
+                          help="缓存指纹中包含几何哈希")
+    p_parser.add_argument("--no-timing", dest="timing", action="store_const", const=False, \
+                          help="不记录各检测、图层与数据调用的耗时")
+    p_parser.add_argument("--profile", choices=["cprofile", "pyinstrument"], \
+                          help="逐项检测输出性能剖析文件（仅主进程）")
+    p_parser.add_argument("--progress-interval", dest="progress_interval", type=float, \
+                          help="进度输出的最短间隔（秒），0 为不输出")
+    p_parser.add_argument("--progress-file", dest="progress_file", help="进度事件写入的 JSON Lines 文件")
+    p_parser.add_argument("--backend", choices=["arcpy", "open", "snapshot"], \
+                          help="数据后端，默认优先使用 arcpy；snapshot 为读取数据快照")
+    p_parser.add_argument("--output-format", dest="output_format", choices=list(result_writers.keys()), \
+                          help="检测结果输出格式")
+    return p_parser.parse_args()
+
+if __name__ == "__main__":
+
+    check_list = ["坐标系统", "几何", "数据范围", "规划范围", "数据结构", \
+                "数据表结构", "去除数据层级", "几何修正", "数据结构转换", "拓扑", "转换预检", "属性", "坐标系统统一", "行政区划层级", "数据快照", "重复要素"]
+    admin_fc_name_list = ["行政区划_市级", "行政区划_县级", "行政区划_乡级", "行政区划_村级"]
+    structure_file_name = ''
+    conversion_file_name = ''
+    admin_fc_name = ''
+    worker_count = 1
+    check_worker_count = 1
+    gdb_worker_count = 2
+    gdb_timeout = 0
+    repair_policy = ''
+    output_format = 'csv'
+    geometry_sample_size = 0
+    geometry_spill_dir = ''
+    extent_tolerance = 1.0
+    extent_min_overlap = 0.0
+    backend = ''
+    boundary_list_all = False
+    topology_chunk_size = 50000
+    topology_tolerance = 0.0
+    attribute_batch_size = 500000
+    repair_accept_tolerance = 0.001
+    repair_reject_limit = 0.05
+    hierarchy_tolerance = 0.0001
+    duplicate_tolerance = 0.01
+    result_cache_enabled = True
+    cache_geometry_hash = False
+    timing = True
+    profile = ''
+    progress_interval = 5.0
+    progress_file = ''
+
+    dir_path = os.path.dirname(os.path.realpath(__file__))
+    settings = {'dir': dir_path, 'check_list': check_list, 'admin_fc_name': admin_fc_name, \
+        'admin_fc_name_list': admin_fc_name_list, 'structure_file_name': structure_file_name, \
+        'conversion_file_name': conversion_file_name, 'worker_count': worker_count, \
+        'check_worker_count': check_worker_count, 'gdb_worker_count': gdb_worker_count, 'gdb_timeout': gdb_timeout, 'repair_policy': repair_policy, \
+        'output_format': output_format, 'geometry_sample_size': geometry_sample_size, \
+        'geometry_spill_dir': geometry_spill_dir, 'extent_tolerance': extent_tolerance, \
+        'extent_min_overlap': extent_min_overlap, 'backend': backend, 'boundary_list_all': boundary_list_all, \
+        'topology_chunk_size': topology_chunk_size, 'topology_tolerance': topology_tolerance, \
+        'result_cache': result_cache_enabled, 'cache_geometry_hash': cache_geometry_hash, \
+        'attribute_batch_size': attribute_batch_size, 'repair_accept_tolerance': repair_accept_tolerance, \
+        'repair_reject_limit': repair_reject_limit, 'timing': timing, 'profile': profile, \
+        'hierarchy_tolerance': hierarchy_tolerance, 'duplicate_tolerance': duplicate_tolerance, \
+        'progress_interval': progress_interval, \
+        'progress_file': progress_file}
+
+    p_args = parse_arguments()
+    if p_args.backend:
+        set_data_backend(p_args.backend)
+    if p_args.batch:
+        run_batch(p_args.batch, load_batch_settings(p_args, settings))
+    else:
+        run_interactive(p_args, settings)
+
+    #tbd: conversion to provincial standard database
     #tbd: extract key indicators and ratios
\ No newline at end of file
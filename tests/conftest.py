@@ -0,0 +1,26 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import benchmark_examine
+
+@pytest.fixture(scope="session")
+def bench_spec(tmp_path_factory):
+    pytest.importorskip("pyogrio")
+    pytest.importorskip("shapely")
+    return benchmark_examine.generate_workspace(str(tmp_path_factory.mktemp("bench")), layer_count=3, \
+                                                feature_count=100)
+
+@pytest.fixture
+def load_examine(monkeypatch):
+    def load(backend, arcpy_module = None):
+        if arcpy_module is not None:
+            monkeypatch.setitem(sys.modules, "arcpy", arcpy_module)
+        monkeypatch.delitem(sys.modules, "data_examine", raising=False)
+        import data_examine
+        data_examine.set_data_backend(backend)
+        data_examine.interactive_mode = False
+        return data_examine
+    return load
@@ -0,0 +1,41 @@
+import sys
+import pytest
+
+import benchmark_examine
+
+def run_interactive(de, monkeypatch, tmp_path, argv):
+    monkeypatch.setattr(sys, "argv", ["data_examine.py"] + argv)
+    examined = []
+    monkeypatch.setattr(de, "get_target_gdb", lambda dir_path: str(tmp_path / "sample.gdb"))
+    monkeypatch.setattr(de, "examine_gdb", lambda p_gdb, settings, checks = None: examined.append([settings, checks]))
+    settings = benchmark_examine.make_settings(de, str(tmp_path))
+    de.run_interactive(de.parse_arguments(), dict(settings, check_list=settings['check_list'] + ["几何修正"]))
+    return examined[0]
+
+def test_interactive_applies_every_argument(tmp_path, load_examine, monkeypatch):
+    de = load_examine("open")
+    settings, checks = run_interactive(de, monkeypatch, tmp_path, \
+        ["--checks", "几何", "几何修正", "--repair-policy", "auto", "--repair-tolerance", "0.01", "--workers", "3", \
+         "--sample-size", "7", "--output-format", "jsonl", "--region", "行政区划_县级", "--structure-file", "s.csv"])
+    assert checks == ["几何", "几何修正"]
+    assert settings['repair_policy'] == "auto"
+    assert settings['repair_accept_tolerance'] == 0.01
+    assert settings['worker_count'] == 3
+    assert settings['geometry_sample_size'] == 7
+    assert settings['output_format'] == "jsonl"
+    assert settings['admin_fc_name'] == "行政区划_县级"
+    assert settings['structure_file_name'] == "s.csv"
+
+def test_interactive_without_checks_prompts(tmp_path, load_examine, monkeypatch):
+    de = load_examine("open")
+    settings, checks = run_interactive(de, monkeypatch, tmp_path, [])
+    assert checks is None
+    assert settings['repair_policy'] == benchmark_examine.make_settings(de, str(tmp_path))['repair_policy']
+    assert settings['worker_count'] == 1
+
+@pytest.mark.parametrize("argv", [["--config", "batch.json"], ["--gdb-workers", "2"], ["--timeout", "60"], \
+                                  ["--checks", "不存在"]])
+def test_interactive_rejects_batch_arguments(tmp_path, load_examine, monkeypatch, argv):
+    de = load_examine("open")
+    with pytest.raises(SystemExit):
+        run_interactive(de, monkeypatch, tmp_path, argv)
@@ -0,0 +1,22 @@
+import csv
+import codecs
+import numpy as np
+
+import data_examine
+
+def write_structure_file(structure_path, rows):
+    with codecs.open(structure_path, "w", encoding="utf-8-sig") as structure_file:
+        csv_writer = csv.writer(structure_file)
+        csv_writer.writerow(["名称", "类型", "备注", "字段名称", "字段类型", "字段长度", "必填", "值域", "最小值", "最大值"])
+        csv_writer.writerows(rows)
+    return structure_path
+
+def test_integer_domain_with_bad_code(tmp_path, capsys):
+    structure_path = write_structure_file(str(tmp_path / "structure.csv"), \
+        [["地块", "面", "", "LX", "整型", "", "", "1|A|02", "", ""], ["地块", "面", "", "BM", "", "", "", "B|3", "", ""]])
+    rules = data_examine.get_field_rules(str(tmp_path), structure_path)["地块"]
+    assert "整型字段 LX 值域含非整数代码：A" in capsys.readouterr().out
+    assert [p['int_domain'] for p in rules] == [[1, 2], [3]]
+    values = np.array([1, 2, 3, -2147483648], dtype=np.int32)
+    assert data_examine.evaluate_field_rule(rules[0], values, "Integer")["值域不符"].tolist() == [False, False, True, False]
+    assert data_examine.evaluate_field_rule(rules[1], values, "Integer")["值域不符"].tolist() == [True, True, False, False]
@@ -0,0 +1,40 @@
+import pytest
+
+import benchmark_examine
+
+pytest.importorskip("pyogrio")
+pytest.importorskip("shapely")
+
+@pytest.fixture
+def mixed_spec(tmp_path):
+    return benchmark_examine.generate_workspace(str(tmp_path / "mixed"), layer_count=2, feature_count=100, \
+                                                crs_list=["EPSG:4523", "EPSG:4524"])
+
+def test_mixed_crs_falls_back_to_erase(mixed_spec, load_examine, monkeypatch):
+    arcpy = benchmark_examine.make_stub_arcpy(mixed_spec)
+    erased = []
+    erase = arcpy.Erase_analysis
+    def counted_erase(data, base_data, output_name):
+        erased.append(data)
+        return erase(data, base_data, output_name)
+    arcpy.Erase_analysis = counted_erase
+    de = load_examine("arcpy", arcpy)
+    contained = []
+    check_containment = de.check_containment
+    monkeypatch.setattr(de, "check_containment", lambda data, *args: contained.append(data) or \
+                        check_containment(data, *args))
+    fc_list = de.conduct_featureclass_list(mixed_spec['gdb'])
+    de.check_fc_boundary(mixed_spec['region'], fc_list)
+    layers = mixed_spec['layers']
+    assert sorted(erased) == sorted([p for p in fc_list if layers[p]['crs'] != layers[mixed_spec['region']]['crs']])
+    assert sorted(contained) == sorted([p for p in fc_list if p != mixed_spec['region'] and p not in erased])
+    assert erased and contained
+
+def test_mixed_crs_skipped_on_open_backend(mixed_spec, load_examine, capsys):
+    de = load_examine("open")
+    fc_list = de.conduct_featureclass_list(mixed_spec['gdb'])
+    signal = de.check_fc_boundary(mixed_spec['region'], fc_list)
+    output = capsys.readouterr().out
+    for data, layer in mixed_spec['layers'].items():
+        assert (f"{data} 坐标系统与规划范围不一致" in output) == (layer['crs'] == "EPSG:4524")
+    assert signal <= 0
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+import data_examine
+
+base_extent = (0.0, 0.0, 10.0, 10.0)
+
+def extent_flags(extents, tolerance = 1.0):
+    return data_examine.compute_extent_flags(np.array(extents, dtype=float), base_extent, tolerance)
+
+def test_empty_extents():
+    empty_flags, outside_flags, overlap_ratios = extent_flags([[np.nan] * 4, [5, 5, 1, 1], [2, 2, 4, 4]])
+    assert empty_flags.tolist() == [True, True, False]
+    assert outside_flags.tolist() == [False, False, False]
+    assert overlap_ratios.tolist() == [0.0, 0.0, 1.0]
+
+def test_no_extents():
+    empty_flags, outside_flags, overlap_ratios = extent_flags(np.empty((0, 4)))
+    assert len(empty_flags) == len(outside_flags) == len(overlap_ratios) == 0
+
+def test_fully_outside():
+    empty_flags, outside_flags, overlap_ratios = extent_flags([[100, 100, 110, 110]])
+    assert empty_flags.tolist() == [False]
+    assert outside_flags.tolist() == [True]
+    assert overlap_ratios.tolist() == [0.0]
+
+def test_partial_overlap_below_min_overlap():
+    empty_flags, outside_flags, overlap_ratios = extent_flags([[5, 5, 15, 15], [5, 0, 15, 10]])
+    assert empty_flags.tolist() == [False, False]
+    assert outside_flags.tolist() == [False, False]
+    assert overlap_ratios == pytest.approx([0.25, 0.5])
+    assert (overlap_ratios < 0.3).tolist() == [True, False]
+
+def test_degenerate_extents():
+    empty_flags, outside_flags, overlap_ratios = extent_flags([[2, 2, 2, 2], [2, 20, 2, 20], [-2, 5, 12, 5]])
+    assert empty_flags.tolist() == [False, False, False]
+    assert outside_flags.tolist() == [False, True, False]
+    assert overlap_ratios == pytest.approx([1.0, 0.0, 10 / 14])
+
+@pytest.mark.parametrize("tolerance, extent, outside", [
+    (0.5, [0, 0, 10, 10], False), (0.5, [0, 0, 10.001, 10], True), (0.5, [-0.001, 0, 10, 10], True),
+    (1.0, [-5, -5, 15, 15], False), (1.0, [-5, -5, 15, 15.001], True)])
+def test_tolerance_edge(tolerance, extent, outside):
+    assert extent_flags([extent], tolerance)[1].tolist() == [outside]
@@ -0,0 +1,106 @@
+from collections import Counter
+
+import benchmark_examine
+
+counted_calls = ["Describe", "ListFields", "GetCount_management"]
+
+def make_counting_arcpy(spec):
+    arcpy = benchmark_examine.make_stub_arcpy(spec)
+    arcpy.counts = Counter()
+    for name in counted_calls:
+        def counted(data, *args, p_name = name, p_func = getattr(arcpy, name), **kwargs):
+            arcpy.counts[(p_name, data)] += 1
+            return p_func(data, *args, **kwargs)
+        setattr(arcpy, name, counted)
+    arcpy.RepairGeometry_management = lambda data: arcpy.counts.update([("RepairGeometry_management", data)])
+    return arcpy
+
+def test_each_layer_described_once(bench_spec, load_examine, tmp_path):
+    arcpy = make_counting_arcpy(bench_spec)
+    de = load_examine("arcpy", arcpy)
+    settings = benchmark_examine.make_settings(de, str(tmp_path))
+    checks = ["坐标系统", "几何", "数据范围", "规划范围", "数据结构", "数据表结构", "转换预检", "属性"]
+    results = de.examine_gdb(bench_spec['gdb'], settings, checks)
+    assert [p['status'] for p in results] == ["完成"] * len(checks)
+    for data in bench_spec['layers']:
+        for name in counted_calls:
+            assert arcpy.counts[(name, data)] == 1, (name, data)
+
+def test_repair_invalidates_inventory(bench_spec, load_examine, monkeypatch):
+    arcpy = make_counting_arcpy(bench_spec)
+    de = load_examine("arcpy", arcpy)
+    fc_list = [data for data in bench_spec['layers'] if bench_spec['layers'][data]['invalid']]
+    de.conduct_data_inventory(list(bench_spec['layers']))
+    monkeypatch.setattr(de, "preview_repair_layer", \
+                        lambda fc, shape_type, oids = None: [de.get_data_info(fc)['count'], 1.0, 1.0, []])
+    assert de.repair_geometry(fc_list, repair_policy="auto") == [1] * len(fc_list)
+    for data in bench_spec['layers']:
+        repaired = data in fc_list
+        assert (data in de.data_inventory) != repaired
+        assert arcpy.counts[("RepairGeometry_management", data)] == int(repaired)
+        de.get_data_info(data)
+        assert arcpy.counts[("Describe", data)] == 1 + int(repaired)
+
+def test_export_invalidates_inventory(bench_spec, load_examine, tmp_path):
+    arcpy = make_counting_arcpy(bench_spec)
+    created = set()
+    arcpy.Exists = lambda data: data in created
+    arcpy.CreateFileGDB_management = lambda dir_path, name: created.add(dir_path + "\\" + name + ".gdb")
+    arcpy.Copy_management = lambda data, output: created.add(output)
+    de = load_examine("arcpy", arcpy)
+    data_list = de.conduct_data_list(bench_spec['gdb'])
+    de.conduct_data_inventory(data_list)
+    target_gdb = str(tmp_path) + "\\bench_flat.gdb"
+    targets = [target_gdb + "\\" + data.split("\\")[-1] for data in data_list]
+    for target in targets:
+        de.data_inventory[target] = {'dataType': "FeatureClass"}
+    de.export_to_flat_gdb(str(tmp_path), bench_spec['gdb'], data_list)
+    assert set(targets) <= created
+    assert not set(targets) & set(de.data_inventory)
+    for data in data_list:
+        assert arcpy.counts[("Describe", data)] == 1
+
+def test_pool_task_carries_inventory(bench_spec, load_examine):
+    arcpy = make_counting_arcpy(bench_spec)
+    de = load_examine("arcpy", arcpy)
+    data = list(bench_spec['layers'])[0]
+    de.conduct_data_inventory([data])
+    inventory = de.get_task_inventory([data, 100, ""])
+    assert list(inventory) == [data]
+    de.data_inventory.clear()
+    assert de.run_layer_task(de.get_data_info, "arcpy", [data], None, "", inventory) == inventory[data]
+    assert arcpy.counts[("Describe", data)] == 1
+
+def test_repairs_applied_one_at_a_time(bench_spec, load_examine, monkeypatch):
+    arcpy = make_counting_arcpy(bench_spec)
+    de = load_examine("arcpy", arcpy)
+    fc_list = [data for data in bench_spec['layers'] if bench_spec['layers'][data]['invalid']]
+    def preview_repair_layer(fc, shape_type, oids = None):
+        return [de.get_data_info(fc)['count'], 1.0, 1.0, []]
+    monkeypatch.setattr(de, "preview_repair_layer", preview_repair_layer)
+    worker_counts = dict()
+    run_layer_tasks = de.run_layer_tasks
+    def counted(task_func, task_args, worker_count = 1):
+        worker_counts[task_func.__name__] = worker_count
+        return run_layer_tasks(task_func, task_args, 1)
+    monkeypatch.setattr(de, "run_layer_tasks", counted)
+    assert de.repair_geometry(fc_list, 4, repair_policy="auto") == [1] * len(fc_list)
+    assert worker_counts == {'check_geometry_layer': 4, 'preview_repair_layer': 4, 'apply_geometry_repair': 1}
+
+def test_unify_uses_inventory_reference(tmp_path, load_examine):
+    spec = benchmark_examine.generate_workspace(str(tmp_path / "mixed"), layer_count=3, feature_count=100, \
+                                                crs_list=["EPSG:4523", "EPSG:4524"])
+    arcpy = make_counting_arcpy(spec)
+    created, transforms = set(), []
+    arcpy.Exists = lambda data: data in created
+    arcpy.CreateFileGDB_management = lambda dir_path, name: created.add(dir_path + "\\" + name + ".gdb")
+    arcpy.SpatialReference = lambda wkid = 0, text = "": ["SpatialReference", wkid or text]
+    arcpy.ListTransformations = lambda from_ref, to_ref: transforms.append([from_ref, to_ref]) or []
+    arcpy.Project_management = lambda data, output, spatial_ref, transform: created.add(output)
+    de = load_examine("arcpy", arcpy)
+    data_list = de.conduct_data_list(spec['gdb'])
+    de.conduct_data_inventory(data_list)
+    assert de.unify_spatial_reference(str(tmp_path), spec['gdb'], data_list) == 1
+    assert transforms and all([p[0] != p[1] for p in transforms])
+    for data in data_list:
+        assert arcpy.counts[("Describe", data)] == 1
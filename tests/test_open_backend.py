@@ -0,0 +1,70 @@
+import csv
+import codecs
+import pytest
+import numpy as np
+
+import benchmark_examine
+
+pyogrio = pytest.importorskip("pyogrio")
+pytest.importorskip("pyogrio.raw")
+shapely = pytest.importorskip("shapely")
+
+def write_sample_gpkg(gpkg_path):
+    parcels = [shapely.box(0, 0, 10, 10), shapely.Polygon([(20, 0), (30, 10), (30, 0), (20, 10), (20, 0)]), \
+               shapely.box(5, 5, 15, 15), shapely.box(40, 0, 50, 10)]
+    codes = ["01", "02", "03", None]
+    pyogrio.raw.write(gpkg_path, shapely.to_wkb(parcels), [np.array(codes, dtype=object)], ["DM"], \
+                      layer="地块", driver="GPKG", geometry_type="Polygon", crs="EPSG:4523")
+    roads = [shapely.LineString([(0, 0), (10, 10)]), shapely.LineString([(0, 10), (10, 0)]), \
+             shapely.LineString([(20, 0), (20, 10)])]
+    pyogrio.raw.write(gpkg_path, shapely.to_wkb(roads), [np.array(["A", "B", "C"], dtype=object)], ["MC"], \
+                      layer="道路", driver="GPKG", geometry_type="LineString", crs="EPSG:4523", append=True)
+    return gpkg_path
+
+def write_structure_file(structure_path):
+    with codecs.open(structure_path, "w", encoding="utf-8-sig") as structure_file:
+        csv_writer = csv.writer(structure_file)
+        csv_writer.writerow(["名称", "类型", "备注", "字段名称", "字段类型", "字段长度", "必填", "值域", "最小值", "最大值"])
+        csv_writer.writerow(["地块", "面", "", "DM", "字符型", "2", "1", "01|02", "", ""])
+    return structure_path
+
+def read_results(result_path):
+    with codecs.open(result_path, encoding="utf-8-sig") as result_file:
+        return list(csv.DictReader(result_file))
+
+def test_gpkg_discovery(tmp_path, load_examine):
+    de = load_examine("open")
+    gpkg_path = write_sample_gpkg(str(tmp_path / "sample.gpkg"))
+    assert de.find_target_gdbs(str(tmp_path)) == [gpkg_path]
+    assert de.get_target_gdb(str(tmp_path)) == gpkg_path
+
+def test_gpkg_checks(tmp_path, load_examine):
+    de = load_examine("open")
+    gpkg_path = write_sample_gpkg(str(tmp_path / "sample.gpkg"))
+    settings = dict(benchmark_examine.make_settings(de, str(tmp_path)), geometry_sample_size=0, \
+                    structure_file_name=write_structure_file(str(tmp_path / "structure.csv")))
+    results = de.examine_gdb(gpkg_path, settings, ["几何", "属性", "拓扑"])
+    assert [p['signal'] for p in results] == [0, 0, 0]
+    rows = read_results(str(tmp_path / "sample.csv"))
+    parcels, roads = gpkg_path + "\\地块", gpkg_path + "\\道路"
+    found = set([(p['check'], p['layer'], p['feature_id'], p['problem']) for p in rows if p['feature_id']])
+    assert ("几何", parcels, "2", "Self-intersection") in found
+    assert ("属性", parcels, "3", "值域不符") in found
+    assert ("属性", parcels, "4", "必填为空") in found
+    assert ("拓扑", parcels, "1/3", "重叠") in found
+    assert ("拓扑", roads, "1/2", "交叉") in found
+    assert not [p for p in found if p[0] == "几何" and p[1] == roads]
+
+def test_check_traceback_in_results(bench_spec, tmp_path, load_examine, monkeypatch, capsys):
+    de = load_examine("open")
+    def check_data_structure(data_list, structure_info):
+        raise ValueError("结构检测失败")
+    monkeypatch.setattr(de, "check_data_structure", check_data_structure)
+    results = de.examine_gdb(bench_spec['gdb'], benchmark_examine.make_settings(de, str(tmp_path)), ["数据结构"])
+    assert [p['status'] for p in results] == ["错误"]
+    output = capsys.readouterr().out
+    assert "数据结构未完成：ValueError('结构检测失败')" in output
+    assert "Traceback" not in output
+    rows = [p for p in read_results(str(tmp_path / "bench.csv")) if p['problem'] == "异常堆栈"]
+    assert len(rows) == 1 and rows[0]['severity'] == "error"
+    assert rows[0]['message'].startswith("Traceback") and "结构检测失败" in rows[0]['message']
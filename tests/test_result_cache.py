@@ -0,0 +1,65 @@
+import os
+import pytest
+
+import benchmark_examine
+
+pytest.importorskip("pyogrio")
+pytest.importorskip("shapely")
+
+def examine_cached(de, spec, out_dir, checks):
+    de.data_inventory.clear()
+    settings = dict(benchmark_examine.make_settings(de, out_dir), result_cache=True)
+    return de.examine_gdb(spec['gdb'], settings, checks)
+
+def count_check_geometry(arcpy):
+    arcpy.checked = []
+    check_geometry = arcpy.CheckGeometry_management
+    def counted(data, output_name):
+        arcpy.checked.append(data)
+        return check_geometry(data, output_name)
+    arcpy.CheckGeometry_management = counted
+    return arcpy
+
+def touch_gdb(gdb_path):
+    p_name = sorted([p for p in os.listdir(gdb_path) if p.endswith(".gdbtable")])[-1]
+    p_stat = os.stat(os.path.join(gdb_path, p_name))
+    os.utime(os.path.join(gdb_path, p_name), (p_stat.st_atime, p_stat.st_mtime + 10))
+
+def test_cache_without_pyogrio_uses_gdb_mtime(tmp_path, load_examine, capsys):
+    spec = benchmark_examine.generate_workspace(str(tmp_path / "w"), layer_count=2, feature_count=100)
+    arcpy = count_check_geometry(benchmark_examine.make_stub_arcpy(spec))
+    de = load_examine("arcpy", arcpy)
+    de.pyogrio = None
+    layer_count = len(spec['layers'])
+    examine_cached(de, spec, str(tmp_path), ["几何"])
+    assert len(arcpy.checked) == layer_count
+    examine_cached(de, spec, str(tmp_path), ["几何"])
+    assert len(arcpy.checked) == layer_count
+    assert "几何结果来自缓存" in capsys.readouterr().out
+    touch_gdb(spec['gdb'])
+    examine_cached(de, spec, str(tmp_path), ["几何"])
+    assert len(arcpy.checked) == layer_count * 2
+    assert "几何结果来自缓存" not in capsys.readouterr().out
+
+def test_cache_disabled_without_mtime(tmp_path, load_examine, monkeypatch, capsys):
+    spec = benchmark_examine.generate_workspace(str(tmp_path / "w"), layer_count=2, feature_count=100)
+    arcpy = count_check_geometry(benchmark_examine.make_stub_arcpy(spec))
+    de = load_examine("arcpy", arcpy)
+    monkeypatch.setattr(de, "get_layer_mtime", lambda data: None)
+    examine_cached(de, spec, str(tmp_path), ["几何"])
+    examine_cached(de, spec, str(tmp_path), ["几何"])
+    assert len(arcpy.checked) == len(spec['layers']) * 2
+    output = capsys.readouterr().out
+    assert "几何结果来自缓存" not in output
+    assert "无法获取修改时间" in output
+
+def test_inventory_checks_not_reported_as_cached(tmp_path, load_examine, capsys):
+    spec = benchmark_examine.generate_workspace(str(tmp_path / "w"), layer_count=2, feature_count=100)
+    de = load_examine("arcpy", benchmark_examine.make_stub_arcpy(spec))
+    examine_cached(de, spec, str(tmp_path), ["坐标系统", "数据结构"])
+    capsys.readouterr()
+    examine_cached(de, spec, str(tmp_path), ["坐标系统", "数据结构"])
+    output = capsys.readouterr().out
+    assert "结果来自缓存" not in output
+    assert "坐标系统使用缓存的图层描述信息重新检测" in output
+    assert "数据结构使用缓存" not in output
@@ -0,0 +1,45 @@
+import os
+import pytest
+import numpy as np
+
+pyogrio = pytest.importorskip("pyogrio")
+pytest.importorskip("pyogrio.raw")
+shapely = pytest.importorskip("shapely")
+
+def write_layers(gpkg_path, layers):
+    if os.path.exists(gpkg_path):
+        os.remove(gpkg_path)
+    for p_index, (name, count) in enumerate(layers.items()):
+        boxes = [shapely.box(p, 0, p + 1, 1) for p in range(count)]
+        pyogrio.raw.write(gpkg_path, shapely.to_wkb(boxes), [np.arange(count, dtype=np.int64)], ["BH"], \
+                          layer=name, driver="GPKG", geometry_type="Polygon", crs="EPSG:4523", append=p_index > 0)
+
+def export_and_read(load_examine, monkeypatch, gpkg_path, versions):
+    de = load_examine("open")
+    # a GeoPackage has one modification time for all layers; give each layer its own so unchanged ones are kept
+    monkeypatch.setattr(de, "get_layer_mtime", lambda data: versions[data.split("\\")[-1]])
+    de.export_snapshot(gpkg_path, de.conduct_data_list(gpkg_path))
+    de = load_examine("snapshot")
+    counts = dict()
+    for data in de.conduct_data_list(gpkg_path):
+        fids = np.concatenate([p[0] for p in de.read_layer_geometries(data)])
+        values = de.read_attribute_batches(data, [p for p in de.get_data_info(data)['fields'] if p['name'] == "BH"])
+        counts[data.split("\\")[-1]] = [len(fids), sum([len(p[1]["BH"]) for p in values])]
+    snapshot_dir = de.get_snapshot_dir(gpkg_path)
+    dirs = set([p['dir'] for p in de.get_snapshot(gpkg_path)['layers'].values()])
+    assert set(de.list_snapshot_layer_dirs(snapshot_dir)) == dirs
+    return counts
+
+def test_snapshot_reexport(tmp_path, load_examine, monkeypatch):
+    gpkg_path = str(tmp_path / "sample.gpkg")
+    versions = {"地块": 1, "道路": 1, "水系": 1}
+    write_layers(gpkg_path, {"地块": 3, "道路": 2, "水系": 4})
+    assert export_and_read(load_examine, monkeypatch, gpkg_path, versions) == \
+        {"地块": [3, 3], "道路": [2, 2], "水系": [4, 4]}
+    versions.update({"道路": 2})
+    write_layers(gpkg_path, {"道路": 5, "水系": 4})
+    assert export_and_read(load_examine, monkeypatch, gpkg_path, versions) == {"道路": [5, 5], "水系": [4, 4]}
+    versions.update({"建筑": 1, "绿地": 1})
+    write_layers(gpkg_path, {"道路": 5, "水系": 4, "建筑": 6, "绿地": 7})
+    assert export_and_read(load_examine, monkeypatch, gpkg_path, versions) == \
+        {"道路": [5, 5], "水系": [4, 4], "建筑": [6, 6], "绿地": [7, 7]}
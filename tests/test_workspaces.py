@@ -0,0 +1,18 @@
+import os
+import types
+
+class UntouchedArcpy(types.ModuleType):
+    def __getattr__(self, name):
+        raise AssertionError(f"arcpy.{name} used before a database was chosen")
+
+def make_workspace_dir(dir_path):
+    for name in ["规划.gdb", "规划_flat.gdb", "规划_flat_stage123.gdb", "其他"]:
+        os.makedirs(os.path.join(dir_path, name))
+    open(os.path.join(dir_path, "说明.gdb"), "w").close()
+    return dir_path
+
+def test_target_gdb_found_without_arcpy(tmp_path, load_examine):
+    de = load_examine("arcpy", UntouchedArcpy("arcpy"))
+    dir_path = make_workspace_dir(str(tmp_path))
+    assert de.get_target_gdb(dir_path) == os.path.join(dir_path, "规划.gdb")
+    assert de.get_workspaces(dir_path, "规划_flat_stage*", "FileGDB") == [os.path.join(dir_path, "规划_flat_stage123.gdb")]